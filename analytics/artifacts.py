@@ -0,0 +1,349 @@
+"""Memory-mappable model artifacts.
+
+An artifact is a directory holding ``manifest.json`` plus one ``.npy`` file
+per array. Arrays are opened with ``np.load(mmap_mode="r")``, so loading is
+a few file opens and every worker process on a host shares the same page
+cache instead of unpickling private copies of the forest.
+
+Layout::
+
+    point_projector/
+        manifest.json        kind, format_version, estimator, weights, tree
+                             depths/baselines, importances
+        scaler_mean.npy ...  EnsembleArrays.ARRAY_NAMES
+        forest_left.npy ...  ForestArrays.ARRAY_NAMES, prefixed "forest_"
+        lower_left.npy ...   quantile models of the "hgb" estimator, prefixed
+        upper_left.npy ...   "lower_" and "upper_"
+    point_projector/         (PositionalProjector)
+        manifest.json        kind, fallback, the fields above per position
+        QB__scaler_mean.npy  each sub-model's arrays, prefixed "<position>__"
+    clusterer_rb/
+        manifest.json        kind, position, labels, n_clusters
+        players.json         per-player feature rows and assignments
+        *.npy                scaler, scaled and raw cluster centers
+    clusterers/              (ClustererBundle)
+        manifest.json        kind, the fields above per position
+        players.json         per-position player rows
+        RB__scaler_mean.npy  each clusterer's arrays, prefixed "<position>__"
+    similarity_index/
+        manifest.json        kind, positions, row range per position
+        players.json         (player, season) of every row
+        matrix.npy           float32 standardized profiles, grouped by position
+        mean.npy, scale.npy  per-position standardization
+"""
+
+import json
+import os
+import pickle
+import shutil
+
+import numpy as np
+
+from analytics.inference import BoostedArrays, EnsembleArrays, ForestArrays
+
+
+FORMAT_VERSION = 3
+# Version 2 (random forest only) artifacts are still readable
+MIN_FORMAT_VERSION = 2
+MANIFEST = "manifest.json"
+
+PROJECTOR_KIND = "point_projector"
+POSITIONAL_KIND = "positional_projector"
+CLUSTERER_KIND = "player_clusterer"
+CLUSTERER_BUNDLE_KIND = "clusterer_bundle"
+SIMILARITY_KIND = "similarity_index"
+CLUSTERER_ARRAYS = ("scaler_mean", "scaler_scale", "cluster_centers", "cluster_centers_raw")
+
+
+def is_artifact(path):
+    """True if ``path`` is an artifact directory."""
+    return os.path.isfile(os.path.join(path, MANIFEST))
+
+
+def _write(path, manifest, arrays, extra_json=None):
+    """Write an artifact directory, replacing any existing one at ``path``."""
+    tmp_path = f"{path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_path, f"{name}.npy"), np.ascontiguousarray(array))
+    for filename, payload in (extra_json or {}).items():
+        with open(os.path.join(tmp_path, filename), "w") as f:
+            json.dump(payload, f)
+    manifest = {"format_version": FORMAT_VERSION, "arrays": sorted(arrays), **manifest}
+    with open(os.path.join(tmp_path, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    shutil.rmtree(path, ignore_errors=True)
+    os.rename(tmp_path, path)
+
+
+def read_artifact(path):
+    """Open an artifact directory.
+
+    Returns:
+        (manifest dict, dict of name -> read-only memory-mapped array)
+    """
+    with open(os.path.join(path, MANIFEST)) as f:
+        manifest = json.load(f)
+    if not MIN_FORMAT_VERSION <= manifest.get("format_version", 0) <= FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported artifact format version {manifest.get('format_version')} in {path}"
+        )
+    arrays = {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+        for name in manifest["arrays"]
+    }
+    return manifest, arrays
+
+
+def _tree_models(ensemble):
+    """(prefix, trees) pairs of an ensemble's tree models."""
+    models = [("forest", ensemble.forest)]
+    if ensemble.boosted:
+        models += [("lower", ensemble.lower), ("upper", ensemble.upper)]
+    return models
+
+
+def _projector_parts(ensemble, ridge_weight, rf_weight, feature_importances):
+    """Manifest fields and arrays describing one projector ensemble."""
+    arrays = {name: getattr(ensemble, name) for name in EnsembleArrays.ARRAY_NAMES}
+    trees = {}
+    for prefix, model in _tree_models(ensemble):
+        arrays.update({f"{prefix}_{name}": a for name, a in model.arrays().items()})
+        trees[prefix] = {"max_depth": model.max_depth}
+        if ensemble.boosted:
+            trees[prefix]["baseline"] = model.baseline
+    fields = {
+        "estimator": "hgb" if ensemble.boosted else "rf",
+        "ridge_intercept": ensemble.ridge_intercept,
+        "trees": trees,
+        "ridge_weight": ridge_weight,
+        "rf_weight": rf_weight,
+        "feature_importances": {k: float(v) for k, v in (feature_importances or {}).items()},
+    }
+    return fields, arrays
+
+
+def _projector_from_parts(fields, arrays):
+    """Rebuild an ensemble from ``_projector_parts`` output."""
+    # Version 2 artifacts hold a random forest with a top-level max_depth
+    trees = fields.get("trees") or {"forest": {"max_depth": fields["max_depth"]}}
+    tree_class = BoostedArrays if fields.get("estimator") == "hgb" else ForestArrays
+    models = {
+        prefix: tree_class(
+            **params, **{name: arrays[f"{prefix}_{name}"] for name in ForestArrays.ARRAY_NAMES},
+        )
+        for prefix, params in trees.items()
+    }
+    return EnsembleArrays(
+        ridge_intercept=fields["ridge_intercept"],
+        forest=models["forest"],
+        lower=models.get("lower"),
+        upper=models.get("upper"),
+        **{name: arrays[name] for name in EnsembleArrays.ARRAY_NAMES},
+    )
+
+
+def write_projector_artifact(path, ensemble, ridge_weight, rf_weight, feature_importances):
+    """Write a PointProjector's ensemble parameters as an artifact."""
+    fields, arrays = _projector_parts(ensemble, ridge_weight, rf_weight, feature_importances)
+    _write(path, {"kind": PROJECTOR_KIND, **fields}, arrays)
+
+
+def read_projector_artifact(path):
+    """Open a PointProjector artifact.
+
+    Returns:
+        (EnsembleArrays backed by memory-mapped arrays, manifest dict)
+    """
+    manifest, arrays = read_artifact(path)
+    if manifest.get("kind") != PROJECTOR_KIND:
+        raise ValueError(f"{path} is not a {PROJECTOR_KIND} artifact")
+    return _projector_from_parts(manifest, arrays), manifest
+
+
+def write_positional_artifact(path, sub_models, fallback, feature_importances=None):
+    """Write a PositionalProjector's sub-models as one artifact.
+
+    Args:
+        sub_models: dict of position -> (ensemble, ridge_weight, rf_weight,
+            feature_importances)
+        fallback: position whose sub-model serves unknown positions
+        feature_importances: importances of the whole projector (weighted
+            over positions by training rows)
+    """
+    models = {}
+    arrays = {}
+    for position, parts in sub_models.items():
+        fields, sub_arrays = _projector_parts(*parts)
+        models[position] = fields
+        arrays.update({f"{position}__{name}": a for name, a in sub_arrays.items()})
+    _write(path, {
+        "kind": POSITIONAL_KIND, "fallback": fallback, "models": models,
+        "feature_importances": {k: float(v) for k, v in (feature_importances or {}).items()},
+    }, arrays)
+
+
+def read_positional_artifact(path):
+    """Open a PositionalProjector artifact.
+
+    Returns:
+        (dict of position -> (EnsembleArrays, manifest fields), manifest dict)
+    """
+    manifest, arrays = read_artifact(path)
+    if manifest.get("kind") != POSITIONAL_KIND:
+        raise ValueError(f"{path} is not a {POSITIONAL_KIND} artifact")
+    sub_models = {}
+    for position, fields in manifest["models"].items():
+        prefix = f"{position}__"
+        sub_arrays = {
+            name[len(prefix):]: a for name, a in arrays.items() if name.startswith(prefix)
+        }
+        sub_models[position] = (_projector_from_parts(fields, sub_arrays), fields)
+    return sub_models, manifest
+
+
+def artifact_kind(path):
+    """The ``kind`` recorded in an artifact's manifest."""
+    with open(os.path.join(path, MANIFEST)) as f:
+        return json.load(f).get("kind")
+
+
+def _clusterer_parts(clusterer_state):
+    """Manifest fields, arrays and player rows describing one clusterer."""
+    scaler = clusterer_state["scaler"]
+    arrays = {
+        "scaler_mean": scaler.mean_,
+        "scaler_scale": scaler.scale_,
+        "cluster_centers": clusterer_state["kmeans"].cluster_centers_,
+        "cluster_centers_raw": clusterer_state["cluster_centers_raw"],
+    }
+    fields = {
+        "position": clusterer_state["position"],
+        "season": clusterer_state.get("season"),
+        "n_clusters": clusterer_state["n_clusters"],
+        "cluster_labels": {str(k): v for k, v in clusterer_state["cluster_labels"].items()},
+    }
+    return fields, arrays, clusterer_state["player_data"]
+
+
+def write_clusterer_artifact(path, clusterer_state):
+    """Write a PlayerClusterer state dict (as produced by ``save``) as an artifact."""
+    fields, arrays, players = _clusterer_parts(clusterer_state)
+    _write(path, {"kind": CLUSTERER_KIND, **fields}, arrays, extra_json={"players.json": players})
+
+
+def read_clusterer_artifact(path):
+    """Open a PlayerClusterer artifact.
+
+    Returns:
+        (manifest dict, arrays dict, player data list)
+    """
+    manifest, arrays = read_artifact(path)
+    if manifest.get("kind") != CLUSTERER_KIND:
+        raise ValueError(f"{path} is not a {CLUSTERER_KIND} artifact")
+    with open(os.path.join(path, "players.json")) as f:
+        players = json.load(f)
+    return manifest, arrays, players
+
+
+def write_clusterer_bundle(path, clusterer_states):
+    """Write several PlayerClusterer state dicts, keyed by position, as one artifact."""
+    clusterers = {}
+    arrays = {}
+    players = {}
+    for position, state in clusterer_states.items():
+        fields, sub_arrays, players[position] = _clusterer_parts(state)
+        clusterers[position] = fields
+        arrays.update({f"{position}__{name}": a for name, a in sub_arrays.items()})
+    _write(
+        path, {"kind": CLUSTERER_BUNDLE_KIND, "clusterers": clusterers}, arrays,
+        extra_json={"players.json": players},
+    )
+
+
+def read_clusterer_bundle(path):
+    """Open a ClustererBundle artifact.
+
+    Returns:
+        Dict of position -> (manifest fields, arrays dict, player data list)
+    """
+    manifest, arrays = read_artifact(path)
+    if manifest.get("kind") != CLUSTERER_BUNDLE_KIND:
+        raise ValueError(f"{path} is not a {CLUSTERER_BUNDLE_KIND} artifact")
+    with open(os.path.join(path, "players.json")) as f:
+        players = json.load(f)
+    clusterers = {}
+    for position, fields in manifest["clusterers"].items():
+        prefix = f"{position}__"
+        sub_arrays = {
+            name[len(prefix):]: a for name, a in arrays.items() if name.startswith(prefix)
+        }
+        clusterers[position] = (fields, sub_arrays, players[position])
+    return clusterers
+
+
+def write_similarity_artifact(path, positions, bounds, matrix, mean, scale, players):
+    """Write a SimilarityIndex as an artifact."""
+    _write(
+        path,
+        {"kind": SIMILARITY_KIND, "positions": positions, "bounds": bounds},
+        {"matrix": matrix, "mean": mean, "scale": scale},
+        extra_json={"players.json": players},
+    )
+
+
+def read_similarity_artifact(path):
+    """Open a SimilarityIndex artifact.
+
+    Returns:
+        (manifest dict, arrays dict, player rows list)
+    """
+    manifest, arrays = read_artifact(path)
+    if manifest.get("kind") != SIMILARITY_KIND:
+        raise ValueError(f"{path} is not a {SIMILARITY_KIND} artifact")
+    with open(os.path.join(path, "players.json")) as f:
+        players = json.load(f)
+    return manifest, arrays, players
+
+
+def _projector_pickle_parts(data):
+    """(ensemble, ridge_weight, rf_weight, importances) of a pickled PointProjector state."""
+    if data.get("estimator") == "hgb":
+        ensemble = EnsembleArrays.from_estimators(
+            data["scaler"], data["ridge"], data["gbm"], data["gbm_lower"], data["gbm_upper"],
+        )
+    else:
+        ensemble = EnsembleArrays.from_estimators(data["scaler"], data["ridge"], data["rf"])
+    return ensemble, data["ridge_weight"], data["rf_weight"], data["feature_importances"]
+
+
+def convert_pickle(pkl_path, out_path=None):
+    """Convert a pickled projector, PlayerClusterer or ClustererBundle into an artifact.
+
+    Args:
+        pkl_path: path to a ``.pkl`` written by ``save``
+        out_path: artifact directory (defaults to ``pkl_path`` minus ``.pkl``)
+
+    Returns:
+        The artifact directory path
+    """
+    out_path = out_path or os.path.splitext(pkl_path)[0]
+    with open(pkl_path, "rb") as f:
+        data = pickle.load(f)
+
+    if data.get("positional"):
+        write_positional_artifact(
+            out_path,
+            {position: _projector_pickle_parts(state) for position, state in data["models"].items()},
+            data["fallback"], data["feature_importances"],
+        )
+    elif "rf" in data:
+        write_projector_artifact(out_path, *_projector_pickle_parts(data))
+    elif "kmeans" in data:
+        write_clusterer_artifact(out_path, data)
+    elif data.get("bundle"):
+        write_clusterer_bundle(out_path, data["clusterers"])
+    else:
+        raise ValueError(f"Unrecognized model pickle: {pkl_path}")
+    return out_path
@@ -0,0 +1,215 @@
+"""Walk-forward backtests for the point projection model.
+
+A backtest replays a season week by week. For each week it builds every
+player's features as of that week (from earlier weeks only, exactly as
+serving would have seen them), projects all players in one batch and
+compares against the points actually scored. Weeks are independent, so
+with ``max_workers`` > 1 they run in parallel worker processes that each
+open their own MongoDB client and load the model from disk (artifacts are
+memory-mapped, so workers share one copy).
+
+Results are stored in the ``backtests`` collection keyed by model version
+and season so versions can be compared.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from analytics.features import FEATURE_NAMES, build_feature_frame
+from db import get_db
+
+
+RESULT_COLUMNS = [
+    "player_id", "position", "week", "actual", "projected", "confidence_low", "confidence_high",
+]
+
+
+def backtest_week(db, model, season, week):
+    """Project every player who played ``week`` using only earlier weeks.
+
+    Returns:
+        DataFrame with ``RESULT_COLUMNS``, one row per player with enough
+        history to project
+    """
+    docs = db["weekly_stats"].find({"season": season, "week": week}, {"player_id": 1, "_id": 0})
+    targets = [(d["player_id"], week) for d in docs if d.get("player_id")]
+    if not targets:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    frame = build_feature_frame(db, season, targets=targets)
+    frame = frame[frame["fantasy_points_ppr"].notna()]
+    if frame.empty:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    projected, low, high = model._project_rows(
+        frame[FEATURE_NAMES].to_numpy(dtype=np.float64), list(frame["position"]),
+    )
+    return pd.DataFrame({
+        "player_id": frame["player_id"].to_numpy(),
+        "position": frame["position"].to_numpy(),
+        "week": week,
+        "actual": frame["fantasy_points_ppr"].to_numpy(dtype=np.float64),
+        "projected": projected,
+        "confidence_low": low,
+        "confidence_high": high,
+    }, columns=RESULT_COLUMNS)
+
+
+# Per-process model cache for worker processes, keyed by model path
+_worker_models = {}
+
+
+def _week_worker(uri, model_path, season, week):
+    """Process-pool entry point: open a private Mongo client and score one week."""
+    if model_path not in _worker_models:
+        from analytics.models import load_projector
+        _worker_models[model_path] = load_projector(model_path)
+    return week, backtest_week(get_db(uri=uri), _worker_models[model_path], season, week)
+
+
+def _rank_correlation(group):
+    """Spearman correlation between projected and actual points, or NaN."""
+    if len(group) < 2:
+        return np.nan
+    return group["projected"].rank().corr(group["actual"].rank())
+
+
+def score_results(results):
+    """Summarize backtest rows.
+
+    Returns:
+        Dict with n, mae, rmse, r2 and coverage (share of actual scores inside
+        ``confidence_low``..``confidence_high``)
+    """
+    actual = results["actual"].to_numpy(dtype=np.float64)
+    errors = actual - results["projected"].to_numpy(dtype=np.float64)
+    ss_res = np.sum(errors ** 2)
+    ss_tot = np.sum((actual - np.mean(actual)) ** 2)
+    inside = (actual >= results["confidence_low"]) & (actual <= results["confidence_high"])
+    return {
+        "n": int(len(results)),
+        "mae": round(float(np.mean(np.abs(errors))), 3),
+        "rmse": round(float(np.sqrt(np.mean(errors ** 2))), 3),
+        "r2": round(float(1 - ss_res / ss_tot), 4) if ss_tot > 0 else 0.0,
+        "coverage": round(float(np.mean(inside)), 3),
+    }
+
+
+def summarize_backtest(results):
+    """Aggregate backtest rows overall, per position and per week.
+
+    Per-position entries add ``rank_corr``: the Spearman correlation between
+    projected and actual points among that position's players, computed
+    within each week and averaged over weeks.
+    """
+    by_position = {}
+    for position, group in results.groupby("position"):
+        weekly_corr = group.groupby("week").apply(_rank_correlation).dropna()
+        by_position[position] = {
+            **score_results(group),
+            "rank_corr": round(float(weekly_corr.mean()), 3) if len(weekly_corr) else None,
+        }
+    return {
+        "overall": score_results(results),
+        "by_position": by_position,
+        "by_week": [
+            {"week": int(week), **score_results(group)}
+            for week, group in results.groupby("week")
+        ],
+    }
+
+
+def run_backtest(db, model, season, weeks=None, max_workers=1, uri=None, model_path=None,
+                 progress=None):
+    """Walk-forward backtest of a trained PointProjector over one season.
+
+    Args:
+        db: MongoDB database instance for serial runs
+        model: trained PointProjector (or PositionalProjector) for serial runs
+        season: NFL season year to replay
+        weeks: weeks to score (default: every week with stats)
+        max_workers: number of worker processes (1 = serial)
+        uri: MongoDB URI for worker processes
+        model_path: artifact directory or pickle workers load the model from;
+            required when ``max_workers`` > 1
+        progress: optional callable(week, completed, total) invoked as each
+            week finishes
+
+    Returns:
+        Dict with season, weeks, overall, by_position and by_week metrics,
+        or None if no week could be scored
+    """
+    if weeks is None:
+        weeks = sorted(db["weekly_stats"].distinct("week", {"season": season}))
+    weeks = list(weeks)
+    frames = {}
+
+    if max_workers is not None and max_workers > 1 and len(weeks) > 1:
+        if model_path is None:
+            raise ValueError("model_path is required for parallel backtests")
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(weeks))) as pool:
+            futures = [
+                pool.submit(_week_worker, uri, model_path, season, week) for week in weeks
+            ]
+            for future in as_completed(futures):
+                week, frame = future.result()
+                frames[week] = frame
+                if progress:
+                    progress(week, len(frames), len(weeks))
+    else:
+        for week in weeks:
+            frames[week] = backtest_week(db, model, season, week)
+            if progress:
+                progress(week, len(frames), len(weeks))
+
+    parts = [frames[week] for week in weeks if not frames[week].empty]
+    if not parts:
+        return None
+    results = pd.concat(parts, ignore_index=True)
+    return {
+        "season": season,
+        "weeks": [week for week in weeks if not frames[week].empty],
+        **summarize_backtest(results),
+    }
+
+
+def format_backtest(summary):
+    """Render a backtest summary as printable lines."""
+    overall = summary["overall"]
+    lines = [
+        f"  Backtest {summary['season']} (weeks {summary['weeks'][0]}-{summary['weeks'][-1]}, "
+        f"{overall['n']} projections):",
+        f"    MAE: {overall['mae']:.3f}  RMSE: {overall['rmse']:.3f}  R2: {overall['r2']:.4f}  "
+        f"Coverage: {overall['coverage']:.1%}",
+    ]
+    for position, metrics in sorted(summary["by_position"].items()):
+        rank_corr = "n/a" if metrics["rank_corr"] is None else f"{metrics['rank_corr']:.3f}"
+        lines.append(
+            f"    {position:<3} MAE: {metrics['mae']:.3f}  Coverage: {metrics['coverage']:.1%}  "
+            f"Rank corr: {rank_corr}  (n={metrics['n']})"
+        )
+    return lines
+
+
+def save_backtest(db, summary, model_name="point_projector", model_version=None, **fields):
+    """Persist a backtest summary, replacing any earlier run of the same version and season."""
+    db["backtests"].update_one(
+        {"model_name": model_name, "model_version": model_version, "season": summary["season"]},
+        {"$set": {
+            "model_name": model_name,
+            "model_version": model_version,
+            "run_at": datetime.now(timezone.utc),
+            **summary,
+            **fields,
+        }},
+        upsert=True,
+    )
+
+
+def get_backtests(db, season, model_name="point_projector"):
+    """Stored backtest summaries for a season, most recent run first."""
+    return list(db["backtests"].find(
+        {"model_name": model_name, "season": season}, {"_id": 0},
+    ).sort("run_at", -1))
@@ -0,0 +1,93 @@
+"""Point-in-time career aggregates.
+
+``career_stats`` holds one doc per (player_id, season) with the player's
+cumulative fantasy points and games from ``seasonal_stats`` over every
+season *before* that season. Projections for any week of season N read the
+(player_id, N) doc, so career averages never include the season being
+projected or later ones, and the lookup is a single unique-index hit.
+
+Docs exist for every season from the player's second season on record
+through the season after their last one, so the upcoming season can be
+served before its seasonal stats are ingested. The table is rebuilt for the
+affected players whenever seasonal stats are ingested, and built for every
+player on first lookup in databases whose seasonal stats predate it.
+"""
+
+
+def build_career_stats(db, player_ids=None):
+    """Recompute ``career_stats`` docs from ``seasonal_stats``.
+
+    Args:
+        db: MongoDB database instance
+        player_ids: players to rebuild (default: every player)
+
+    Returns:
+        Number of docs upserted
+    """
+    query = {} if player_ids is None else {"player_id": {"$in": list(player_ids)}}
+    seasons = {}
+    for doc in db["seasonal_stats"].find(
+        query, {"player_id": 1, "season": 1, "fantasy_points_ppr": 1, "games": 1, "_id": 0},
+    ):
+        if doc.get("player_id") and doc.get("season"):
+            seasons.setdefault(doc["player_id"], {})[doc["season"]] = (
+                doc.get("fantasy_points_ppr", 0) or 0,
+                doc.get("games", 0) or 0,
+            )
+
+    collection = db["career_stats"]
+    count = 0
+    for player_id, by_season in seasons.items():
+        career_points, career_games, n_seasons = 0.0, 0, 0
+        for season in range(min(by_season), max(by_season) + 2):
+            if n_seasons:
+                collection.update_one(
+                    {"player_id": player_id, "season": season},
+                    {"$set": {
+                        "player_id": player_id,
+                        "season": season,
+                        "career_points": career_points,
+                        "career_games": career_games,
+                        "career_seasons": n_seasons,
+                    }},
+                    upsert=True,
+                )
+                count += 1
+            if season in by_season:
+                points, games = by_season[season]
+                career_points += points
+                career_games += games
+                n_seasons += 1
+    return count
+
+
+def ensure_career_stats(db):
+    """Build ``career_stats`` for every player if it is empty but seasonal stats exist.
+
+    Returns:
+        Number of docs upserted (0 if the table was already populated)
+    """
+    if db["career_stats"].find_one({}, {"_id": 1}) is not None:
+        return 0
+    if db["seasonal_stats"].find_one({}, {"_id": 1}) is None:
+        return 0
+    return build_career_stats(db)
+
+
+def get_career_avgs(db, player_ids, season):
+    """Career points per game through season ``season - 1``.
+
+    Backfills an empty ``career_stats`` table first (see ``ensure_career_stats``).
+
+    Returns:
+        Dict of player_id -> average for players with at least one prior game
+    """
+    ensure_career_stats(db)
+    avgs = {}
+    for doc in db["career_stats"].find(
+        {"player_id": {"$in": list(player_ids)}, "season": season},
+        {"player_id": 1, "career_points": 1, "career_games": 1, "_id": 0},
+    ):
+        if doc.get("career_games"):
+            avgs[doc["player_id"]] = doc["career_points"] / doc["career_games"]
+    return avgs
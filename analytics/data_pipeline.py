@@ -3,6 +3,8 @@
 import nfl_data_py as nfl
 import pandas as pd
 
+from analytics.career_stats import build_career_stats
+
 
 def fetch_seasonal_data(years):
     """Fetch seasonal player stats enriched with player name/position/team."""
@@ -23,7 +25,7 @@ def fetch_weekly_data(years):
 
 
 def ingest_seasonal_stats(db, years):
-    """Ingest seasonal stats into MongoDB.
+    """Ingest seasonal stats into MongoDB and refresh their ``career_stats``.
 
     Args:
         db: MongoDB database instance
@@ -47,6 +49,7 @@ def ingest_seasonal_stats(db, years):
 
     # Upsert by player_id + season
     count = 0
+    player_ids = set()
     for record in records:
         player_id = record.get("player_id")
         season = record.get("season")
@@ -56,7 +59,12 @@ def ingest_seasonal_stats(db, years):
                 {"$set": record},
                 upsert=True,
             )
+            player_ids.add(player_id)
             count += 1
+
+    # Refresh point-in-time career totals of every player touched
+    if player_ids:
+        build_career_stats(db, player_ids)
     return count
 
 
@@ -0,0 +1,216 @@
+"""Persistent feature store for the point projection model.
+
+Feature rows are stored in the ``features`` collection keyed by
+``(player_id, season, week, feature_set_version)``. Training, hold-out
+evaluation and serving read from here instead of recomputing features from
+the raw collections. Rows are point-in-time snapshots: once a week has been
+played and stored it is not rewritten, new weeks are appended, and bumping
+``FEATURE_SET_VERSION`` invalidates everything written under older versions.
+Rows for the upcoming week of a season in progress are the exception: they
+are replaced on every update.
+"""
+
+import math
+
+import pandas as pd
+
+from analytics.features import (
+    FEATURE_NAMES, FEATURE_SET_VERSION, FRAME_COLUMNS, build_feature_frame, build_feature_frames,
+)
+
+
+def _to_doc(record):
+    """Convert a feature frame record into a BSON-safe document."""
+    doc = {"feature_set_version": FEATURE_SET_VERSION}
+    for key in FRAME_COLUMNS + FEATURE_NAMES:
+        value = record.get(key)
+        if isinstance(value, float) and math.isnan(value):
+            value = None
+        doc[key] = value
+    return doc
+
+
+def write_features(db, frame):
+    """Upsert every row of a feature frame into the store.
+
+    Returns:
+        Number of rows written
+    """
+    collection = db["features"]
+    count = 0
+    for record in frame.to_dict("records"):
+        doc = _to_doc(record)
+        collection.update_one(
+            {"player_id": doc["player_id"], "season": doc["season"], "week": doc["week"],
+             "feature_set_version": FEATURE_SET_VERSION},
+            {"$set": doc},
+            upsert=True,
+        )
+        count += 1
+    return count
+
+
+def purge_stale_features(db):
+    """Delete rows written under any other feature set version.
+
+    Returns:
+        Number of rows deleted
+    """
+    result = db["features"].delete_many({"feature_set_version": {"$ne": FEATURE_SET_VERSION}})
+    return result.deleted_count
+
+
+def _last_played_week(db, season):
+    """Latest stored week for the season whose actual score is known, or 0."""
+    doc = db["features"].find_one(
+        {"season": season, "feature_set_version": FEATURE_SET_VERSION,
+         "fantasy_points_ppr": {"$ne": None}},
+        {"week": 1, "_id": 0},
+        sort=[("week", -1)],
+    )
+    return doc["week"] if doc else 0
+
+
+def _upcoming_week(db, season):
+    """The week after the latest ingested one if it is still to be played, else None.
+
+    A week is still to be played when the season's schedule has a game in it
+    without a score, so finished seasons (and seasons without a loaded
+    schedule) have no upcoming week.
+    """
+    latest = db["weekly_stats"].find_one(
+        {"season": season}, {"week": 1, "_id": 0}, sort=[("week", -1)],
+    )
+    if not latest:
+        return None
+    week = latest["week"] + 1
+    game = db["schedules"].find_one({"season": season, "week": week, "home_score": None})
+    return week if game else None
+
+
+def update_feature_store(db, season, include_upcoming=True):
+    """Append feature rows for weeks ingested since the last update.
+
+    Rebuilds every week after the last stored played week, plus (optionally)
+    the upcoming week after the latest ingested one so serving can read
+    next-week features. Upcoming rows stored earlier are dropped first, so
+    they are rebuilt with that week's stats once it is played, or with
+    current matchup data while it is still upcoming. Stale feature set
+    versions are purged first.
+
+    Args:
+        db: MongoDB database instance
+        season: NFL season year
+        include_upcoming: also store rows for the week after the latest
+            ingested week, for every player with data this season, if the
+            season's schedule shows that week is still to be played
+
+    Returns:
+        Number of rows written
+    """
+    purge_stale_features(db)
+    last_week = _last_played_week(db, season)
+    db["features"].delete_many({
+        "season": season, "week": {"$gt": last_week}, "fantasy_points_ppr": None,
+        "feature_set_version": FEATURE_SET_VERSION,
+    })
+
+    docs = list(db["weekly_stats"].find(
+        {"season": season, "week": {"$gt": last_week}},
+        {"player_id": 1, "week": 1, "_id": 0},
+    ))
+    targets = [(d["player_id"], d["week"]) for d in docs if d.get("player_id")]
+
+    upcoming = _upcoming_week(db, season) if include_upcoming else None
+    if upcoming:
+        players = db["weekly_stats"].distinct("player_id", {"season": season})
+        targets.extend((pid, upcoming) for pid in players if pid)
+
+    if not targets:
+        return 0
+    return write_features(db, build_feature_frame(db, season, targets=targets))
+
+
+def read_feature_frame(db, seasons, played_only=True):
+    """Read stored feature rows for the given seasons at the current version.
+
+    Returns:
+        DataFrame in the layout of ``build_feature_frame``, ordered by
+        season (in the order given), player, then week.
+    """
+    query = {"season": {"$in": list(seasons)}, "feature_set_version": FEATURE_SET_VERSION}
+    if played_only:
+        query["fantasy_points_ppr"] = {"$ne": None}
+    docs = list(db["features"].find(query, {"_id": 0, "feature_set_version": 0}))
+    frame = pd.DataFrame(docs, columns=FRAME_COLUMNS + FEATURE_NAMES)
+    if frame.empty:
+        return frame
+    order = {season: i for i, season in enumerate(seasons)}
+    frame["_order"] = frame["season"].map(order)
+    frame = frame.sort_values(["_order", "player_id", "week"], kind="stable")
+    return frame.drop(columns="_order").reset_index(drop=True)
+
+
+def load_training_frame(db, seasons, max_workers=1, uri=None, progress=None):
+    """Load played feature rows for training or evaluation via the store.
+
+    Seasons not yet in the store are built with ``build_feature_frames`` and
+    written; seasons already stored are topped up with
+    ``update_feature_store`` before reading.
+
+    Returns:
+        DataFrame in the layout of ``build_feature_frame``
+    """
+    seasons = list(seasons)
+    purge_stale_features(db)
+    stored = set(db["features"].distinct(
+        "season", {"season": {"$in": seasons}, "feature_set_version": FEATURE_SET_VERSION},
+    ))
+    missing = [s for s in seasons if s not in stored]
+
+    for season in seasons:
+        if season in stored:
+            update_feature_store(db, season, include_upcoming=False)
+    if missing:
+        write_features(db, build_feature_frames(
+            missing, db=db, uri=uri, max_workers=max_workers, progress=progress,
+        ))
+    return read_feature_frame(db, seasons)
+
+
+def get_stored_feature_rows(db, season, targets, fields=None):
+    """Look up stored feature dicts for arbitrary (player_id, week) pairs of one season.
+
+    Args:
+        fields: stored fields to return (default: ``FEATURE_NAMES``)
+
+    Returns:
+        Dict of (player_id, week) -> {field: value} for pairs found
+    """
+    targets = set(targets)
+    if not targets:
+        return {}
+    fields = list(fields or FEATURE_NAMES)
+    docs = db["features"].find(
+        {"player_id": {"$in": list({pid for pid, _ in targets})},
+         "season": season,
+         "week": {"$in": list({week for _, week in targets})},
+         "feature_set_version": FEATURE_SET_VERSION},
+        {"_id": 0, "player_id": 1, "week": 1, **{name: 1 for name in fields}},
+    )
+    rows = {}
+    for doc in docs:
+        key = (doc["player_id"], doc["week"])
+        if key in targets:
+            rows[key] = {name: doc.get(name) for name in fields}
+    return rows
+
+
+def get_stored_features(db, player_ids, season, week):
+    """Look up stored feature dicts for several players in one week.
+
+    Returns:
+        Dict of player_id -> {feature_name: value} for players found
+    """
+    rows = get_stored_feature_rows(db, season, [(pid, week) for pid in player_ids])
+    return {pid: features for (pid, _), features in rows.items()}
@@ -0,0 +1,348 @@
+"""Frame-based feature construction for the point projection model.
+
+``PointProjector.build_features`` answers one player-week at a time with a
+handful of queries each. The builder here loads a season's weekly stats,
+snap counts, schedules and career totals once and computes the same feature
+values for every requested player-week with array operations.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from analytics.career_stats import get_career_avgs
+from analytics.matchup_stats import compute_defensive_rankings
+from db import get_db
+
+
+FEATURE_NAMES = [
+    "season_avg_points",
+    "last_3_avg",
+    "last_5_avg",
+    "std_dev",
+    "games_played",
+    "snap_pct",
+    "matchup_rank",
+    "matchup_avg_allowed",
+    "home_away",
+    "career_avg",
+]
+
+# Bump whenever a feature definition changes; invalidates the feature store.
+# 2: career_avg covers prior seasons only (from ``career_stats``)
+FEATURE_SET_VERSION = 2
+
+FRAME_COLUMNS = ["player_id", "player_name", "position", "season", "week", "fantasy_points_ppr"]
+
+# Composite (key, week) sort keys are built as key * _WEEK_SPAN + week.
+_WEEK_SPAN = 1000
+
+
+def _window_bounds(hist_codes, hist_weeks, target_codes, target_weeks):
+    """Locate, for each target, the history rows with the same key and an earlier week.
+
+    History arrays must be sorted by (code, week). Returns (start, count)
+    arrays indexing into the history; count is 0 for unknown keys (code -1).
+    """
+    hist_key = hist_codes.astype(np.int64) * _WEEK_SPAN + hist_weeks.astype(np.int64)
+    base = target_codes.astype(np.int64) * _WEEK_SPAN
+    start = np.searchsorted(hist_key, base, side="left")
+    end = np.searchsorted(hist_key, base + target_weeks.astype(np.int64), side="left")
+    count = np.where(target_codes >= 0, end - start, 0)
+    return start, count
+
+
+def _gather(values, positions, mask):
+    """Fancy-index ``values`` at ``positions``, zero-filling masked-out cells."""
+    if len(values) == 0:
+        return np.zeros(positions.shape)
+    safe = np.clip(positions, 0, len(values) - 1)
+    return np.where(mask, values[safe], 0.0)
+
+
+def _sequential_sum(matrix):
+    """Sum each row left to right, matching the accumulation order of ``sum()``."""
+    total = np.zeros(matrix.shape[0])
+    for j in range(matrix.shape[1]):
+        total = total + matrix[:, j]
+    return total
+
+
+def _round(values, digits):
+    """Round with Python's ``round`` so results match the per-row builder exactly."""
+    return np.array([round(float(v), digits) for v in values], dtype=np.float64)
+
+
+def _recent_window_sum(points, start, count, size):
+    """Sum the last ``size`` history values (oldest first) and return (sum, length)."""
+    length = np.minimum(count, size)
+    first = start + count - length
+    offsets = np.arange(size)
+    mask = offsets[None, :] < length[:, None]
+    window = _gather(points, first[:, None] + offsets[None, :], mask)
+    return _sequential_sum(window), length
+
+
+def _load_weekly(db, season, player_ids):
+    query = {"season": season}
+    if player_ids is not None:
+        query["player_id"] = {"$in": list(player_ids)}
+    docs = list(db["weekly_stats"].find(
+        query,
+        {"player_id": 1, "player_name": 1, "position": 1, "recent_team": 1,
+         "week": 1, "fantasy_points_ppr": 1, "_id": 0},
+    ))
+    frame = pd.DataFrame(docs, columns=[
+        "player_id", "player_name", "position", "recent_team", "week", "fantasy_points_ppr",
+    ])
+    frame = frame[frame["player_id"].notna() & frame["week"].notna()]
+    frame["fantasy_points_ppr"] = frame["fantasy_points_ppr"].fillna(0).astype(np.float64)
+    return frame
+
+
+def _load_snaps(db, season, player_names):
+    docs = list(db["snap_counts"].find(
+        {"season": season, "player": {"$in": list(player_names)}},
+        {"player": 1, "week": 1, "offense_pct": 1, "_id": 0},
+    ))
+    frame = pd.DataFrame(docs, columns=["player", "week", "offense_pct"])
+    frame = frame[frame["player"].notna() & frame["week"].notna()]
+    pct = frame["offense_pct"].fillna(0.5).astype(np.float64)
+    frame["offense_pct"] = pct.where(pct != 0, 0.5)
+    return frame
+
+
+def _load_schedule(db, season):
+    """Return (home, away) lookup frames keyed by (team, week).
+
+    Like ``get_upcoming_opponent``, a home game wins over an away game and the
+    first matching document in natural order wins among duplicates.
+    """
+    docs = list(db["schedules"].find(
+        {"season": season},
+        {"week": 1, "home_team": 1, "away_team": 1, "_id": 0},
+    ))
+    games = pd.DataFrame(docs, columns=["week", "home_team", "away_team"])
+    home = games.drop_duplicates(["home_team", "week"], keep="first").rename(
+        columns={"home_team": "team", "away_team": "opponent"}
+    )
+    away = games.drop_duplicates(["away_team", "week"], keep="first").rename(
+        columns={"away_team": "team", "home_team": "opponent"}
+    )
+    return home, away
+
+
+def _empty_frame():
+    return pd.DataFrame(columns=FRAME_COLUMNS + FEATURE_NAMES)
+
+
+def build_feature_frame(db, season, targets=None):
+    """Build the projection feature matrix for many player-weeks of one season.
+
+    Args:
+        db: MongoDB database instance
+        season: NFL season year
+        targets: optional iterable of (player_id, week) pairs to build features
+            for. Weeks need not exist in weekly_stats (e.g. upcoming games).
+            Defaults to every player-week in weekly_stats for the season,
+            ordered by player then week.
+
+    Returns:
+        DataFrame with FRAME_COLUMNS plus FEATURE_NAMES, one row per target
+        that has at least two prior games, in target order. Feature values are
+        identical to ``PointProjector.build_features`` for the same player-week;
+        ``fantasy_points_ppr`` is the actual score (NaN for unplayed weeks).
+    """
+    if targets is None:
+        history = _load_weekly(db, season, None)
+        order = [pid for pid in db["weekly_stats"].distinct("player_id", {"season": season}) if pid]
+        rank = {pid: i for i, pid in enumerate(order)}
+        targets_df = history[["player_id", "week"]].copy()
+        targets_df["_order"] = targets_df["player_id"].map(rank)
+        targets_df = targets_df.sort_values(["_order", "week"], kind="stable")
+        targets_df = targets_df.drop(columns="_order").reset_index(drop=True)
+    else:
+        targets_df = pd.DataFrame(list(targets), columns=["player_id", "week"])
+        if targets_df.empty:
+            return _empty_frame()
+        history = _load_weekly(db, season, targets_df["player_id"].unique())
+
+    if history.empty or targets_df.empty:
+        return _empty_frame()
+
+    # Sort history by (player, week) so each player's games are one contiguous run
+    player_codes, player_keys = pd.factorize(history["player_id"])
+    history = history.assign(_code=player_codes).sort_values(["_code", "week"], kind="stable")
+    hist_codes = history["_code"].to_numpy()
+    hist_weeks = history["week"].to_numpy(dtype=np.int64)
+    points = history["fantasy_points_ppr"].to_numpy(dtype=np.float64)
+
+    target_codes = pd.Index(player_keys).get_indexer(targets_df["player_id"])
+    target_weeks = targets_df["week"].to_numpy(dtype=np.int64)
+    start, count = _window_bounds(hist_codes, hist_weeks, target_codes, target_weeks)
+
+    valid = count >= 2
+    targets_df = targets_df[valid].reset_index(drop=True)
+    start, count = start[valid], count[valid]
+    target_weeks = target_weeks[valid]
+    if targets_df.empty:
+        return _empty_frame()
+
+    n = count.astype(np.float64)
+
+    # Season-to-date scoring: every prior game, oldest first
+    width = int(count.max())
+    offsets = np.arange(width)
+    mask = offsets[None, :] < count[:, None]
+    prior = _gather(points, start[:, None] + offsets[None, :], mask)
+    season_avg = _sequential_sum(prior) / n
+    deviations = np.where(mask, (prior - season_avg[:, None]) ** 2, 0.0)
+    std_dev = np.sqrt(_sequential_sum(deviations) / n)
+
+    last_3_sum, last_3_len = _recent_window_sum(points, start, count, 3)
+    last_5_sum, last_5_len = _recent_window_sum(points, start, count, 5)
+
+    # Identity fields come from the player's earliest game of the season
+    first_game = history.iloc[start]
+    player_names = first_game["player_name"].to_numpy(dtype=object)
+    positions = first_game["position"].to_numpy(dtype=object)
+    teams = first_game["recent_team"].to_numpy(dtype=object)
+
+    # Snap share: mean of the (up to) three most recent snap rows before the week
+    snap_pct = np.full(len(targets_df), 0.5)
+    has_name = np.array([bool(name) for name in player_names])
+    if has_name.any():
+        snaps = _load_snaps(db, season, set(player_names[has_name]))
+        if not snaps.empty:
+            snap_codes, snap_keys = pd.factorize(snaps["player"])
+            snaps = snaps.assign(_code=snap_codes).sort_values(["_code", "week"], kind="stable")
+            snap_values = snaps["offense_pct"].to_numpy(dtype=np.float64)
+            name_codes = pd.Index(snap_keys).get_indexer(
+                pd.Series(player_names).where(has_name, None)
+            )
+            snap_start, snap_count = _window_bounds(
+                snaps["_code"].to_numpy(), snaps["week"].to_numpy(dtype=np.int64),
+                name_codes, target_weeks,
+            )
+            recent = np.minimum(snap_count, 3)
+            # Most recent first, as the per-row builder sorts by week descending
+            latest = snap_start + snap_count - 1
+            back = np.arange(3)
+            snap_mask = back[None, :] < recent[:, None]
+            window = _gather(snap_values, latest[:, None] - back[None, :], snap_mask)
+            has_snaps = recent > 0
+            snap_pct = np.where(
+                has_snaps, _sequential_sum(window) / np.maximum(recent, 1), 0.5
+            )
+
+    # Opponent and home/away from the schedule, then defensive rank vs position
+    lookup = pd.DataFrame({
+        "team": pd.Series(teams).where(pd.Series([bool(t) for t in teams]), None),
+        "week": target_weeks,
+        "position": positions,
+    })
+    home, away = _load_schedule(db, season)
+    home_match = lookup.merge(home, on=["team", "week"], how="left", indicator=True)
+    away_match = lookup.merge(away, on=["team", "week"], how="left", indicator=True)
+    is_home = (home_match["_merge"] == "both").to_numpy() & lookup["team"].notna().to_numpy()
+    is_away = (away_match["_merge"] == "both").to_numpy() & lookup["team"].notna().to_numpy()
+    opponents = np.where(is_home, home_match["opponent"], away_match["opponent"])
+    home_away = np.where(is_home, 1.0, np.where(is_away, 0.0, 0.5))
+
+    rankings = compute_defensive_rankings(db, season)
+    ranking_rows = pd.DataFrame(
+        [
+            (team, position, stats["rank"], stats["avg_allowed"])
+            for team, by_position in rankings.items()
+            for position, stats in by_position.items()
+        ],
+        columns=["opponent", "position", "matchup_rank", "matchup_avg_allowed"],
+    )
+    matchup = pd.DataFrame({
+        "opponent": pd.Series(opponents, dtype=object).where(is_home | is_away, None),
+        "position": positions,
+    }).merge(ranking_rows, on=["opponent", "position"], how="left")
+    has_matchup = matchup["matchup_rank"].notna().to_numpy() & (is_home | is_away)
+    matchup_rank = np.where(has_matchup, matchup["matchup_rank"].to_numpy(dtype=np.float64), 16.0)
+    matchup_avg = np.where(
+        has_matchup, matchup["matchup_avg_allowed"].to_numpy(dtype=np.float64), season_avg
+    )
+
+    career = get_career_avgs(db, targets_df["player_id"].unique(), season)
+    career_avg = np.array([
+        career.get(pid, avg) for pid, avg in zip(targets_df["player_id"], season_avg)
+    ], dtype=np.float64)
+
+    actual = targets_df[["player_id", "week"]].merge(
+        history[["player_id", "week", "fantasy_points_ppr"]], on=["player_id", "week"], how="left",
+    )["fantasy_points_ppr"].to_numpy()
+
+    frame = pd.DataFrame({
+        "player_id": targets_df["player_id"].to_numpy(dtype=object),
+        "player_name": player_names,
+        "position": positions,
+        "season": season,
+        "week": target_weeks,
+        "fantasy_points_ppr": actual,
+        "season_avg_points": _round(season_avg, 2),
+        "last_3_avg": _round(last_3_sum / last_3_len, 2),
+        "last_5_avg": _round(last_5_sum / last_5_len, 2),
+        "std_dev": _round(std_dev, 2),
+        "games_played": count,
+        "snap_pct": _round(snap_pct, 4),
+        "matchup_rank": matchup_rank,
+        "matchup_avg_allowed": _round(matchup_avg, 2),
+        "home_away": home_away,
+        "career_avg": _round(career_avg, 2),
+    })
+    return frame
+
+
+def _season_frame_worker(uri, season):
+    """Process-pool entry point: open a private Mongo client and build one season."""
+    return season, build_feature_frame(get_db(uri=uri), season)
+
+
+def build_feature_frames(seasons, db=None, uri=None, max_workers=1, progress=None):
+    """Build and concatenate feature frames for several seasons.
+
+    With ``max_workers`` > 1 each season is built in its own worker process,
+    and every worker opens its own MongoDB client from ``uri`` (``None`` uses
+    the same default as ``get_db``). Otherwise seasons are built serially
+    against ``db``. Either way the result is ordered by ``seasons``.
+
+    Args:
+        seasons: list of NFL season years
+        db: MongoDB database instance for serial builds
+        uri: MongoDB URI for worker processes
+        max_workers: number of worker processes (1 = serial)
+        progress: optional callable(season, completed, total) invoked as each
+            season finishes
+
+    Returns:
+        DataFrame in the layout of ``build_feature_frame``.
+    """
+    seasons = list(seasons)
+    frames = {}
+
+    if max_workers is not None and max_workers > 1 and len(seasons) > 1:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(seasons))) as pool:
+            futures = [pool.submit(_season_frame_worker, uri, season) for season in seasons]
+            for future in as_completed(futures):
+                season, frame = future.result()
+                frames[season] = frame
+                if progress:
+                    progress(season, len(frames), len(seasons))
+    else:
+        if db is None:
+            db = get_db(uri=uri)
+        for season in seasons:
+            frames[season] = build_feature_frame(db, season)
+            if progress:
+                progress(season, len(frames), len(seasons))
+
+    parts = [frames[season] for season in seasons if not frames[season].empty]
+    if not parts:
+        return _empty_frame()
+    return pd.concat(parts, ignore_index=True)
@@ -0,0 +1,207 @@
+"""Pure-NumPy inference for the Ridge + tree-model ensemble.
+
+``EnsembleArrays`` holds the fitted scaler, ridge coefficients and every
+tree of the random forest (or of the gradient-boosted mean and quantile
+models) as flat NumPy arrays. It is PointProjector's inference path
+whether the model was just trained, unpickled or opened from a
+memory-mapped artifact (see ``analytics.artifacts``), and it skips sklearn's
+per-call validation and thread dispatch, which dominate at small batch
+sizes.
+
+Outputs are bit-for-bit identical to sklearn: the scaler and ridge use the
+same float64 operations, trees compare float32-cast inputs against float64
+thresholds like ``DecisionTreeRegressor``, and the forest mean accumulates
+trees in estimator order (sklearn's order when ``n_jobs=1``; with threads
+its accumulation order, and so its last bit, can vary between calls).
+Boosted models compare float64 inputs and add trees to the baseline in
+iteration order, as ``HistGradientBoostingRegressor`` does. Boosted models
+are assumed to have been fit without missing values.
+"""
+
+import numpy as np
+
+
+class ForestArrays:
+    """A fitted regression forest flattened into node arrays.
+
+    All trees share one set of node arrays; ``roots`` holds each tree's root
+    node index and ``value`` each node's mean target. Child indices are
+    global, and leaves point to themselves (with feature 0), so every row can
+    take exactly ``max_depth`` steps through every tree in lockstep without
+    per-step masking: once a row reaches a leaf it stays there.
+    """
+
+    ARRAY_NAMES = ("roots", "left", "right", "feature", "threshold", "value")
+    INPUT_DTYPE = np.float32
+
+    def __init__(self, roots, left, right, feature, threshold, value, max_depth):
+        self.roots = roots
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.max_depth = int(max_depth)
+
+    @classmethod
+    def from_estimator(cls, forest):
+        """Flatten a fitted ``RandomForestRegressor``."""
+        trees = [est.tree_ for est in forest.estimators_]
+        sizes = np.array([t.node_count for t in trees], dtype=np.int64)
+        roots = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+
+        left, right, feature = [], [], []
+        for root, tree in zip(roots, trees):
+            nodes = np.arange(tree.node_count, dtype=np.int64) + root
+            is_leaf = tree.children_left < 0
+            left.append(np.where(is_leaf, nodes, tree.children_left + root))
+            right.append(np.where(is_leaf, nodes, tree.children_right + root))
+            feature.append(np.where(is_leaf, 0, tree.feature))
+
+        return cls(
+            roots=roots,
+            left=np.concatenate(left).astype(np.int64),
+            right=np.concatenate(right).astype(np.int64),
+            feature=np.concatenate(feature).astype(np.int64),
+            threshold=np.concatenate([t.threshold for t in trees]).astype(np.float64),
+            value=np.concatenate([t.value[:, 0, 0] for t in trees]).astype(np.float64),
+            max_depth=max(t.max_depth for t in trees),
+        )
+
+    def arrays(self):
+        return {name: getattr(self, name) for name in self.ARRAY_NAMES}
+
+    def tree_predictions(self, X):
+        """Per-tree predictions, shape (n_rows, n_trees).
+
+        Inputs are cast to float32 before comparing against thresholds, as
+        sklearn does, so every split lands on the same side and the leaf
+        values are exactly those of ``tree.predict``.
+        """
+        X = np.asarray(X, dtype=self.INPUT_DTYPE)
+        n_features = X.shape[1]
+        flat = X.ravel()
+        # Offset of each row's first feature in the flattened input
+        row_base = (np.arange(X.shape[0], dtype=np.int64) * n_features)[:, None]
+        node = np.broadcast_to(self.roots, (X.shape[0], len(self.roots))).copy()
+        for _ in range(self.max_depth):
+            go_left = flat[row_base + self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return self.value[node]
+
+
+class BoostedArrays(ForestArrays):
+    """A fitted ``HistGradientBoostingRegressor`` flattened into node arrays.
+
+    Same layout as ``ForestArrays``; leaf values already include the
+    learning rate, so a prediction is ``baseline`` plus every tree's leaf
+    value.
+    """
+
+    INPUT_DTYPE = np.float64
+
+    def __init__(self, roots, left, right, feature, threshold, value, max_depth, baseline):
+        super().__init__(roots, left, right, feature, threshold, value, max_depth)
+        self.baseline = float(baseline)
+
+    @classmethod
+    def from_estimator(cls, model):
+        """Flatten a fitted single-output ``HistGradientBoostingRegressor``."""
+        trees = [predictors[0].nodes for predictors in model._predictors]
+        sizes = np.array([len(t) for t in trees], dtype=np.int64)
+        roots = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+
+        left, right, feature = [], [], []
+        for root, nodes in zip(roots, trees):
+            ids = np.arange(len(nodes), dtype=np.int64) + root
+            is_leaf = nodes["is_leaf"].astype(bool)
+            left.append(np.where(is_leaf, ids, nodes["left"].astype(np.int64) + root))
+            right.append(np.where(is_leaf, ids, nodes["right"].astype(np.int64) + root))
+            feature.append(np.where(is_leaf, 0, nodes["feature_idx"]))
+
+        return cls(
+            roots=roots,
+            left=np.concatenate(left).astype(np.int64),
+            right=np.concatenate(right).astype(np.int64),
+            feature=np.concatenate(feature).astype(np.int64),
+            threshold=np.concatenate([t["num_threshold"] for t in trees]).astype(np.float64),
+            value=np.concatenate([t["value"] for t in trees]).astype(np.float64),
+            max_depth=max(int(t["depth"].max()) for t in trees),
+            baseline=float(np.ravel(model._baseline_prediction)[0]),
+        )
+
+    def predict(self, X):
+        """Boosted prediction, accumulating trees onto the baseline in order."""
+        tree_preds = self.tree_predictions(X)
+        start = np.full((tree_preds.shape[0], 1), self.baseline)
+        return np.cumsum(np.hstack([start, tree_preds]), axis=1)[:, -1]
+
+
+def split_gains(boosted, n_features):
+    """Total split gain per feature of a fitted ``HistGradientBoostingRegressor``."""
+    gains = np.zeros(n_features)
+    for predictors in boosted._predictors:
+        nodes = predictors[0].nodes
+        splits = nodes[~nodes["is_leaf"].astype(bool)]
+        np.add.at(gains, splits["feature_idx"], splits["gain"])
+    return gains
+
+
+class EnsembleArrays:
+    """Scaler, ridge and tree-model parameters of a trained PointProjector.
+
+    ``forest`` is a ``ForestArrays`` for the random forest estimator, or a
+    ``BoostedArrays`` mean model for gradient boosting, in which case
+    ``lower`` and ``upper`` hold the quantile models bounding the interval.
+    """
+
+    ARRAY_NAMES = ("scaler_mean", "scaler_scale", "ridge_coef")
+
+    def __init__(self, scaler_mean, scaler_scale, ridge_coef, ridge_intercept, forest,
+                 lower=None, upper=None):
+        self.scaler_mean = scaler_mean
+        self.scaler_scale = scaler_scale
+        self.ridge_coef = ridge_coef
+        self.ridge_intercept = float(ridge_intercept)
+        self.forest = forest
+        self.lower = lower
+        self.upper = upper
+
+    @property
+    def boosted(self):
+        return isinstance(self.forest, BoostedArrays)
+
+    @classmethod
+    def from_estimators(cls, scaler, ridge, forest, lower=None, upper=None):
+        """Compile fitted estimators.
+
+        Pass a ``RandomForestRegressor`` as ``forest``, or three fitted
+        ``HistGradientBoostingRegressor`` models as ``forest`` (mean),
+        ``lower`` and ``upper`` (quantiles).
+        """
+        boosted = lower is not None
+        compile_trees = BoostedArrays.from_estimator if boosted else ForestArrays.from_estimator
+        return cls(
+            scaler_mean=np.asarray(scaler.mean_, dtype=np.float64),
+            scaler_scale=np.asarray(scaler.scale_, dtype=np.float64),
+            ridge_coef=np.asarray(ridge.coef_, dtype=np.float64),
+            ridge_intercept=ridge.intercept_,
+            forest=compile_trees(forest),
+            lower=BoostedArrays.from_estimator(lower) if boosted else None,
+            upper=BoostedArrays.from_estimator(upper) if boosted else None,
+        )
+
+    def transform(self, X):
+        """StandardScaler.transform."""
+        return (np.asarray(X, dtype=np.float64) - self.scaler_mean) / self.scaler_scale
+
+    def ridge_predict(self, X_scaled):
+        return X_scaled @ self.ridge_coef + self.ridge_intercept
+
+    def tree_predictions(self, X_scaled):
+        return self.forest.tree_predictions(X_scaled)
+
+    @staticmethod
+    def forest_mean(tree_preds):
+        """Average per-tree predictions, accumulating trees in order."""
+        return np.cumsum(tree_preds, axis=1)[:, -1] / tree_preds.shape[1]
@@ -0,0 +1,360 @@
+"""Team-level simulations for ESPN leagues.
+
+A fantasy team's weekly score is the sum of its starters' scores. Each
+starter's score is drawn from a triangular distribution over the projection
+model's confidence interval (the same distribution the season simulation in
+``analytics.projections`` uses). All simulations are drawn at once as float32
+matrices with a row per starter and a column per simulated week, so a 100,000
+week matchup is a handful of array operations.
+
+Players on the same NFL team can optionally be correlated (a QB and his
+receivers tend to boom or bust together) without changing any player's own
+distribution; see ``simulate_team_scores``.
+
+Playoff odds play out the rest of the regular season thousands of times.
+Each team's weekly score is approximated as normal, with the mean and
+variance of its current starters' summed distributions. Simulations run in
+fixed-size chunks, each with its own RNG stream spawned from one
+``SeedSequence``. This makes results identical for any number of worker
+processes. Results are cached per league and week in ``playoff_odds``.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+
+from analytics.projections import PERCENTILE_KEYS, PERCENTILES, batch_project_players
+
+
+# Lineup slots whose points do not count
+BENCH_SLOTS = ("BE", "IR")
+
+# Correlation between players on the same NFL team when stacks are modelled
+TEAMMATE_CORRELATION = 0.3
+
+
+def project_lineup(db, lineup, season, week, model=None):
+    """Weekly projections and intervals for the starters of an ESPN lineup.
+
+    Starters are matched to nflverse players by name, as on the roster page,
+    and projected in one batch. Starters without a model projection (no
+    match, kickers, defenses) are scored at ESPN's projection with no spread.
+
+    Args:
+        db: MongoDB database instance
+        lineup: list of dicts with name, position, slot, pro_team and
+            espn_projection
+        season: NFL season year
+        week: week number
+        model: trained PointProjector (or None to use cached projections only)
+
+    Returns:
+        List of starter dicts with player_id, projected_points,
+        confidence_low, confidence_high and source ("model" or "espn") added
+    """
+    starters = [p for p in lineup if p.get("slot") not in BENCH_SLOTS]
+    player_ids = {}
+    names = [p["name"] for p in starters]
+    if names:
+        for doc in db["seasonal_stats"].find(
+            {"player_name": {"$in": names}, "season": season},
+            {"player_name": 1, "player_id": 1, "_id": 0},
+        ):
+            player_ids[doc["player_name"]] = doc["player_id"]
+
+    projections = {}
+    if player_ids:
+        for row in batch_project_players(db, list(player_ids.values()), season, week, model=model):
+            if row["projection"]:
+                projections[row["player_id"]] = row["projection"]
+
+    projected = []
+    for p in starters:
+        player_id = player_ids.get(p["name"])
+        projection = projections.get(player_id)
+        if projection:
+            points = {
+                "projected_points": projection["projected_points"],
+                "confidence_low": projection["confidence_low"],
+                "confidence_high": projection["confidence_high"],
+                "source": "model",
+            }
+        else:
+            espn = float(p.get("espn_projection") or 0)
+            points = {
+                "projected_points": espn, "confidence_low": espn, "confidence_high": espn,
+                "source": "espn",
+            }
+        projected.append({**p, "player_id": player_id, **points})
+    return projected
+
+
+def _triangular_draws(u, v, low, mid, high):
+    """Triangular variates from two uniform matrices, without branching.
+
+    Uses the min-max method: ``(1 - c) * min(u, v) + c * max(u, v)`` is
+    triangular on [0, 1] with mode ``c``. ``u`` and ``v`` have one row per
+    player and are overwritten; ``low``, ``mid`` and ``high`` are column
+    vectors.
+    """
+    width = high - low
+    c = np.divide(mid - low, width, out=np.zeros_like(width), where=width > 0)
+    points = np.minimum(u, v)
+    upper = np.maximum(u, v, out=u)
+    points *= (1 - c) * width
+    upper *= c * width
+    points += upper
+    points += low
+    return np.maximum(points, 0, out=points)
+
+
+def simulate_team_scores(rng, starters, n_simulations, correlation=0.0):
+    """Draw starters' weekly points.
+
+    With ``correlation`` > 0, the players of each NFL team in ``starters``
+    (a stack) share one pair of uniform draws in that share of simulated
+    weeks and draw independently in the rest. Each player's own distribution
+    is unchanged, and two stacked players with the same interval shape have
+    a rank correlation of ``correlation``.
+
+    Args:
+        rng: NumPy Generator
+        starters: list of dicts with projected_points, confidence_low,
+            confidence_high and pro_team
+        n_simulations: simulated weeks
+        correlation: share of weeks in which teammates move together
+
+    Returns:
+        float32 array of shape (len(starters), n_simulations)
+    """
+    low, mid, high = (
+        np.array([p[key] for p in starters], dtype=np.float32).reshape(-1, 1)
+        for key in ("confidence_low", "projected_points", "confidence_high")
+    )
+    mid = np.clip(mid, low, high)
+    u = rng.random((len(starters), n_simulations), dtype=np.float32)
+    v = rng.random((len(starters), n_simulations), dtype=np.float32)
+    if correlation > 0:
+        stacks = {}
+        for i, p in enumerate(starters):
+            if p.get("pro_team"):
+                stacks.setdefault(p["pro_team"], []).append(i)
+        for rows in stacks.values():
+            if len(rows) < 2:
+                continue
+            together = rng.random(n_simulations, dtype=np.float32) < correlation
+            shared_u = rng.random(n_simulations, dtype=np.float32)
+            shared_v = rng.random(n_simulations, dtype=np.float32)
+            u[rows] = np.where(together, shared_u, u[rows])
+            v[rows] = np.where(together, shared_v, v[rows])
+    return _triangular_draws(u, v, low, mid, high)
+
+
+def _score_summary(scores):
+    return {
+        "expected": round(float(scores.mean()), 1),
+        "percentiles": {
+            key: round(float(value), 1)
+            for key, value in zip(PERCENTILE_KEYS, np.percentile(scores, PERCENTILES))
+        },
+    }
+
+
+def simulate_matchup(home, away, n_simulations=100_000, correlation=0.0, seed=42, n_bins=20):
+    """Win probabilities and score distributions of a head-to-head matchup.
+
+    Args:
+        home, away: projected starters of each team (see ``project_lineup``)
+        n_simulations: number of simulated weeks
+        correlation: rank correlation between players on the same NFL team,
+            on either side of the matchup (0 = independent)
+        seed: random seed
+        n_bins: bins in the margin histogram
+
+    Returns:
+        Dict with n_simulations, correlation, home and away (expected score,
+        percentiles and win_pct), tie_pct and the histogram of the home
+        team's margin
+    """
+    rng = np.random.default_rng(seed)
+    points = simulate_team_scores(rng, list(home) + list(away), n_simulations, correlation)
+    home_scores = points[:len(home)].sum(axis=0, dtype=np.float64)
+    away_scores = points[len(home):].sum(axis=0, dtype=np.float64)
+    margin = home_scores - away_scores
+
+    home_win = float(np.mean(margin > 0) * 100)
+    away_win = float(np.mean(margin < 0) * 100)
+    tie = float(np.mean(margin == 0) * 100)
+    lo, hi = float(margin.min()), float(margin.max())
+    if hi <= lo:
+        lo, hi = lo - n_bins / 2, lo + n_bins / 2
+    counts, edges = np.histogram(margin, bins=n_bins, range=(lo, hi))
+    return {
+        "n_simulations": n_simulations,
+        "correlation": correlation,
+        "home": {**_score_summary(home_scores), "win_pct": round(home_win, 1)},
+        "away": {**_score_summary(away_scores), "win_pct": round(away_win, 1)},
+        "tie_pct": round(tie, 1),
+        "margin_histogram": [
+            {
+                "bin_start": round(float(edges[i]), 1),
+                "bin_end": round(float(edges[i + 1]), 1),
+                "count": int(counts[i]),
+            }
+            for i in range(n_bins)
+        ],
+    }
+
+
+def team_score_distribution(starters):
+    """Mean and standard deviation of a lineup's weekly score.
+
+    Sums the means and variances of the starters' triangular distributions,
+    treating players as independent.
+    """
+    if not starters:
+        return 0.0, 0.0
+    low, mid, high = (
+        np.array([p[key] for p in starters], dtype=np.float64)
+        for key in ("confidence_low", "projected_points", "confidence_high")
+    )
+    mid = np.clip(mid, low, high)
+    mean = np.sum(low + mid + high) / 3
+    variance = np.sum(low ** 2 + mid ** 2 + high ** 2 - low * mid - low * high - mid * high) / 18
+    return float(mean), float(np.sqrt(max(variance, 0.0)))
+
+
+def project_teams(db, lineups, season, week, model=None):
+    """Weekly score distribution of every team in a league.
+
+    All teams' starters are projected in one batch (see ``project_lineup``).
+
+    Args:
+        lineups: dict of team_id -> ESPN lineup
+
+    Returns:
+        Dict of team_id -> (mean, standard deviation) of the weekly score
+    """
+    tagged = [{**p, "team_id": team_id} for team_id, lineup in lineups.items() for p in lineup]
+    by_team = {team_id: [] for team_id in lineups}
+    for starter in project_lineup(db, tagged, season, week, model=model):
+        by_team[starter["team_id"]].append(starter)
+    return {team_id: team_score_distribution(starters) for team_id, starters in by_team.items()}
+
+
+def bye_count(playoff_teams):
+    """Teams with a first-round bye when the bracket is filled up to a power of two."""
+    return (1 << (playoff_teams - 1).bit_length()) - playoff_teams if playoff_teams > 0 else 0
+
+
+def _season_chunk(seed, n_simulations, means, stds, wins, points_for, home, away):
+    """Simulate the remaining games ``n_simulations`` times.
+
+    Returns:
+        (seed_counts, win_sums): counts of team i finishing at seed j, and
+        each team's final wins summed over the simulations
+    """
+    rng = np.random.default_rng(seed)
+    n_teams = len(means)
+    home_scores = np.maximum(rng.normal(means[home], stds[home], (n_simulations, len(home))), 0)
+    away_scores = np.maximum(rng.normal(means[away], stds[away], (n_simulations, len(away))), 0)
+    home_games = np.eye(n_teams)[home]
+    away_games = np.eye(n_teams)[away]
+    home_won = (home_scores > away_scores).astype(np.float64)
+
+    final_wins = wins + home_won @ home_games + (1 - home_won) @ away_games
+    final_points = points_for + home_scores @ home_games + away_scores @ away_games
+    # Seeds by wins, then points for; order[s, j] is the team at seed j + 1
+    order = np.lexsort((-final_points, -final_wins))
+    seed_counts = np.bincount(
+        (order * n_teams + np.arange(n_teams)).ravel(), minlength=n_teams * n_teams,
+    ).reshape(n_teams, n_teams)
+    return seed_counts, final_wins.sum(axis=0)
+
+
+def simulate_season(teams, games, playoff_teams, n_simulations=10000, seed=42,
+                    max_workers=1, chunk_size=2000):
+    """Playoff, bye and seed probabilities from the rest of the regular season.
+
+    Seeds are ordered by wins (ties count as half a win), then points for;
+    divisions and head-to-head tiebreakers are not modelled.
+
+    Args:
+        teams: list of dicts with team_id, wins, points_for and the weekly
+            score mean and std (see ``project_teams``)
+        games: remaining (team_id, team_id) pairs
+        playoff_teams: number of teams that make the playoffs
+        n_simulations: number of simulated seasons
+        seed: root seed; chunk ``i`` draws from the ``i``-th spawned stream
+        max_workers: number of worker processes (1 = serial)
+        chunk_size: simulations per chunk
+
+    Returns:
+        Dict with n_simulations, playoff_teams, bye_teams and teams: the
+        input team dicts plus projected_wins, playoff_pct, bye_pct and
+        seed_pcts (one entry per playoff seed), best playoff odds first
+    """
+    index = {team["team_id"]: i for i, team in enumerate(teams)}
+    home = np.array([index[a] for a, _ in games], dtype=np.intp)
+    away = np.array([index[b] for _, b in games], dtype=np.intp)
+    arrays = [
+        np.array([team[key] for team in teams], dtype=np.float64)
+        for key in ("mean", "std", "wins", "points_for")
+    ]
+    sizes = [chunk_size] * (n_simulations // chunk_size)
+    if n_simulations % chunk_size:
+        sizes.append(n_simulations % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    chunk_args = [(s, size, *arrays, home, away) for s, size in zip(seeds, sizes)]
+
+    if max_workers is not None and max_workers > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(sizes))) as pool:
+            # map yields in submission order, so the merge does not depend on timing
+            results = list(pool.map(_season_chunk, *zip(*chunk_args)))
+    else:
+        results = [_season_chunk(*args) for args in chunk_args]
+    seed_counts = sum(counts for counts, _ in results)
+    win_sums = sum(wins for _, wins in results)
+
+    n_byes = bye_count(playoff_teams)
+    share = 100 / n_simulations
+    summary = [
+        {
+            **team,
+            "projected_wins": round(float(win_sums[i] / n_simulations), 1),
+            "playoff_pct": round(float(seed_counts[i, :playoff_teams].sum() * share), 1),
+            "bye_pct": round(float(seed_counts[i, :n_byes].sum() * share), 1),
+            "seed_pcts": [round(float(c * share), 1) for c in seed_counts[i, :playoff_teams]],
+        }
+        for i, team in enumerate(teams)
+    ]
+    summary.sort(key=lambda t: (-t["playoff_pct"], -t["projected_wins"]))
+    return {
+        "n_simulations": n_simulations,
+        "playoff_teams": playoff_teams,
+        "bye_teams": n_byes,
+        "teams": summary,
+    }
+
+
+def get_cached_playoff_odds(db, espn_league_id, season, week):
+    """Stored playoff odds for a league and week, or None."""
+    return db["playoff_odds"].find_one(
+        {"espn_league_id": espn_league_id, "season": season, "week": week}, {"_id": 0},
+    )
+
+
+def cache_playoff_odds(db, espn_league_id, season, week, odds):
+    """Store playoff odds, replacing any earlier run for the same league and week."""
+    db["playoff_odds"].update_one(
+        {"espn_league_id": espn_league_id, "season": season, "week": week},
+        {"$set": {
+            "espn_league_id": espn_league_id,
+            "season": season,
+            "week": week,
+            "computed_at": datetime.now(timezone.utc),
+            **odds,
+        }},
+        upsert=True,
+    )
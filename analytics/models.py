@@ -2,42 +2,51 @@
 
 import math
 import pickle
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
 from sklearn.linear_model import RidgeCV
 from sklearn.cluster import KMeans
-from sklearn.model_selection import cross_val_score
 from sklearn.preprocessing import StandardScaler
 
+from analytics.features import FEATURE_NAMES, build_feature_frame, build_feature_frames
 from analytics.matchup_stats import compute_defensive_rankings
 
 
-FEATURE_NAMES = [
-    "season_avg_points",
-    "last_3_avg",
-    "last_5_avg",
-    "std_dev",
-    "games_played",
-    "snap_pct",
-    "matchup_rank",
-    "matchup_avg_allowed",
-    "home_away",
-    "career_avg",
-]
+ESTIMATORS = ("rf", "hgb")
 
+# Quantiles matching the RF interval of +/- 1.5 standard deviations under a
+# normal error distribution
+INTERVAL_QUANTILES = (0.0668, 0.9332)
 
-class PointProjector:
-    """Ridge Regression + Random Forest ensemble for projecting fantasy points."""
 
-    def __init__(self):
+class PointProjector:
+    """Ridge Regression + tree-model ensemble for projecting fantasy points.
+
+    The tree model is a Random Forest (``estimator="rf"``, intervals from the
+    spread of tree predictions) or histogram-based gradient boosting
+    (``estimator="hgb"``, intervals from quantile-loss models), which fits
+    much faster on large training sets.
+    """
+
+    def __init__(self, estimator="rf", params=None, ridge_weight=0.3):
+        if estimator not in ESTIMATORS:
+            raise ValueError(f"Unknown estimator {estimator!r}; expected one of {ESTIMATORS}")
+        self.estimator = estimator
+        # Overrides for the tree model's default hyperparameters (see analytics.tuning)
+        self._params = dict(params or {})
         self._ridge = None
         self._rf = None
+        self._gbm = None
+        self._gbm_lower = None
+        self._gbm_upper = None
         self._scaler = None
-        self._ridge_weight = 0.3
-        self._rf_weight = 0.7
+        self._ridge_weight = ridge_weight
+        self._rf_weight = 1 - ridge_weight
         self._trained = False
         self._feature_importances = None
+        self._arrays = None
 
     def build_features(self, db, player_id, season, week):
         """Build feature vector for a player-week prediction.
@@ -92,19 +101,9 @@ class PointProjector:
                 matchup_rank = difficulty["rank"]
                 matchup_avg_allowed = difficulty["avg_allowed"]
 
-        # Career average
-        career_docs = list(db["seasonal_stats"].find(
-            {"player_id": player_id},
-            {"fantasy_points_ppr": 1, "games": 1, "_id": 0},
-        ))
-        career_pts = 0
-        career_games = 0
-        for doc in career_docs:
-            pts = doc.get("fantasy_points_ppr", 0) or 0
-            gms = doc.get("games", 0) or 0
-            career_pts += pts
-            career_games += gms
-        career_avg = career_pts / career_games if career_games > 0 else season_avg
+        # Career average through the previous season
+        from analytics.career_stats import get_career_avgs
+        career_avg = get_career_avgs(db, [player_id], season).get(player_id, season_avg)
 
         return {
             "season_avg_points": round(season_avg, 2),
@@ -119,82 +118,116 @@ class PointProjector:
             "career_avg": round(career_avg, 2),
         }
 
-    def build_training_data(self, db, seasons):
+    def build_training_data(self, db, seasons, max_workers=1, uri=None, progress=None,
+                            use_store=False):
         """Build training arrays from historical data.
 
+        Features for each season are computed in one pass by
+        ``build_feature_frame``; with ``max_workers`` > 1 seasons are built in
+        parallel worker processes that connect via ``uri`` (see
+        ``build_feature_frames``). With ``use_store`` the rows are read from
+        (and missing seasons written to) the ``features`` collection.
+
         Returns (X, y, metadata) where metadata contains player/week info.
         """
-        X_rows = []
-        y_values = []
-        metadata = []
-
-        for season in seasons:
-            players = db["weekly_stats"].distinct("player_id", {"season": season})
-            for player_id in players:
-                weeks = db["weekly_stats"].find(
-                    {"player_id": player_id, "season": season},
-                    {"week": 1, "fantasy_points_ppr": 1, "_id": 0},
-                ).sort("week", 1)
-                week_list = list(weeks)
-
-                for week_doc in week_list:
-                    week = week_doc["week"]
-                    actual = week_doc.get("fantasy_points_ppr", 0) or 0
-
-                    features = self.build_features(db, player_id, season, week)
-                    if features is None:
-                        continue
-
-                    row = [features[name] for name in FEATURE_NAMES]
-                    X_rows.append(row)
-                    y_values.append(actual)
-                    metadata.append({
-                        "player_id": player_id,
-                        "season": season,
-                        "week": week,
-                    })
-
-        X = np.array(X_rows, dtype=np.float64) if X_rows else np.empty((0, len(FEATURE_NAMES)))
-        y = np.array(y_values, dtype=np.float64) if y_values else np.empty(0)
+        if use_store:
+            from analytics.feature_store import load_training_frame
+            frame = load_training_frame(
+                db, seasons, max_workers=max_workers, uri=uri, progress=progress,
+            )
+        else:
+            frame = build_feature_frames(
+                seasons, db=db, uri=uri, max_workers=max_workers, progress=progress,
+            )
+        if frame.empty:
+            return np.empty((0, len(FEATURE_NAMES))), np.empty(0), []
+
+        X = frame[FEATURE_NAMES].to_numpy(dtype=np.float64)
+        y = frame["fantasy_points_ppr"].to_numpy(dtype=np.float64)
+        metadata = frame[["player_id", "position", "season", "week"]].to_dict("records")
         return X, y, metadata
 
-    def train(self, db, seasons):
+    def train(self, db, seasons, max_workers=1, uri=None, progress=None, use_store=False):
         """Train the ensemble model on historical data.
 
+        ``max_workers``, ``uri``, ``progress`` and ``use_store`` are passed
+        through to ``build_training_data``.
+
         Returns dict with training metrics.
         """
-        X, y, metadata = self.build_training_data(db, seasons)
+        X, y, metadata = self.build_training_data(
+            db, seasons, max_workers=max_workers, uri=uri, progress=progress,
+            use_store=use_store,
+        )
+        from analytics.validation import time_groups
+        return self.fit(
+            X, y, groups=time_groups(metadata), max_workers=max_workers,
+            positions=[m["position"] for m in metadata],
+        )
+
+    def fit(self, X, y, groups=None, max_workers=1, positions=None):
+        """Fit the ensemble on a prebuilt feature matrix and targets.
+
+        With ``groups`` (a time key per row, see
+        ``analytics.validation.time_groups``) the ridge, tree model and blend
+        are scored with expanding-window time-series cross-validation. The
+        fold fits and the final fits on all rows run together in
+        ``max_workers`` threads.
 
+        ``positions`` is accepted for interface parity with
+        ``PositionalProjector`` and ignored.
+
+        Returns dict with training metrics; the ``*_cv_mae`` entries are None
+        without ``groups`` or with too few weeks to form a fold.
+        """
         if len(X) < 10:
             raise ValueError(f"Insufficient training data: {len(X)} samples (need >= 10)")
 
+        from analytics.inference import EnsembleArrays, split_gains
+        from analytics.validation import (
+            build_fold_matrices, cross_validate, fold_mae, time_series_folds,
+        )
+
         self._scaler = StandardScaler()
         X_scaled = self._scaler.fit_transform(X)
 
-        # Train Ridge
-        self._ridge = RidgeCV(alphas=[0.1, 1.0, 10.0, 100.0])
-        self._ridge.fit(X_scaled, y)
-        ridge_cv = cross_val_score(self._ridge, X_scaled, y, cv=min(5, len(X)), scoring="neg_mean_absolute_error")
-
-        # Train Random Forest
-        self._rf = RandomForestRegressor(
-            n_estimators=100,
-            max_depth=10,
-            min_samples_leaf=5,
-            random_state=42,
-            n_jobs=-1,
+        candidates = {"ridge": self._make_ridge(), "model": self._make_model()}
+        final = {name: (estimator, X_scaled, y) for name, estimator in candidates.items()}
+        if self.estimator == "hgb":
+            # Interval quantile models are only needed on the full data
+            final["lower"] = (self._make_gbm(quantile=INTERVAL_QUANTILES[0]), X_scaled, y)
+            final["upper"] = (self._make_gbm(quantile=INTERVAL_QUANTILES[1]), X_scaled, y)
+
+        fold_matrices = []
+        if groups is not None:
+            fold_matrices = build_fold_matrices(X, y, time_series_folds(groups))
+        predictions, fitted = cross_validate(
+            candidates, fold_matrices, max_workers=max_workers, final=final,
         )
-        self._rf.fit(X_scaled, y)
-        rf_cv = cross_val_score(self._rf, X_scaled, y, cv=min(5, len(X)), scoring="neg_mean_absolute_error")
 
-        # Feature importances from RF
-        self._feature_importances = dict(zip(FEATURE_NAMES, self._rf.feature_importances_))
+        self._ridge = fitted["ridge"]
+        if self.estimator == "hgb":
+            self._rf = None
+            self._gbm, self._gbm_lower, self._gbm_upper = (
+                fitted["model"], fitted["lower"], fitted["upper"],
+            )
+            # Feature importances from total split gain
+            gains = split_gains(self._gbm, len(FEATURE_NAMES))
+            total = gains.sum()
+            self._feature_importances = dict(zip(FEATURE_NAMES, gains / total if total > 0 else gains))
+            self._arrays = EnsembleArrays.from_estimators(
+                self._scaler, self._ridge, self._gbm, self._gbm_lower, self._gbm_upper,
+            )
+        else:
+            self._gbm = self._gbm_lower = self._gbm_upper = None
+            self._rf = fitted["model"]
+            # Feature importances from RF
+            self._feature_importances = dict(zip(FEATURE_NAMES, self._rf.feature_importances_))
+            self._arrays = EnsembleArrays.from_estimators(self._scaler, self._ridge, self._rf)
+        self._trained = True
 
         # Compute metrics on full training set
-        ridge_pred = self._ridge.predict(X_scaled)
-        rf_pred = self._rf.predict(X_scaled)
-        ensemble_pred = self._ridge_weight * ridge_pred + self._rf_weight * rf_pred
-
+        ensemble_pred, _, _ = self._project_rows(X)
         errors = y - ensemble_pred
         mae = float(np.mean(np.abs(errors)))
         rmse = float(np.sqrt(np.mean(errors ** 2)))
@@ -202,52 +235,188 @@ class PointProjector:
         ss_tot = np.sum((y - np.mean(y)) ** 2)
         r2 = float(1 - ss_res / ss_tot) if ss_tot > 0 else 0.0
 
-        self._trained = True
+        cv_mae = {"ridge": None, "model": None, "ensemble": None}
+        if fold_matrices:
+            blend = [
+                self._ridge_weight * ridge_pred + self._rf_weight * model_pred
+                for ridge_pred, model_pred in zip(predictions["ridge"], predictions["model"])
+            ]
+            cv_mae = {
+                "ridge": round(fold_mae(predictions["ridge"], fold_matrices), 3),
+                "model": round(fold_mae(predictions["model"], fold_matrices), 3),
+                "ensemble": round(fold_mae(blend, fold_matrices), 3),
+            }
 
         return {
             "mae": round(mae, 3),
             "rmse": round(rmse, 3),
             "r2": round(r2, 4),
             "n_samples": len(X),
-            "ridge_cv_mae": round(-float(np.mean(ridge_cv)), 3),
-            "rf_cv_mae": round(-float(np.mean(rf_cv)), 3),
+            "cv_folds": len(fold_matrices),
+            "ridge_cv_mae": cv_mae["ridge"],
+            f"{self.estimator}_cv_mae": cv_mae["model"],
+            "ensemble_cv_mae": cv_mae["ensemble"],
             "feature_importances": {k: round(v, 4) for k, v in self._feature_importances.items()},
         }
 
-    def predict(self, db, player_id, season, week):
-        """Predict fantasy points for a player-week.
+    @staticmethod
+    def _make_ridge():
+        return RidgeCV(alphas=[0.1, 1.0, 10.0, 100.0])
+
+    def _make_model(self):
+        """Unfitted tree model for the configured estimator and parameters."""
+        if self.estimator == "hgb":
+            return self._make_gbm()
+        params = {"n_estimators": 100, "max_depth": 10, "min_samples_leaf": 5, "n_jobs": -1}
+        return RandomForestRegressor(random_state=42, **{**params, **self._params})
+
+    def _make_gbm(self, quantile=None):
+        params = {"max_iter": 200, "max_depth": 6, "min_samples_leaf": 20, **self._params}
+        if quantile is None:
+            return HistGradientBoostingRegressor(random_state=42, **params)
+        return HistGradientBoostingRegressor(
+            loss="quantile", quantile=quantile, random_state=42, **params,
+        )
 
-        Returns dict with projected_points, confidence_low, confidence_high.
-        """
-        if not self._trained:
-            raise RuntimeError("Model not trained. Call train() first.")
+    def _project_rows(self, X, positions=None):
+        """Run the ensemble over a feature matrix.
 
-        features = self.build_features(db, player_id, season, week)
-        if features is None:
-            return None
+        ``positions`` (one per row) is ignored here; ``PositionalProjector``
+        routes rows to per-position sub-models by it.
 
-        row = np.array([[features[name] for name in FEATURE_NAMES]])
-        row_scaled = self._scaler.transform(row)
+        Inference goes through the array-encoded ``EnsembleArrays`` engine
+        (see ``analytics.inference``), which matches sklearn's output bit for
+        bit without its per-call overhead.
 
-        ridge_pred = self._ridge.predict(row_scaled)[0]
-        rf_pred = self._rf.predict(row_scaled)[0]
+        Returns (projected, confidence_low, confidence_high) arrays, one entry
+        per row. For the RF estimator the interval is the projection +/- 1.5
+        standard deviations of the individual tree predictions; for gradient
+        boosting it is the quantile models' predictions, widened if needed to
+        contain the projection.
+        """
+        X_scaled = self._arrays.transform(X)
+        ridge_pred = self._arrays.ridge_predict(X_scaled)
+        if self._arrays.boosted:
+            projected = (self._ridge_weight * ridge_pred
+                         + self._rf_weight * self._arrays.forest.predict(X_scaled))
+            confidence_low = np.maximum(0, np.minimum(self._arrays.lower.predict(X_scaled), projected))
+            confidence_high = np.maximum(self._arrays.upper.predict(X_scaled), projected)
+            return projected, confidence_low, confidence_high
+
+        tree_preds = self._tree_predictions(X_scaled)
+        rf_pred = self._arrays.forest_mean(tree_preds)
         projected = self._ridge_weight * ridge_pred + self._rf_weight * rf_pred
 
         # Confidence interval from RF tree prediction spread
-        tree_preds = np.array([tree.predict(row_scaled)[0] for tree in self._rf.estimators_])
-        tree_std = float(np.std(tree_preds))
-        confidence_low = max(0, projected - 1.5 * tree_std)
+        tree_std = np.std(tree_preds, axis=1)
+        confidence_low = np.maximum(0, projected - 1.5 * tree_std)
         confidence_high = projected + 1.5 * tree_std
+        return projected, confidence_low, confidence_high
+
+    def _tree_predictions(self, X_scaled):
+        """Per-tree RF predictions for every row, shape (n_rows, n_trees).
 
+        All trees are walked in lockstep by the array engine; equivalent to
+        calling ``tree.predict`` on each estimator.
+        """
+        return self._arrays.tree_predictions(X_scaled)
+
+    @staticmethod
+    def _format_projection(projected, confidence_low, confidence_high):
         return {
             "projected_points": round(float(projected), 2),
             "confidence_low": round(float(confidence_low), 2),
             "confidence_high": round(float(confidence_high), 2),
         }
 
+    def predict(self, db, player_id, season, week):
+        """Predict fantasy points for a player-week.
+
+        Returns dict with projected_points, confidence_low, confidence_high.
+        """
+        if not self._trained:
+            raise RuntimeError("Model not trained. Call train() first.")
+        return self.predict_many(db, [player_id], season, week)[0]
+
+    def _collect_features(self, db, season, targets):
+        """Gather feature dicts for (player_id, week) pairs of one season.
+
+        Stored rows are read from the feature store in one query; the rest
+        are built in a single ``build_feature_frame`` pass.
+
+        Returns dict of (player_id, week) -> features (plus the player's
+        ``position``) for pairs with enough data.
+        """
+        from analytics.feature_store import get_stored_feature_rows
+        targets = list(dict.fromkeys(targets))
+        fields = FEATURE_NAMES + ["position"]
+        features = get_stored_feature_rows(db, season, targets, fields=fields)
+
+        missing = [key for key in targets if key not in features]
+        if missing:
+            frame = build_feature_frame(db, season, targets=missing)
+            for record in frame.to_dict("records"):
+                key = (record["player_id"], record["week"])
+                features[key] = {name: record[name] for name in fields}
+        return features
+
+    def _predict_targets(self, db, season, targets):
+        """Project (player_id, week) pairs with one ensemble pass.
+
+        Returns dict of (player_id, week) -> projection dict.
+        """
+        features = self._collect_features(db, season, targets)
+        keys = [key for key in dict.fromkeys(targets) if key in features]
+        if not keys:
+            return {}
+
+        X = np.array([[features[key][name] for name in FEATURE_NAMES] for key in keys],
+                     dtype=np.float64)
+        positions = [features[key]["position"] for key in keys]
+        projected, low, high = self._project_rows(X, positions)
+        return {
+            key: self._format_projection(projected[i], low[i], high[i])
+            for i, key in enumerate(keys)
+        }
+
+    def predict_many(self, db, player_ids, season, week):
+        """Predict fantasy points for many players in the same week.
+
+        Features are read from the feature store where available and built
+        for the rest in a single ``build_feature_frame`` pass; the scaler and
+        each sub-model then run once over the whole matrix.
+
+        Returns a list aligned with ``player_ids`` holding the same dicts as
+        ``predict`` (or None where a player lacks enough data).
+        """
+        if not self._trained:
+            raise RuntimeError("Model not trained. Call train() first.")
+
+        player_ids = list(player_ids)
+        results = self._predict_targets(db, season, [(pid, week) for pid in player_ids])
+        return [results.get((pid, week)) for pid in player_ids]
+
+    def predict_weeks(self, db, player_id, season, weeks):
+        """Predict fantasy points for one player across several weeks.
+
+        The player's season history is loaded once and features for every
+        target week are built together; each week still only sees games
+        played before it, so results match per-week ``predict`` calls.
+
+        Returns a list aligned with ``weeks`` of projection dicts (or None).
+        """
+        if not self._trained:
+            raise RuntimeError("Model not trained. Call train() first.")
+
+        weeks = list(weeks)
+        results = self._predict_targets(db, season, [(player_id, week) for week in weeks])
+        return [results.get((player_id, week)) for week in weeks]
+
     def predict_remaining_season(self, db, player_id, season, current_week, total_weeks=17):
         """Project points for remaining weeks of the season.
 
+        All remaining weeks are projected in one batch via ``predict_weeks``.
+
         Returns dict with weekly projections list, remaining_total, season_total.
         """
         if not self._trained:
@@ -260,11 +429,13 @@ class PointProjector:
         ).sort("week", 1))
         actual_total = sum(d.get("fantasy_points_ppr", 0) or 0 for d in actual_docs)
 
+        weeks = list(range(current_week + 1, total_weeks + 1))
+        predictions = self.predict_weeks(db, player_id, season, weeks)
+
         weekly_projections = []
         remaining_total = 0
 
-        for week in range(current_week + 1, total_weeks + 1):
-            prediction = self.predict(db, player_id, season, week)
+        for week, prediction in zip(weeks, predictions):
             if prediction:
                 weekly_projections.append({
                     "week": week,
@@ -294,31 +465,324 @@ class PointProjector:
             "season_total": round(actual_total + remaining_total, 2),
         }
 
-    def save(self, path):
-        """Save the trained model to a pickle file."""
-        with open(path, "wb") as f:
-            pickle.dump({
-                "ridge": self._ridge,
-                "rf": self._rf,
-                "scaler": self._scaler,
-                "ridge_weight": self._ridge_weight,
-                "rf_weight": self._rf_weight,
-                "feature_importances": self._feature_importances,
-                "trained": self._trained,
-            }, f)
+    def warm_up(self, batch_size=64):
+        """Run a throwaway batch through the ensemble.
 
-    def load(self, path):
-        """Load a trained model from a pickle file."""
-        with open(path, "rb") as f:
-            data = pickle.load(f)
+        Pages in memory-mapped artifact arrays and exercises the inference
+        path, so the first real request after a load or hot swap is not
+        slower than the rest.
+        """
+        if not self._trained:
+            return
+        rng = np.random.default_rng(0)
+        noise = rng.standard_normal((batch_size, len(FEATURE_NAMES)))
+        self._project_rows(self._arrays.scaler_mean + noise * self._arrays.scaler_scale)
+
+    def _state(self):
+        return {
+            "estimator": self.estimator,
+            "ridge": self._ridge,
+            "rf": self._rf,
+            "gbm": self._gbm,
+            "gbm_lower": self._gbm_lower,
+            "gbm_upper": self._gbm_upper,
+            "scaler": self._scaler,
+            "ridge_weight": self._ridge_weight,
+            "rf_weight": self._rf_weight,
+            "feature_importances": self._feature_importances,
+            "trained": self._trained,
+        }
+
+    def _set_state(self, data):
+        """Restore from a ``_state`` dict and compile the array engine."""
+        self.estimator = data.get("estimator", "rf")
         self._ridge = data["ridge"]
         self._rf = data["rf"]
+        self._gbm = data.get("gbm")
+        self._gbm_lower = data.get("gbm_lower")
+        self._gbm_upper = data.get("gbm_upper")
         self._scaler = data["scaler"]
         self._ridge_weight = data["ridge_weight"]
         self._rf_weight = data["rf_weight"]
         self._feature_importances = data["feature_importances"]
         self._trained = data["trained"]
+        self._arrays = None
+        if self._trained:
+            from analytics.inference import EnsembleArrays
+            if self.estimator == "hgb":
+                self._arrays = EnsembleArrays.from_estimators(
+                    self._scaler, self._ridge, self._gbm, self._gbm_lower, self._gbm_upper,
+                )
+            else:
+                self._arrays = EnsembleArrays.from_estimators(self._scaler, self._ridge, self._rf)
+
+    def _set_artifact(self, ensemble, fields):
+        """Restore from memory-mapped artifact arrays and their manifest fields."""
+        self._arrays = ensemble
+        self.estimator = fields.get("estimator", "rf")
+        self._ridge = self._rf = self._scaler = None
+        self._gbm = self._gbm_lower = self._gbm_upper = None
+        self._ridge_weight = fields["ridge_weight"]
+        self._rf_weight = fields["rf_weight"]
+        self._feature_importances = fields["feature_importances"]
+        self._trained = True
+
+    def save(self, path):
+        """Save the trained model to a pickle file."""
+        with open(path, "wb") as f:
+            pickle.dump(self._state(), f)
+
+    def export(self, path):
+        """Write the trained model as a memory-mappable artifact directory.
+
+        See ``analytics.artifacts`` for the layout.
+        """
+        if not self._trained:
+            raise RuntimeError("Model not trained. Call train() first.")
+        from analytics.artifacts import write_projector_artifact
+        write_projector_artifact(
+            path, self._arrays, self._ridge_weight, self._rf_weight, self._feature_importances,
+        )
+
+    def load(self, path):
+        """Load a trained model from a pickle file or an artifact directory.
+
+        Either way inference runs on the array engine. Artifacts are
+        memory-mapped read-only, so the sklearn estimators are not available
+        after loading one.
+        """
+        from analytics.artifacts import is_artifact, read_projector_artifact
+        if is_artifact(path):
+            self._set_artifact(*read_projector_artifact(path))
+            return
+
+        with open(path, "rb") as f:
+            self._set_state(pickle.load(f))
+
+
+PROJECTION_POSITIONS = ["QB", "RB", "WR", "TE"]
+
+
+def _fit_position_worker(estimator, params, ridge_weight, X, y, groups, max_workers=1):
+    """Process-pool entry point: fit one position's sub-model."""
+    model = PointProjector(estimator=estimator, params=params, ridge_weight=ridge_weight)
+    metrics = model.fit(X, y, groups=groups, max_workers=max_workers)
+    return model, metrics
+
+
+class PositionalProjector(PointProjector):
+    """Per-position PointProjectors behind the PointProjector interface.
+
+    ``fit`` trains one sub-model for each position in
+    ``PROJECTION_POSITIONS`` with at least ``min_samples`` training rows,
+    each in its own worker process. Rows of every other position are pooled
+    into an ``OTHER`` sub-model. Predictions route each row to its
+    position's sub-model; positions without one go to ``OTHER``, or to the
+    largest position's sub-model if there was too little data for ``OTHER``.
+    """
+
+    FALLBACK = "OTHER"
+
+    def __init__(self, estimator="rf", params=None, ridge_weight=0.3, min_samples=50):
+        super().__init__(estimator=estimator, params=params, ridge_weight=ridge_weight)
+        self.min_samples = min_samples
+        self._models = {}
+        self._fallback = None
+
+    def fit(self, X, y, groups=None, max_workers=1, positions=None):
+        """Fit one sub-model per position.
+
+        With ``max_workers`` > 1 the sub-models are fit in parallel worker
+        processes, one per position. Each sub-model runs its own time-series
+        cross-validation.
+
+        Returns dict with overall training metrics, CV metrics averaged over
+        positions weighted by training rows, and per-position metrics under
+        ``positions``.
+        """
+        if positions is None:
+            raise ValueError("PositionalProjector.fit requires a position per row")
+        positions = np.asarray(positions, dtype=object)
+        if len(X) < 10:
+            raise ValueError(f"Insufficient training data: {len(X)} samples (need >= 10)")
+
+        masks = {}
+        for position in PROJECTION_POSITIONS:
+            mask = positions == position
+            if mask.sum() >= self.min_samples:
+                masks[position] = mask
+        rest = ~np.any(list(masks.values()), axis=0) if masks else np.ones(len(X), dtype=bool)
+        if rest.sum() >= 10:
+            masks[self.FALLBACK] = rest
+        if not masks:
+            raise ValueError(f"Insufficient training data for any position (need >= {self.min_samples})")
+
+        if groups is not None:
+            groups = np.asarray(groups)
+        parallel = max_workers is not None and max_workers > 1 and len(masks) > 1
+        params = self._params
+        if parallel and self.estimator == "rf":
+            # Parallelism comes from fitting positions side by side
+            params = {**params, "n_jobs": 1}
+        jobs = {
+            position: (self.estimator, params, self._ridge_weight, X[mask], y[mask],
+                       None if groups is None else groups[mask])
+            for position, mask in masks.items()
+        }
+        if parallel:
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+                futures = {
+                    position: pool.submit(_fit_position_worker, *args)
+                    for position, args in jobs.items()
+                }
+                results = {position: future.result() for position, future in futures.items()}
+        else:
+            results = {
+                position: _fit_position_worker(*args, max_workers=max_workers)
+                for position, args in jobs.items()
+            }
+
+        self._models = {position: model for position, (model, _) in results.items()}
+        sizes = {position: int(mask.sum()) for position, mask in masks.items()}
+        self._fallback = self.FALLBACK if self.FALLBACK in masks else max(sizes, key=sizes.get)
+        self._trained = True
+
+        position_metrics = {position: metrics for position, (_, metrics) in results.items()}
+        self._feature_importances = {
+            name: sum(m["feature_importances"][name] * sizes[p] for p, m in position_metrics.items())
+            / len(X)
+            for name in FEATURE_NAMES
+        }
+
+        projected, _, _ = self._project_rows(X, positions)
+        errors = y - projected
+        ss_tot = np.sum((y - np.mean(y)) ** 2)
+
+        def weighted(key):
+            values = [(m[key], sizes[p]) for p, m in position_metrics.items() if m[key] is not None]
+            if not values:
+                return None
+            return round(sum(v * n for v, n in values) / sum(n for _, n in values), 3)
+
+        return {
+            "mae": round(float(np.mean(np.abs(errors))), 3),
+            "rmse": round(float(np.sqrt(np.mean(errors ** 2))), 3),
+            "r2": round(float(1 - np.sum(errors ** 2) / ss_tot), 4) if ss_tot > 0 else 0.0,
+            "n_samples": len(X),
+            "cv_folds": max(m["cv_folds"] for m in position_metrics.values()),
+            "ridge_cv_mae": weighted("ridge_cv_mae"),
+            f"{self.estimator}_cv_mae": weighted(f"{self.estimator}_cv_mae"),
+            "ensemble_cv_mae": weighted("ensemble_cv_mae"),
+            "feature_importances": {k: round(v, 4) for k, v in self._feature_importances.items()},
+            "positions": {
+                p: {k: v for k, v in m.items() if k != "feature_importances"}
+                for p, m in position_metrics.items()
+            },
+        }
+
+    def _project_rows(self, X, positions=None):
+        """Route each row to its position's sub-model.
+
+        ``positions`` is required: without it no row could be routed, and
+        silently sending every row to the fallback would defeat the
+        per-position models.
+
+        Returns (projected, confidence_low, confidence_high) arrays in row
+        order. Each row's values are its sub-model's output for the rows of
+        that position. They can differ from running the sub-model on another
+        copy of the same rows in the last bit only: the ridge matmul is a
+        BLAS call whose summation order depends on the buffer's alignment.
+        """
+        if positions is None:
+            raise ValueError("PositionalProjector requires a position per row")
+        X = np.asarray(X, dtype=np.float64)
+        routes = np.array(
+            [p if p in self._models else self._fallback for p in positions], dtype=object,
+        )
+        projected, low, high = np.empty(len(X)), np.empty(len(X)), np.empty(len(X))
+        for position in dict.fromkeys(routes):
+            rows = np.flatnonzero(routes == position)
+            projected[rows], low[rows], high[rows] = self._models[position]._project_rows(X[rows])
+        return projected, low, high
+
+    def warm_up(self, batch_size=64):
+        """Warm up every sub-model (see ``PointProjector.warm_up``)."""
+        for model in self._models.values():
+            model.warm_up(batch_size)
+
+    def _state(self):
+        return {
+            "positional": True,
+            "estimator": self.estimator,
+            "min_samples": self.min_samples,
+            "fallback": self._fallback,
+            "feature_importances": self._feature_importances,
+            "trained": self._trained,
+            "models": {position: model._state() for position, model in self._models.items()},
+        }
+
+    def _set_state(self, data):
+        self.estimator = data["estimator"]
+        self.min_samples = data["min_samples"]
+        self._fallback = data["fallback"]
+        self._feature_importances = data["feature_importances"]
+        self._trained = data["trained"]
+        self._models = {}
+        for position, state in data["models"].items():
+            model = PointProjector()
+            model._set_state(state)
+            self._models[position] = model
+
+    def export(self, path):
+        """Write every sub-model into one memory-mappable artifact directory."""
+        if not self._trained:
+            raise RuntimeError("Model not trained. Call train() first.")
+        from analytics.artifacts import write_positional_artifact
+        write_positional_artifact(path, {
+            position: (model._arrays, model._ridge_weight, model._rf_weight,
+                       model._feature_importances)
+            for position, model in self._models.items()
+        }, self._fallback, self._feature_importances)
+
+    def load(self, path):
+        """Load every sub-model from one pickle file or artifact directory."""
+        from analytics.artifacts import is_artifact, read_positional_artifact
+        if is_artifact(path):
+            sub_models, manifest = read_positional_artifact(path)
+            self._models = {}
+            for position, (ensemble, fields) in sub_models.items():
+                model = PointProjector()
+                model._set_artifact(ensemble, fields)
+                self._models[position] = model
+            self._fallback = manifest["fallback"]
+            self.estimator = next(iter(self._models.values())).estimator
+            self._feature_importances = manifest.get("feature_importances") or None
+            self._trained = True
+            return
+
+        with open(path, "rb") as f:
+            self._set_state(pickle.load(f))
+
 
+def load_projector(path):
+    """Load a PointProjector or PositionalProjector, whichever ``path`` holds.
+
+    Accepts an artifact directory or a pickle written by ``save``.
+    """
+    from analytics.artifacts import POSITIONAL_KIND, artifact_kind, is_artifact
+    if is_artifact(path):
+        projector = PositionalProjector() if artifact_kind(path) == POSITIONAL_KIND else PointProjector()
+        projector.load(path)
+        return projector
+
+    with open(path, "rb") as f:
+        data = pickle.load(f)
+    projector = PositionalProjector() if data.get("positional") else PointProjector()
+    projector._set_state(data)
+    return projector
+
+
+CLUSTER_POSITIONS = ["QB", "RB", "WR", "TE"]
 
 CLUSTER_FEATURE_NAMES = [
     "avg_points", "std_dev", "floor", "ceiling", "snap_pct_avg", "consistency_score",
@@ -334,7 +798,18 @@ _ARCHETYPE_RULES = [
 
 
 class PlayerClusterer:
-    """K-Means clustering for player archetypes by position."""
+    """K-Means clustering for player archetypes by position.
+
+    Players outside the training snapshot (rookies, players with fewer than
+    six games when it was trained, mid-season breakouts) are classified on
+    the fly: their features are built from the season's stats so far and
+    assigned to the nearest cluster center. These provisional results are
+    cached per (player_id, season, data version), where the data version
+    changes whenever a new week of the player's stats is ingested.
+    """
+
+    # Provisional classifications kept before the cache is cleared
+    MAX_CACHED = 10000
 
     def __init__(self, n_clusters=4):
         self.n_clusters = n_clusters
@@ -345,24 +820,52 @@ class PlayerClusterer:
         self._cluster_centers_raw = None
         self._player_data = []
         self._position = None
-
-    def _build_player_features(self, db, season, position):
-        """Build feature matrix for clustering players of a given position."""
+        self._season = None
+        self._arrays = None
+        self._player_index = {}
+        self._tree = None
+        self._provisional = {}
+
+    def _build_player_features(self, db, season, position, player_ids=None, min_games=6):
+        """Build feature matrix for clustering players of a given position.
+
+        ``position`` may also be a list of positions; each player row records
+        its ``position``. With ``player_ids`` only those players are built,
+        whatever their recorded position. Takes two queries regardless of the
+        number of players: one weekly stats aggregation and one bulk snap
+        count fetch for every player it returns.
+        """
+        if player_ids is None:
+            if isinstance(position, (list, tuple)):
+                position = {"$in": list(position)}
+            match = {"season": season, "position": position}
+        else:
+            match = {"season": season, "player_id": {"$in": list(player_ids)}}
         pipeline = [
-            {"$match": {"season": season, "position": position}},
+            {"$match": match},
             {"$group": {
                 "_id": "$player_id",
                 "player_name": {"$first": "$player_name"},
+                "position": {"$first": "$position"},
                 "avg_points": {"$avg": "$fantasy_points_ppr"},
                 "floor": {"$min": "$fantasy_points_ppr"},
                 "ceiling": {"$max": "$fantasy_points_ppr"},
                 "games": {"$sum": 1},
                 "points_list": {"$push": "$fantasy_points_ppr"},
             }},
-            {"$match": {"games": {"$gte": 6}}},
+            {"$match": {"games": {"$gte": min_games}}},
         ]
         results = list(db["weekly_stats"].aggregate(pipeline))
 
+        snaps = {}
+        names = list({r.get("player_name") for r in results if r.get("player_name")})
+        if names:
+            for doc in db["snap_counts"].find(
+                {"player": {"$in": names}, "season": season},
+                {"player": 1, "offense_pct": 1, "_id": 0},
+            ):
+                snaps.setdefault(doc["player"], []).append(doc.get("offense_pct", 0.5) or 0.5)
+
         player_data = []
         for r in results:
             player_id = r["_id"]
@@ -378,17 +881,15 @@ class PlayerClusterer:
 
             consistency = std / avg if avg > 0 else 1.0
 
-            # Get snap percentage
+            # Snap percentage
             player_name = r.get("player_name", "")
-            snap_docs = list(db["snap_counts"].find(
-                {"player": player_name, "season": season},
-            ))
-            player_snaps = [s.get("offense_pct", 0.5) or 0.5 for s in snap_docs]
+            player_snaps = snaps.get(player_name, [])
             snap_pct_avg = sum(player_snaps) / len(player_snaps) if player_snaps else 0.5
 
             player_data.append({
                 "player_id": player_id,
                 "player_name": player_name,
+                "position": r.get("position"),
                 "avg_points": round(avg, 2),
                 "std_dev": round(std, 2),
                 "floor": round(r["floor"] or 0, 2),
@@ -421,10 +922,21 @@ class PlayerClusterer:
     def train(self, db, season, position):
         """Train the clusterer for a specific position.
 
+        Returns dict with cluster info.
+        """
+        return self.fit(self._build_player_features(db, season, position), position, season)
+
+    def fit(self, player_data, position, season=None):
+        """Fit the clusterer on prebuilt player rows (see ``_build_player_features``).
+
+        ``season`` is the season the rows were built from; ``update`` only
+        accepts stats from that season.
+
         Returns dict with cluster info.
         """
         self._position = position
-        player_data = self._build_player_features(db, season, position)
+        self._season = season
+        self._arrays = None
 
         if len(player_data) < self.n_clusters:
             raise ValueError(
@@ -462,7 +974,11 @@ class PlayerClusterer:
             self._player_data.append(p)
 
         self._trained = True
+        self._build_index()
+        self._provisional = {}
+        return self._cluster_info()
 
+    def _cluster_info(self):
         cluster_info = {}
         for cid, label in self._cluster_labels.items():
             members = [p for p in self._player_data if p["cluster_id"] == cid]
@@ -472,72 +988,283 @@ class PlayerClusterer:
                 "center": center,
                 "n_players": len(members),
             }
-
         return cluster_info
 
-    def classify_player(self, db, player_id, season):
-        """Classify a player into a cluster.
+    def update(self, db, season):
+        """Fold the latest stats for this clusterer's position into the clusters.
+
+        See ``partial_fit``. Returns dict with cluster info.
+
+        Raises:
+            ValueError: if ``season`` is not the season the clusterer was trained on
+        """
+        self._check_season(season)
+        return self.partial_fit(self._build_player_features(db, season, self._position))
+
+    def _check_season(self, season):
+        """Refuse to fold another season's rows into the clusters.
+
+        Clusterers saved before the training season was recorded have no
+        season and must be retrained.
+        """
+        if self._season is None:
+            raise ValueError("Clusterer has no training season recorded; retrain it")
+        if season != self._season:
+            raise ValueError(
+                f"Clusterer was trained on season {self._season}, not {season}"
+            )
+
+    def partial_fit(self, player_data):
+        """Update clusters with fresh player rows instead of retraining.
+
+        On the first update the KMeans model is replaced by a
+        ``MiniBatchKMeans`` seeded with its centers and the training rows, so
+        later updates move each center in proportion to the new rows and
+        cluster ids keep their meaning. Labels stay attached to their ids.
+        The scaler is not refit, so features stay in the training space.
 
-        Returns dict with cluster_id, cluster_label, characteristics.
+        Rows are season-to-date profiles, so only rows whose profile differs
+        from the player's snapshot row (players with new games, or new to the
+        snapshot) are fed to the model; unchanged players are not counted
+        again on every update. New rows replace snapshot rows of the same
+        player, and every player is then reassigned to the nearest updated
+        center.
+
+        Returns dict with cluster info.
         """
         if not self._trained:
             raise RuntimeError("Clusterer not trained. Call train() first.")
+        if self._scaler is None:
+            raise RuntimeError("Incremental updates need a clusterer loaded from a pickle")
+        def profile(p):
+            return [p[name] for name in CLUSTER_FEATURE_NAMES]
+
+        snapshot = {p["player_id"]: profile(p) for p in self._player_data}
+        player_data = [p for p in player_data if snapshot.get(p["player_id"]) != profile(p)]
+        if not player_data:
+            return self._cluster_info()
+
+        from sklearn.cluster import MiniBatchKMeans
+
+        def matrix(rows):
+            return self._scaler.transform(np.array([profile(p) for p in rows]))
+
+        if not isinstance(self._kmeans, MiniBatchKMeans):
+            centers = self._kmeans.cluster_centers_
+            kmeans = MiniBatchKMeans(
+                n_clusters=len(centers), init=centers, n_init=1, random_state=42,
+                # Never re-seed a small cluster elsewhere; ids must keep their meaning
+                reassignment_ratio=0.0,
+            )
+            kmeans.partial_fit(matrix(self._player_data))
+            self._kmeans = kmeans
+        self._kmeans.partial_fit(matrix(player_data))
+        self._cluster_centers_raw = self._scaler.inverse_transform(self._kmeans.cluster_centers_)
 
-        # Check if player is in cached data
-        for p in self._player_data:
-            if p["player_id"] == player_id:
-                center = dict(zip(
-                    CLUSTER_FEATURE_NAMES,
-                    [round(v, 2) for v in self._cluster_centers_raw[p["cluster_id"]]],
-                ))
-                return {
-                    "cluster_id": p["cluster_id"],
-                    "cluster_label": p["cluster_label"],
-                    "characteristics": {k: p[k] for k in CLUSTER_FEATURE_NAMES},
-                    "cluster_center": center,
-                }
+        rows = {p["player_id"]: p for p in self._player_data}
+        rows.update({p["player_id"]: p for p in player_data})
+        self._player_data = list(rows.values())
+        for p, cluster_id in zip(self._player_data, self._kmeans.predict(matrix(self._player_data))):
+            p["cluster_id"] = int(cluster_id)
+            p["cluster_label"] = self._cluster_labels[p["cluster_id"]]
 
-        return None
+        self._build_index()
+        self._provisional = {}
+        return self._cluster_info()
+
+    def _scaler_params(self):
+        """(mean, scale) of the feature scaler, from sklearn or artifact arrays."""
+        if self._scaler is not None:
+            return self._scaler.mean_, self._scaler.scale_
+        return self._arrays["scaler_mean"], self._arrays["scaler_scale"]
+
+    def _build_index(self):
+        """Index players by id and build a KD-tree over their scaled features."""
+        from sklearn.neighbors import KDTree
+        self._player_index = {p["player_id"]: i for i, p in enumerate(self._player_data)}
+        mean, scale = self._scaler_params()
+        X = np.array(
+            [[p[name] for name in CLUSTER_FEATURE_NAMES] for p in self._player_data],
+            dtype=np.float64,
+        ).reshape(-1, len(CLUSTER_FEATURE_NAMES))
+        self._tree = KDTree((X - mean) / scale) if len(X) else None
+
+    def _predict_clusters(self, X_scaled):
+        """Nearest cluster center of each scaled feature row (``KMeans.predict``)."""
+        if self._kmeans is not None:
+            return self._kmeans.predict(X_scaled)
+        centers = np.asarray(self._arrays["cluster_centers"])
+        distances = ((X_scaled[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        return np.argmin(distances, axis=1)
+
+    def _classification(self, p, provisional=False):
+        center = dict(zip(
+            CLUSTER_FEATURE_NAMES,
+            [round(v, 2) for v in self._cluster_centers_raw[p["cluster_id"]]],
+        ))
+        return {
+            "cluster_id": p["cluster_id"],
+            "cluster_label": p["cluster_label"],
+            "characteristics": {k: p[k] for k in CLUSTER_FEATURE_NAMES},
+            "cluster_center": center,
+            "provisional": provisional,
+        }
 
-    def get_similar_players(self, db, player_id, season, limit=5):
-        """Find similar players in the same cluster.
+    @staticmethod
+    def _data_versions(db, player_ids, season):
+        """(games, last week) of each player's weekly stats for the season."""
+        versions = {}
+        for doc in db["weekly_stats"].find(
+            {"player_id": {"$in": list(player_ids)}, "season": season},
+            {"player_id": 1, "week": 1, "_id": 0},
+        ):
+            games, last_week = versions.get(doc["player_id"], (0, 0))
+            versions[doc["player_id"]] = (games + 1, max(last_week, doc.get("week") or 0))
+        return versions
+
+    def _classify_unseen(self, db, player_ids, season):
+        """Provisional (player dict, scaled features) for players outside the snapshot.
+
+        Players without a game in ``season`` are left out.
+        """
+        versions = self._data_versions(db, player_ids, season)
+        found = {}
+        missing = []
+        for pid in player_ids:
+            if pid not in versions:
+                continue
+            cached = self._provisional.get((pid, season, versions[pid]))
+            if cached is not None:
+                found[pid] = cached
+            else:
+                missing.append(pid)
 
-        Returns list of player dicts from the same cluster.
+        if missing:
+            players = self._build_player_features(
+                db, season, self._position, player_ids=missing, min_games=1,
+            )
+            if players:
+                mean, scale = self._scaler_params()
+                X = np.array([[p[name] for name in CLUSTER_FEATURE_NAMES] for p in players])
+                X_scaled = (X - mean) / scale
+                if len(self._provisional) + len(players) > self.MAX_CACHED:
+                    self._provisional = {}
+                for p, cluster_id, x in zip(players, self._predict_clusters(X_scaled), X_scaled):
+                    p["cluster_id"] = int(cluster_id)
+                    p["cluster_label"] = self._cluster_labels[p["cluster_id"]]
+                    found[p["player_id"]] = (p, x)
+                    self._provisional[(p["player_id"], season, versions[p["player_id"]])] = (p, x)
+        return found
+
+    def classify_players(self, db, player_ids, season):
+        """Classify many players into clusters.
+
+        Players in the training snapshot are looked up directly; the rest are
+        classified provisionally from one batched feature build (see the
+        class docstring).
+
+        Returns a list aligned with ``player_ids`` holding the same dicts as
+        ``classify_player`` (or None for players without a game this season).
         """
         if not self._trained:
             raise RuntimeError("Clusterer not trained. Call train() first.")
 
-        classification = self.classify_player(db, player_id, season)
-        if classification is None:
+        player_ids = list(player_ids)
+        unseen = [pid for pid in player_ids if pid not in self._player_index]
+        provisional = self._classify_unseen(db, unseen, season) if unseen else {}
+        results = []
+        for pid in player_ids:
+            i = self._player_index.get(pid)
+            if i is not None:
+                results.append(self._classification(self._player_data[i]))
+            elif pid in provisional:
+                results.append(self._classification(provisional[pid][0], provisional=True))
+            else:
+                results.append(None)
+        return results
+
+    def classify_player(self, db, player_id, season):
+        """Classify a player into a cluster.
+
+        Returns dict with cluster_id, cluster_label, characteristics,
+        cluster_center and provisional (True if the player was classified on
+        the fly), or None if the player has no games in ``season``.
+        """
+        return self.classify_players(db, [player_id], season)[0]
+
+    def get_similar_players(self, db, player_id, season, limit=5):
+        """Find the players nearest to ``player_id`` in scaled feature space.
+
+        Neighbours come from a KD-tree over every player the clusterer was
+        trained on, so they may belong to a neighbouring cluster. Players
+        outside the snapshot are placed by their provisional features.
+
+        Returns list of player dicts ordered by increasing distance.
+        """
+        if not self._trained:
+            raise RuntimeError("Clusterer not trained. Call train() first.")
+        if self._tree is None:
             return []
 
-        cluster_id = classification["cluster_id"]
-        similar = [
-            {"player_id": p["player_id"], "player_name": p["player_name"],
-             "avg_points": p["avg_points"], "cluster_label": p["cluster_label"]}
-            for p in self._player_data
-            if p["cluster_id"] == cluster_id and p["player_id"] != player_id
-        ]
+        i = self._player_index.get(player_id)
+        if i is not None:
+            point = self._tree.data[i:i + 1]
+        else:
+            provisional = self._classify_unseen(db, [player_id], season)
+            if player_id not in provisional:
+                return []
+            point = provisional[player_id][1][None, :]
+
+        k = min(limit + 1, len(self._player_data))
+        distances, indices = self._tree.query(point, k=k)
+        similar = []
+        for distance, j in zip(distances[0], indices[0]):
+            p = self._player_data[j]
+            if p["player_id"] == player_id:
+                continue
+            similar.append({
+                "player_id": p["player_id"], "player_name": p["player_name"],
+                "avg_points": p["avg_points"], "cluster_label": p["cluster_label"],
+                "distance": round(float(distance), 4),
+            })
         return similar[:limit]
 
+    def warm_up(self):
+        """Page in cluster centers and scaler parameters after a load."""
+        if not self._trained:
+            return
+        np.asarray(self._cluster_centers_raw).sum()
+        for array in (self._arrays or {}).values():
+            np.asarray(array).sum()
+
+    def _state(self):
+        return {
+            "kmeans": self._kmeans,
+            "scaler": self._scaler,
+            "trained": self._trained,
+            "cluster_labels": self._cluster_labels,
+            "cluster_centers_raw": self._cluster_centers_raw,
+            "player_data": self._player_data,
+            "position": self._position,
+            "season": self._season,
+            "n_clusters": self.n_clusters,
+        }
+
     def save(self, path):
         """Save the trained clusterer to a pickle file."""
         with open(path, "wb") as f:
-            pickle.dump({
-                "kmeans": self._kmeans,
-                "scaler": self._scaler,
-                "trained": self._trained,
-                "cluster_labels": self._cluster_labels,
-                "cluster_centers_raw": self._cluster_centers_raw,
-                "player_data": self._player_data,
-                "position": self._position,
-                "n_clusters": self.n_clusters,
-            }, f)
+            pickle.dump(self._state(), f)
 
-    def load(self, path):
-        """Load a trained clusterer from a pickle file."""
-        with open(path, "rb") as f:
-            data = pickle.load(f)
+    def export(self, path):
+        """Write the trained clusterer as a memory-mappable artifact directory."""
+        if not self._trained or self._kmeans is None:
+            raise RuntimeError("Clusterer not trained. Call train() first.")
+        from analytics.artifacts import write_clusterer_artifact
+        write_clusterer_artifact(path, self._state())
+
+    def _set_state(self, data):
+        """Restore from a ``_state`` dict."""
+        self._arrays = None
         self._kmeans = data["kmeans"]
         self._scaler = data["scaler"]
         self._trained = data["trained"]
@@ -545,4 +1272,156 @@ class PlayerClusterer:
         self._cluster_centers_raw = data["cluster_centers_raw"]
         self._player_data = data["player_data"]
         self._position = data["position"]
+        self._season = data.get("season")
+        self.n_clusters = data["n_clusters"]
+        self._build_index()
+        self._provisional = {}
+
+    def _set_artifact(self, fields, arrays, players):
+        """Restore from memory-mapped artifact arrays, manifest fields and player rows."""
+        self._arrays = arrays
+        self._player_data = players
+        self._kmeans = self._scaler = None
+        self._trained = True
+        self._cluster_labels = {int(k): v for k, v in fields["cluster_labels"].items()}
+        self._cluster_centers_raw = arrays["cluster_centers_raw"]
+        self._position = fields["position"]
+        self._season = fields.get("season")
+        self.n_clusters = fields["n_clusters"]
+        self._build_index()
+        self._provisional = {}
+
+    def load(self, path):
+        """Load a trained clusterer from a pickle file or an artifact directory.
+
+        Artifact-loaded clusterers keep centers and scaler parameters as
+        memory-mapped arrays (``_arrays``) instead of sklearn objects.
+        """
+        from analytics.artifacts import is_artifact, read_clusterer_artifact
+        if is_artifact(path):
+            self._set_artifact(*read_clusterer_artifact(path))
+            return
+
+        with open(path, "rb") as f:
+            self._set_state(pickle.load(f))
+
+
+class ClustererBundle:
+    """PlayerClusterers for several positions, trained together and stored as one artifact.
+
+    ``train`` builds every position's player rows with one aggregation and
+    one snap count fetch, then fits the positions' KMeans models
+    concurrently in ``max_workers`` threads (sklearn's fit releases the GIL
+    and the rows are shared without copying).
+    """
+
+    def __init__(self, n_clusters=4):
+        self.n_clusters = n_clusters
+        self.clusterers = {}
+
+    def train(self, db, season, positions=None, max_workers=1):
+        """Train a clusterer per position from one pass over the season's stats.
+
+        Returns:
+            (dict of position -> cluster info, dict of position -> reason for
+             positions skipped for lack of players)
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        positions = list(positions or CLUSTER_POSITIONS)
+        by_position = {position: [] for position in positions}
+        for p in PlayerClusterer()._build_player_features(db, season, positions):
+            by_position[p["position"]].append(p)
+
+        def fit(position):
+            clusterer = PlayerClusterer(n_clusters=self.n_clusters)
+            return clusterer, clusterer.fit(by_position[position], position, season)
+
+        cluster_info = {}
+        skipped = {}
+        clusterers = {}
+        with ThreadPoolExecutor(max_workers=max(1, max_workers or 1)) as pool:
+            futures = {position: pool.submit(fit, position) for position in positions}
+            for position, future in futures.items():
+                try:
+                    clusterers[position], cluster_info[position] = future.result()
+                except ValueError as e:
+                    skipped[position] = str(e)
+        self.clusterers = clusterers
+        return cluster_info, skipped
+
+    def update(self, db, season, max_workers=1):
+        """Fold the latest stats into every clusterer (see ``PlayerClusterer.partial_fit``).
+
+        Reads the season once, like ``train``.
+
+        Returns:
+            Dict of position -> cluster info
+
+        Raises:
+            ValueError: if ``season`` is not the season the clusterers were trained on
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        for clusterer in self.clusterers.values():
+            clusterer._check_season(season)
+
+        by_position = {position: [] for position in self.clusterers}
+        for p in PlayerClusterer()._build_player_features(db, season, list(self.clusterers)):
+            by_position[p["position"]].append(p)
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers or 1)) as pool:
+            futures = {
+                position: pool.submit(clusterer.partial_fit, by_position[position])
+                for position, clusterer in self.clusterers.items()
+            }
+            return {position: future.result() for position, future in futures.items()}
+
+    @property
+    def season(self):
+        """The season the clusterers were trained on, or None if unknown."""
+        seasons = {c._season for c in self.clusterers.values()}
+        return seasons.pop() if len(seasons) == 1 else None
+
+    def get(self, position):
+        """The clusterer for ``position``, or None."""
+        return self.clusterers.get(position.upper()) if position else None
+
+    def warm_up(self):
+        for clusterer in self.clusterers.values():
+            clusterer.warm_up()
+
+    def save(self, path):
+        """Save every clusterer to one pickle file."""
+        with open(path, "wb") as f:
+            pickle.dump({
+                "bundle": True,
+                "n_clusters": self.n_clusters,
+                "clusterers": {pos: c._state() for pos, c in self.clusterers.items()},
+            }, f)
+
+    def export(self, path):
+        """Write every clusterer into one memory-mappable artifact directory."""
+        if not self.clusterers:
+            raise RuntimeError("Clusterers not trained. Call train() first.")
+        from analytics.artifacts import write_clusterer_bundle
+        write_clusterer_bundle(path, {pos: c._state() for pos, c in self.clusterers.items()})
+
+    def load(self, path):
+        """Load every clusterer from one pickle file or artifact directory."""
+        from analytics.artifacts import is_artifact, read_clusterer_bundle
+        self.clusterers = {}
+        if is_artifact(path):
+            for position, parts in read_clusterer_bundle(path).items():
+                clusterer = PlayerClusterer()
+                clusterer._set_artifact(*parts)
+                self.clusterers[position] = clusterer
+            return
+
+        with open(path, "rb") as f:
+            data = pickle.load(f)
         self.n_clusters = data["n_clusters"]
+        for position, state in data["clusterers"].items():
+            clusterer = PlayerClusterer()
+            clusterer._set_state(state)
+            self.clusterers[position] = clusterer
@@ -1,10 +1,16 @@
 """Projection orchestrator: caching, risk adjustment, Monte Carlo simulation."""
 
-import random
-
 import numpy as np
 
 
+# Upper bound on simulated seasons per request
+MAX_SIMULATIONS = 100_000
+
+# Reported season-total percentiles
+PERCENTILES = [10, 25, 50, 75, 90]
+PERCENTILE_KEYS = ["p10", "p25", "p50", "p75", "p90"]
+
+
 def get_player_projection(db, player_id, season, week, risk_level="medium", model=None):
     """Get a player's projected points for a given week.
 
@@ -39,30 +45,36 @@ def get_player_projection(db, player_id, season, week, risk_level="medium", mode
         projection = model.predict(db, player_id, season, week)
         if projection is None:
             return None
-        # Cache the result
-        db["projections"].update_one(
-            {"player_id": player_id, "season": season, "week": week},
-            {"$set": {
-                "player_id": player_id,
-                "season": season,
-                "week": week,
-                "projected_points": projection["projected_points"],
-                "confidence_low": projection["confidence_low"],
-                "confidence_high": projection["confidence_high"],
-            }},
-            upsert=True,
-        )
+        _cache_projection(db, player_id, season, week, projection)
     else:
         return None
 
-    # Apply risk adjustment
-    display_points = _apply_risk(projection, risk_level)
+    return _with_display_points(projection, risk_level)
+
 
+def _cache_projection(db, player_id, season, week, projection):
+    """Upsert a model projection into the projections cache."""
+    db["projections"].update_one(
+        {"player_id": player_id, "season": season, "week": week},
+        {"$set": {
+            "player_id": player_id,
+            "season": season,
+            "week": week,
+            "projected_points": projection["projected_points"],
+            "confidence_low": projection["confidence_low"],
+            "confidence_high": projection["confidence_high"],
+        }},
+        upsert=True,
+    )
+
+
+def _with_display_points(projection, risk_level):
+    """Build the public projection dict, including the risk-adjusted display value."""
     return {
         "projected_points": projection["projected_points"],
         "confidence_low": projection["confidence_low"],
         "confidence_high": projection["confidence_high"],
-        "display_points": display_points,
+        "display_points": _apply_risk(projection, risk_level),
     }
 
 
@@ -131,14 +143,96 @@ def get_remaining_season_projection(db, player_id, season, current_week,
     return result
 
 
+def _sample_triangular(rng, low, mid, high, n_simulations):
+    """Draw an (n_simulations, n_weeks) matrix of triangular week scores.
+
+    Uses the inverse CDF so weeks with a zero-width interval (low == high)
+    simply return ``low`` instead of raising, as ``Generator.triangular`` would.
+    """
+    mid = np.clip(mid, low, high)
+    width = high - low
+    left = mid - low
+    right = high - mid
+    u = rng.random((n_simulations, len(mid)))
+    cut = np.divide(left, width, out=np.zeros_like(width), where=width > 0)
+    return np.where(
+        u < cut,
+        low + np.sqrt(u * width * left),
+        high - np.sqrt((1 - u) * width * right),
+    )
+
+
+def _standard_errors(batches, batch_percentiles):
+    """Batch-means standard errors of the reported simulation statistics.
+
+    Each batch is an independent sample, so the spread of a statistic across
+    batches, divided by the square root of the batch count, estimates the
+    standard error of that statistic over all batches.
+
+    Returns:
+        Dict of statistic -> standard error, or None with fewer than two batches
+    """
+    n_batches = len(batches)
+    if n_batches < 2:
+        return None
+    percentiles = np.array(batch_percentiles)
+    root = np.sqrt(n_batches)
+    errors = dict(zip(PERCENTILE_KEYS, percentiles.std(axis=0, ddof=1) / root))
+    p25, p75 = percentiles[:, 1].mean(), percentiles[:, 3].mean()
+    upside = np.array([np.mean(batch >= p75) * 100 for batch in batches])
+    bust = np.array([np.mean(batch <= p25) * 100 for batch in batches])
+    errors["upside_pct"] = upside.std(ddof=1) / root
+    errors["bust_pct"] = bust.std(ddof=1) / root
+    return {key: float(value) for key, value in errors.items()}
+
+
+def _within_tolerance(errors, tolerance, pct_tolerance):
+    if errors is None:
+        return False
+    return (
+        all(errors[key] <= tolerance for key in PERCENTILE_KEYS)
+        and errors["upside_pct"] <= pct_tolerance
+        and errors["bust_pct"] <= pct_tolerance
+    )
+
+
 def run_monte_carlo_simulation(db, player_id, season, current_week,
-                                n_simulations=1000, model=None, total_weeks=17):
+                                n_simulations=None, model=None, total_weeks=17,
+                                remaining=None, min_simulations=2000,
+                                max_simulations=MAX_SIMULATIONS, batch_size=1000,
+                                tolerance=0.5, pct_tolerance=1.0):
     """Simulate season outcomes using model predictions and historical variance.
 
-    Returns dict with percentiles, histogram data, upside/bust probabilities.
+    Every remaining week is drawn from a triangular distribution over the
+    model's confidence interval, peaking at the projection. Simulations are
+    drawn in vectorized batches of ``batch_size`` seasons. Unless
+    ``n_simulations`` fixes the count, batches continue until the standard
+    errors of the percentiles are within ``tolerance`` points and those of the
+    upside/bust percentages within ``pct_tolerance`` percentage points, or
+    ``max_simulations`` is reached.
+
+    Args:
+        n_simulations: fixed number of simulated seasons (default: adaptive),
+            capped at ``MAX_SIMULATIONS``
+        remaining: optional result of ``predict_remaining_season`` (or
+            ``get_remaining_season_projection``) for the same player and week.
+            When given, its weekly projections are reused instead of running
+            the model again.
+        min_simulations, max_simulations: bounds on the adaptive count
+        batch_size: seasons simulated per batch
+        tolerance: target standard error of p10-p90, in points
+        pct_tolerance: target standard error of upside_pct and bust_pct
+
+    Returns dict with percentiles, histogram data, upside/bust probabilities,
+    the number of simulations run, their standard errors (batch means; None
+    with fewer than two batches) and whether they met the tolerances.
     """
-    if model is None:
-        return None
+    if remaining is None:
+        if model is None:
+            return None
+        remaining = model.predict_remaining_season(db, player_id, season, current_week, total_weeks)
+        if remaining is None:
+            return None
 
     # Get actual points so far
     actual_docs = list(db["weekly_stats"].find(
@@ -147,76 +241,63 @@ def run_monte_carlo_simulation(db, player_id, season, current_week,
     ))
     actual_total = sum(d.get("fantasy_points_ppr", 0) or 0 for d in actual_docs)
 
-    # Get projections for remaining weeks
-    remaining_weeks = []
-    for week in range(current_week + 1, total_weeks + 1):
-        pred = model.predict(db, player_id, season, week)
-        if pred:
-            remaining_weeks.append(pred)
-        else:
-            # Fallback
-            pts = [d.get("fantasy_points_ppr", 0) or 0 for d in actual_docs] if actual_docs else [0]
-            avg = sum(pts) / len(pts)
-            remaining_weeks.append({
-                "projected_points": avg,
-                "confidence_low": max(0, avg * 0.6),
-                "confidence_high": avg * 1.4,
-            })
+    remaining_weeks = remaining["weekly"]
 
     if not remaining_weeks:
         return None
 
-    # Run simulations
-    rng = random.Random(42)
-    season_totals = []
-
-    for _ in range(n_simulations):
-        sim_total = actual_total
-        for week_pred in remaining_weeks:
-            mid = week_pred["projected_points"]
-            low = week_pred["confidence_low"]
-            high = week_pred["confidence_high"]
-            # Sample from a triangular distribution
-            simulated = rng.triangular(low, high, mid)
-            sim_total += max(0, simulated)
-        season_totals.append(round(sim_total, 2))
-
-    season_totals.sort()
-    arr = np.array(season_totals)
-
-    # Percentiles
-    p10 = round(float(np.percentile(arr, 10)), 1)
-    p25 = round(float(np.percentile(arr, 25)), 1)
-    p50 = round(float(np.percentile(arr, 50)), 1)
-    p75 = round(float(np.percentile(arr, 75)), 1)
-    p90 = round(float(np.percentile(arr, 90)), 1)
+    adaptive = n_simulations is None
+    if adaptive:
+        target = max(1, min(int(max_simulations), MAX_SIMULATIONS))
+        min_simulations = min(min_simulations, target)
+    else:
+        target = max(1, min(int(n_simulations), MAX_SIMULATIONS))
+    mid = np.array([w["projected_points"] for w in remaining_weeks], dtype=np.float64)
+    low = np.array([w["confidence_low"] for w in remaining_weeks], dtype=np.float64)
+    high = np.array([w["confidence_high"] for w in remaining_weeks], dtype=np.float64)
+
+    rng = np.random.default_rng(42)
+    batches, batch_percentiles = [], []
+    n_run = 0
+    while n_run < target:
+        size = min(batch_size, target - n_run)
+        weekly = _sample_triangular(rng, low, mid, high, size)
+        batch = actual_total + np.maximum(weekly, 0).sum(axis=1)
+        batches.append(batch)
+        batch_percentiles.append(np.percentile(batch, PERCENTILES))
+        n_run += size
+        if adaptive and n_run >= min_simulations and _within_tolerance(
+            _standard_errors(batches, batch_percentiles), tolerance, pct_tolerance,
+        ):
+            break
+    arr = np.concatenate(batches)
+    errors = _standard_errors(batches, batch_percentiles)
+
+    p10, p25, p50, p75, p90 = (
+        round(float(v), 1) for v in np.percentile(arr, PERCENTILES)
+    )
 
     # Histogram bins
     n_bins = 20
     bin_min = float(arr.min())
     bin_max = float(arr.max())
-    bin_width = (bin_max - bin_min) / n_bins if bin_max > bin_min else 1
-    histogram = []
-    for i in range(n_bins):
-        bin_start = bin_min + i * bin_width
-        bin_end = bin_start + bin_width
-        if i == n_bins - 1:
-            count = int(np.sum((arr >= bin_start) & (arr <= bin_end)))
-        else:
-            count = int(np.sum((arr >= bin_start) & (arr < bin_end)))
-        histogram.append({
-            "bin_start": round(bin_start, 1),
-            "bin_end": round(bin_end, 1),
-            "count": count,
-        })
+    if bin_max <= bin_min:
+        bin_max = bin_min + n_bins
+    counts, edges = np.histogram(arr, bins=n_bins, range=(bin_min, bin_max))
+    histogram = [
+        {
+            "bin_start": round(float(edges[i]), 1),
+            "bin_end": round(float(edges[i + 1]), 1),
+            "count": int(counts[i]),
+        }
+        for i in range(n_bins)
+    ]
 
     # Upside/bust probabilities
     # "Upside" = exceeding p75 of preseason expectation (use p75 as threshold)
     # "Bust" = falling below p25
-    upside_threshold = p75
-    bust_threshold = p25
-    upside_pct = round(float(np.sum(arr >= upside_threshold) / len(arr) * 100), 1)
-    bust_pct = round(float(np.sum(arr <= bust_threshold) / len(arr) * 100), 1)
+    upside_pct = round(float(np.mean(arr >= p75) * 100), 1)
+    bust_pct = round(float(np.mean(arr <= p25) * 100), 1)
 
     return {
         "percentiles": {
@@ -225,21 +306,45 @@ def run_monte_carlo_simulation(db, player_id, season, current_week,
         "histogram": histogram,
         "upside_pct": upside_pct,
         "bust_pct": bust_pct,
-        "n_simulations": n_simulations,
+        "n_simulations": n_run,
+        "standard_error": (
+            {key: round(value, 3) for key, value in errors.items()} if errors else None
+        ),
+        "converged": _within_tolerance(errors, tolerance, pct_tolerance),
         "actual_so_far": round(actual_total, 1),
     }
 
 
-def batch_project_players(db, player_ids, season, week, model=None):
+def batch_project_players(db, player_ids, season, week, model=None, risk_level="medium"):
     """Batch project multiple players for a given week.
 
+    Reads the projections cache in one query and runs ``model.predict_many``
+    once for all cache misses, caching the new results.
+
     Returns list of dicts with player_id and projection data.
     """
+    player_ids = list(player_ids)
+    projections = {}
+    for cached in db["projections"].find({
+        "player_id": {"$in": player_ids},
+        "season": season,
+        "week": week,
+    }):
+        projections[cached["player_id"]] = cached
+
+    missing = [pid for pid in dict.fromkeys(player_ids) if pid not in projections]
+    if missing and model is not None:
+        for player_id, projection in zip(missing, model.predict_many(db, missing, season, week)):
+            if projection is None:
+                continue
+            _cache_projection(db, player_id, season, week, projection)
+            projections[player_id] = projection
+
     results = []
     for player_id in player_ids:
-        projection = get_player_projection(db, player_id, season, week, model=model)
+        projection = projections.get(player_id)
         results.append({
             "player_id": player_id,
-            "projection": projection,
+            "projection": _with_display_points(projection, risk_level) if projection else None,
         })
     return results
@@ -0,0 +1,225 @@
+"""Hot-reloading registry of trained models.
+
+``scripts/train_models.py`` exports each model to a fresh versioned
+artifact directory (``<models_dir>/versions/<model_name>/<version>/``) and
+only then records ``version`` and ``artifact_path`` in ``model_metadata``, so
+a published version is always complete on disk.
+
+Running app workers hold a ``ModelRegistry``. A background thread polls
+``model_metadata`` every ``check_interval`` seconds with one small indexed
+query per model. When a newer version appears it is loaded and warmed up
+off the request path, then swapped in with a single dict assignment;
+requests already holding the old model finish with it, and later requests
+get the new one. Models without a published version fall back to the
+unversioned ``<models_dir>/<model_name>`` artifact or ``.pkl`` and are
+loaded once.
+"""
+
+import os
+import shutil
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime, timezone
+
+from analytics.artifacts import is_artifact
+
+
+VERSIONS_DIR = "versions"
+
+
+def new_version():
+    """A sortable version string for a model trained now."""
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+
+
+def version_path(name, version):
+    """Artifact path of a model version, relative to the models directory."""
+    return os.path.join(VERSIONS_DIR, name, version)
+
+
+def publish_model(db, name, season, version, **fields):
+    """Point ``model_metadata`` at a model version already exported to disk.
+
+    Args:
+        db: MongoDB database instance
+        name: model name (``point_projector``, ``clusterers``, ...)
+        season: primary season the model was trained for
+        version: version string the artifact was exported under
+        **fields: extra metadata to store (metrics, cluster info, ...)
+    """
+    db["model_metadata"].update_one(
+        {"model_name": name, "season": season},
+        {"$set": {
+            "model_name": name,
+            "season": season,
+            "version": version,
+            "artifact_path": version_path(name, version),
+            "published_at": datetime.now(timezone.utc),
+            **fields,
+        }},
+        upsert=True,
+    )
+
+
+def get_published_version(db, name):
+    """Latest published ``(version, artifact_path)`` for a model, or None."""
+    doc = db["model_metadata"].find_one(
+        {"model_name": name, "artifact_path": {"$ne": None}},
+        {"version": 1, "artifact_path": 1, "_id": 0},
+        sort=[("published_at", -1)],
+    )
+    if not doc or not doc.get("artifact_path"):
+        return None
+    return doc["version"], doc["artifact_path"]
+
+
+def prune_versions(models_dir, name, keep=3):
+    """Delete all but the newest ``keep`` exported versions of a model.
+
+    Workers that still have a deleted version memory-mapped keep reading it
+    until they swap; the files are only freed once unmapped.
+
+    Returns:
+        List of versions deleted
+    """
+    root = os.path.join(models_dir, VERSIONS_DIR, name)
+    if not os.path.isdir(root):
+        return []
+    versions = sorted(v for v in os.listdir(root) if is_artifact(os.path.join(root, v)))
+    stale = versions[:-keep] if keep > 0 else versions
+    for version in stale:
+        shutil.rmtree(os.path.join(root, version), ignore_errors=True)
+    return stale
+
+
+def load_model(name, path):
+    """Load and warm up a model from an artifact directory or pickle."""
+    from analytics.models import ClustererBundle, PlayerClusterer, load_projector
+    if name == "point_projector":
+        model = load_projector(path)
+    elif name == "similarity_index":
+        from analytics.similarity import SimilarityIndex
+        model = SimilarityIndex()
+        model.load(path)
+    else:
+        model = ClustererBundle() if name == "clusterers" else PlayerClusterer()
+        model.load(path)
+    model.warm_up()
+    return model
+
+
+class ModelRegistry:
+    """Per-process cache of loaded models that follows ``model_metadata``.
+
+    Args:
+        db: MongoDB database instance
+        models_dir: directory artifact paths are relative to
+        check_interval: seconds between version checks; 0 disables the
+            background thread (call ``refresh`` to check manually)
+    """
+
+    def __init__(self, db, models_dir, check_interval=60):
+        self._db = db
+        self._models_dir = models_dir
+        self._check_interval = check_interval
+        # name -> (version, model); replaced wholesale, never mutated
+        self._models = {}
+        self._load_lock = threading.Lock()
+        self._thread = None
+        # (name, version) pairs already reported as unloadable
+        self._skipped = set()
+
+    def get(self, name):
+        """The current model for ``name``, or None if none is available.
+
+        The first call per model loads it synchronously; afterwards models
+        are only replaced by the background refresh.
+        """
+        entry = self._models.get(name)
+        if entry is None:
+            with self._load_lock:
+                entry = self._models.get(name)
+                if entry is None:
+                    entry = self._load(name)
+                    self._models[name] = entry
+            self._start()
+        return entry[1]
+
+    def version(self, name):
+        """Version string of the loaded model, or None if unversioned or not loaded."""
+        entry = self._models.get(name)
+        return entry[0] if entry else None
+
+    def _load(self, name):
+        published = get_published_version(self._db, name)
+        if published:
+            version, artifact_path = published
+            path = os.path.join(self._models_dir, artifact_path)
+            if is_artifact(path):
+                return version, load_model(name, path)
+
+        base = os.path.join(self._models_dir, name)
+        if is_artifact(base):
+            return None, load_model(name, base)
+        if os.path.exists(f"{base}.pkl"):
+            return None, load_model(name, f"{base}.pkl")
+        return None, None
+
+    def refresh(self):
+        """Check every loaded model for a newer published version and swap it in.
+
+        The new version is fully loaded and warmed up before the swap. A
+        version whose artifact is missing or fails to load is skipped, with
+        the reason written to stderr once, and the current model keeps
+        serving.
+
+        Returns:
+            List of model names that were swapped
+        """
+        swapped = []
+        for name, (current, _) in list(self._models.items()):
+            published = get_published_version(self._db, name)
+            if not published or published[0] == current:
+                continue
+            version, artifact_path = published
+            path = os.path.join(self._models_dir, artifact_path)
+            if not is_artifact(path):
+                self._skip(name, version, f"no artifact at {path}")
+                continue
+            try:
+                model = load_model(name, path)
+            except Exception:
+                self._skip(name, version, traceback.format_exc())
+                continue
+            self._models[name] = (version, model)
+            swapped.append(name)
+        return swapped
+
+    def _skip(self, name, version, reason):
+        if (name, version) in self._skipped:
+            return
+        self._skipped.add((name, version))
+        print(f"Keeping current {name}: version {version} could not be loaded: {reason}",
+              file=sys.stderr)
+
+    def _start(self):
+        """Start the background version check, once per process."""
+        if self._thread is not None or self._check_interval <= 0:
+            return
+        with self._load_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._poll, name="model-registry", daemon=True,
+            )
+            self._thread.start()
+
+    def _poll(self):
+        while True:
+            time.sleep(self._check_interval)
+            try:
+                self.refresh()
+            except Exception:  # one failed check must not stop hot reloading
+                traceback.print_exc()
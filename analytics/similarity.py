@@ -0,0 +1,150 @@
+"""Cross-season player similarity index.
+
+Every row is one player's profile in one season: the clusterer features
+(``CLUSTER_FEATURE_NAMES``) of every player with enough games, for every
+ingested season. Profiles are standardized per position over all seasons
+and stored as one float32 matrix with each position's rows contiguous, so
+"whose 2021 profile looks like this player's 2024 profile" is a single
+vectorized distance computation over a slice of the matrix followed by an
+``argpartition`` top-k.
+
+The index is exported as an artifact next to the clusterers (see
+``analytics.artifacts``) and served from the model registry.
+"""
+
+import numpy as np
+
+from analytics.models import CLUSTER_FEATURE_NAMES, CLUSTER_POSITIONS, PlayerClusterer
+
+
+class SimilarityIndex:
+    """Nearest-neighbour search over (player, season) profiles, within each position."""
+
+    def __init__(self):
+        self.positions = []
+        # position -> (first row, end row) in ``matrix``
+        self.bounds = {}
+        self.matrix = None
+        self.mean = None
+        self.scale = None
+        self.players = []
+        # Season of each row, for filtering candidates by season
+        self.seasons = np.empty(0, np.int64)
+        self._rows = {}
+
+    def build(self, db, seasons=None, positions=None, min_games=6):
+        """Build the index from weekly stats.
+
+        Args:
+            db: MongoDB database instance
+            seasons: seasons to include (default: every season in weekly_stats)
+            positions: positions to include (default: ``CLUSTER_POSITIONS``)
+            min_games: games a player needs in a season for a profile
+
+        Returns:
+            Number of (player, season) profiles indexed
+        """
+        positions = list(positions or CLUSTER_POSITIONS)
+        if seasons is None:
+            seasons = db["weekly_stats"].distinct("season")
+        builder = PlayerClusterer()
+        by_position = {position: [] for position in positions}
+        for season in sorted(seasons):
+            for p in builder._build_player_features(db, season, positions, min_games=min_games):
+                by_position[p["position"]].append({**p, "season": season})
+
+        self.positions = [position for position in positions if by_position[position]]
+        self.bounds = {}
+        blocks, means, scales, players = [], [], [], []
+        for position in self.positions:
+            rows = by_position[position]
+            X = np.array([[p[name] for name in CLUSTER_FEATURE_NAMES] for p in rows])
+            mean = X.mean(axis=0)
+            scale = X.std(axis=0)
+            scale[scale == 0] = 1.0
+            self.bounds[position] = (len(players), len(players) + len(rows))
+            blocks.append((X - mean) / scale)
+            means.append(mean)
+            scales.append(scale)
+            players.extend(
+                {"player_id": p["player_id"], "player_name": p["player_name"],
+                 "position": position, "season": p["season"], "avg_points": p["avg_points"]}
+                for p in rows
+            )
+
+        n_features = len(CLUSTER_FEATURE_NAMES)
+        self.matrix = np.vstack(blocks).astype(np.float32) if blocks else np.empty((0, n_features), np.float32)
+        self.mean = np.array(means).reshape(-1, n_features)
+        self.scale = np.array(scales).reshape(-1, n_features)
+        self.players = players
+        self._index_rows()
+        return len(players)
+
+    def _index_rows(self):
+        self._rows = {(p["player_id"], p["season"]): i for i, p in enumerate(self.players)}
+        self.seasons = np.array([p["season"] for p in self.players], dtype=np.int64)
+
+    def query(self, player_id, season, k=10, seasons=None):
+        """The ``k`` profiles nearest to a player's profile in ``season``.
+
+        Candidates are every indexed profile of the same position, in any
+        season (or only ``seasons`` if given), including the player's own
+        other seasons but not the query profile itself.
+
+        Returns:
+            List of dicts (player_id, player_name, season, avg_points,
+            distance) ordered by increasing Euclidean distance, or None if the
+            player has no profile for ``season``
+        """
+        row = self._rows.get((player_id, season))
+        if row is None:
+            return None
+        start, end = self.bounds[self.players[row]["position"]]
+        candidates = self.matrix[start:end]
+        distances = np.sum((candidates - self.matrix[row]) ** 2, axis=1)
+        distances[row - start] = np.inf
+        if seasons is not None:
+            wanted = np.isin(self.seasons[start:end], list(seasons))
+            distances[~wanted] = np.inf
+
+        k = min(k, int(np.isfinite(distances).sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top], kind="stable")]
+        return [
+            {
+                "player_id": self.players[start + i]["player_id"],
+                "player_name": self.players[start + i]["player_name"],
+                "season": self.players[start + i]["season"],
+                "avg_points": self.players[start + i]["avg_points"],
+                "distance": round(float(np.sqrt(distances[i])), 4),
+            }
+            for i in top
+        ]
+
+    def warm_up(self):
+        """Page in the memory-mapped matrix after a load."""
+        if self.matrix is not None:
+            np.asarray(self.matrix).sum()
+
+    def export(self, path):
+        """Write the index as a memory-mappable artifact directory."""
+        if self.matrix is None:
+            raise RuntimeError("Index not built. Call build() first.")
+        from analytics.artifacts import write_similarity_artifact
+        write_similarity_artifact(
+            path, self.positions, {pos: list(b) for pos, b in self.bounds.items()},
+            self.matrix, self.mean, self.scale, self.players,
+        )
+
+    def load(self, path):
+        """Open an exported index; the matrix is memory-mapped read-only."""
+        from analytics.artifacts import read_similarity_artifact
+        manifest, arrays, self.players = read_similarity_artifact(path)
+        self.positions = manifest["positions"]
+        self.bounds = {pos: tuple(b) for pos, b in manifest["bounds"].items()}
+        self.matrix = arrays["matrix"]
+        self.mean = arrays["mean"]
+        self.scale = arrays["scale"]
+        self._index_rows()
@@ -0,0 +1,234 @@
+"""Budgeted hyperparameter search for the point projection model.
+
+Candidate tree-model configurations are drawn at random from
+``SEARCH_SPACES`` and raced with successive halving. Every candidate is first
+scored with a small number of trees (``n_estimators`` for the forest,
+``max_iter`` for gradient boosting). Only the best ``1 / eta`` of each rung
+advance to the next rung, which has ``eta`` times as many trees, so weak
+configurations stop early. Scores are time-series CV MAE on the fold
+matrices from ``analytics.validation``. These are built once and handed to
+each worker process a single time when the process starts.
+
+The ridge blend weight needs no refitting: each trial's out-of-fold
+predictions are blended with the ridge's for every weight in
+``BLEND_WEIGHTS`` and the best weight is kept. Ridge alpha is still chosen by
+``RidgeCV``'s leave-one-out search.
+
+A wall-clock budget bounds the whole search. Once it runs out, queued trials
+are cancelled, worker processes still running a trial are terminated, and
+the best configuration of the last rung in which every trial finished wins.
+"""
+
+import math
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from analytics.validation import build_fold_matrices, cross_validate, time_series_folds
+
+
+SEARCH_SPACES = {
+    "rf": {
+        "max_depth": [6, 8, 10, 12, 16, None],
+        "min_samples_leaf": [1, 2, 5, 10, 20],
+        "max_features": [1.0, 0.7, 0.5, "sqrt"],
+    },
+    "hgb": {
+        "learning_rate": [0.03, 0.05, 0.1, 0.2],
+        "max_depth": [3, 4, 6, 8, None],
+        "min_samples_leaf": [10, 20, 40, 80],
+        "l2_regularization": [0.0, 0.1, 1.0],
+    },
+}
+
+# Number-of-trees parameter and its value in the final rung
+RESOURCES = {"rf": ("n_estimators", 100), "hgb": ("max_iter", 200)}
+
+# Ridge weights tried for every trial; the tree model gets 1 - weight
+BLEND_WEIGHTS = [w / 10 for w in range(11)]
+
+
+def sample_candidates(estimator, n_candidates, seed=42):
+    """Draw distinct random configurations from the estimator's search space."""
+    space = SEARCH_SPACES[estimator]
+    total = math.prod(len(values) for values in space.values())
+    rng = random.Random(seed)
+    candidates = []
+    seen = set()
+    while len(candidates) < min(n_candidates, total):
+        params = {name: rng.choice(values) for name, values in space.items()}
+        key = tuple(params.values())
+        if key not in seen:
+            seen.add(key)
+            candidates.append(params)
+    return candidates
+
+
+def halving_schedule(n_candidates, max_resource, eta=3, min_resource=10):
+    """(n_candidates, resource) per rung, ending at ``max_resource`` trees."""
+    n_rungs = 1
+    while n_candidates // eta ** n_rungs >= 1:
+        n_rungs += 1
+    schedule = []
+    for rung in range(n_rungs):
+        resource = max(min_resource, max_resource // eta ** (n_rungs - 1 - rung))
+        schedule.append((max(1, n_candidates // eta ** rung), min(resource, max_resource)))
+    return schedule
+
+
+# Fold matrices of the worker process, set once by _init_worker
+_worker_folds = None
+
+
+def _init_worker(fold_matrices):
+    global _worker_folds
+    _worker_folds = fold_matrices
+
+
+def _trial_worker(estimator, params):
+    """Fit one configuration on every cached fold; returns out-of-fold predictions."""
+    from analytics.models import PointProjector
+    model = PointProjector(estimator=estimator, params=params)._make_model()
+    if estimator == "rf":
+        # Parallelism comes from running trials side by side
+        model.set_params(n_jobs=1)
+    predictions = []
+    for fold in _worker_folds:
+        predictions.append(model.fit(fold.X_train, fold.y_train).predict(fold.X_test))
+    return predictions
+
+
+def _blend_score(model_predictions, ridge_predictions, fold_matrices):
+    """Best (cv_mae, ridge_weight) over ``BLEND_WEIGHTS``."""
+    y = np.concatenate([fold.y_test for fold in fold_matrices])
+    model_pred = np.concatenate(model_predictions)
+    ridge_pred = np.concatenate(ridge_predictions)
+    scores = [
+        (float(np.mean(np.abs(y - (w * ridge_pred + (1 - w) * model_pred)))), w)
+        for w in BLEND_WEIGHTS
+    ]
+    return min(scores)
+
+
+def _terminate_workers(pool):
+    """Stop worker processes still running trials so the budget is a hard limit.
+
+    ``ProcessPoolExecutor`` has no public way to kill running work; its
+    processes are reached through ``_processes``. Pools without worker
+    processes are left alone.
+    """
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+
+
+def tune(X, y, groups, estimator="rf", n_candidates=27, eta=3, budget_s=600,
+         max_workers=1, seed=42, progress=None):
+    """Search tree-model hyperparameters and the ridge blend weight.
+
+    Args:
+        X, y: training feature matrix and targets
+        groups: time key per row (see ``analytics.validation.time_groups``)
+        estimator: "rf" or "hgb"
+        n_candidates: random configurations in the first rung
+        eta: halving rate; each rung keeps the best 1 / eta
+        budget_s: wall-clock budget in seconds for the whole search
+        max_workers: number of trial worker processes
+        seed: random seed for sampling configurations
+        progress: optional callable(trial dict) invoked as each trial finishes
+
+    Returns:
+        Dict with ``best`` (params with the full tree count, ridge_weight,
+        cv_mae, and ``rung_resource``, the tree count it was scored with)
+        from the last rung in which every trial finished, ``trials``
+        (one row per completed trial), ``elapsed_s``, ``budget_s`` and
+        ``completed`` (False if the budget ran out)
+    """
+    start = time.monotonic()
+    deadline = start + budget_s
+    fold_matrices = build_fold_matrices(X, y, time_series_folds(groups))
+    if not fold_matrices:
+        raise ValueError("Not enough weeks of training data to cross-validate")
+    ridge_predictions, _ = cross_validate(
+        {"ridge": _ridge_candidate()}, fold_matrices, max_workers=max_workers,
+    )
+
+    resource_param, max_resource = RESOURCES[estimator]
+    survivors = sample_candidates(estimator, n_candidates, seed=seed)
+    schedule = halving_schedule(len(survivors), max_resource, eta=eta)
+    trials = []
+    # Trials of the last rung in which every trial finished
+    ranked = []
+    completed = True
+
+    pool = ProcessPoolExecutor(
+        max_workers=max(1, max_workers or 1),
+        initializer=_init_worker, initargs=(fold_matrices,),
+    )
+    try:
+        for rung, (n_keep, resource) in enumerate(schedule):
+            survivors = survivors[:n_keep]
+            futures = {
+                pool.submit(_trial_worker, estimator, {**params, resource_param: resource}): params
+                for params in survivors
+            }
+            results = []
+            pending = set(futures)
+            while pending:
+                done, pending = wait(
+                    pending, timeout=max(0.0, deadline - time.monotonic()),
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    cv_mae, ridge_weight = _blend_score(
+                        future.result(), ridge_predictions["ridge"], fold_matrices,
+                    )
+                    trial = {
+                        "rung": rung, "resource": resource, "params": futures[future],
+                        "ridge_weight": ridge_weight, "cv_mae": round(cv_mae, 4),
+                    }
+                    trials.append(trial)
+                    results.append(trial)
+                    if progress:
+                        progress(trial)
+                if pending and time.monotonic() >= deadline:
+                    for future in pending:
+                        future.cancel()
+                    completed = False
+                    break
+            if completed or not ranked:
+                # A rung cut short only holds the configurations that finished
+                # first, which favours the cheapest ones; rank it only when no
+                # rung finished at all
+                ranked = results
+            if not completed or not results:
+                break
+            results.sort(key=lambda t: t["cv_mae"])
+            survivors = [t["params"] for t in results]
+    finally:
+        if not completed:
+            _terminate_workers(pool)
+        pool.shutdown(wait=completed, cancel_futures=True)
+
+    if not trials:
+        raise ValueError(f"No trial finished within the {budget_s}s budget")
+    best = min(ranked, key=lambda t: t["cv_mae"])
+    return {
+        "estimator": estimator,
+        "best": {
+            "params": {**best["params"], resource_param: max_resource},
+            "rung_resource": best["resource"],
+            "ridge_weight": best["ridge_weight"],
+            "cv_mae": best["cv_mae"],
+        },
+        "trials": trials,
+        "elapsed_s": round(time.monotonic() - start, 1),
+        "budget_s": budget_s,
+        "completed": completed,
+    }
+
+
+def _ridge_candidate():
+    from analytics.models import PointProjector
+    return PointProjector._make_ridge()
@@ -0,0 +1,121 @@
+"""Time-series cross-validation for the point projection model.
+
+Training rows are player-weeks, so randomly shuffled folds let a model learn
+from weeks that come after the ones it is scored on. Folds here are grouped
+by (season, week) and use an expanding window: every fold trains on all
+weeks before a cutoff and tests on the block of weeks that follows.
+
+Fold matrices (per-fold scaled train/test splits) are built once and shared
+by every candidate model, and all (candidate, fold) fits, plus any final
+fits on the full data, run together in one thread pool. sklearn's fit
+routines release the GIL, and threads share the fold matrices without
+copying them.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.preprocessing import StandardScaler
+
+
+def time_groups(metadata):
+    """Sortable (season, week) key per training row, from ``build_training_data`` metadata."""
+    return np.array([m["season"] * 100 + m["week"] for m in metadata], dtype=np.int64)
+
+
+def time_series_folds(groups, n_splits=5):
+    """Expanding-window folds over time groups.
+
+    The distinct groups are split into ``n_splits + 1`` contiguous blocks of
+    weeks; fold ``i`` trains on blocks ``0..i`` and tests on block ``i + 1``.
+
+    Args:
+        groups: time key per row (see ``time_groups``)
+        n_splits: number of folds (fewer if there are not enough weeks)
+
+    Returns:
+        List of (train_indices, test_indices) arrays
+    """
+    groups = np.asarray(groups)
+    keys = np.unique(groups)
+    n_splits = min(n_splits, len(keys) - 1)
+    if n_splits < 1:
+        return []
+    blocks = np.array_split(keys, n_splits + 1)
+    folds = []
+    for block in blocks[1:]:
+        test = (groups >= block[0]) & (groups <= block[-1])
+        folds.append((np.flatnonzero(groups < block[0]), np.flatnonzero(test)))
+    return folds
+
+
+class FoldMatrices:
+    """Train/test matrices of one fold, scaled with a scaler fit on the train rows only."""
+
+    def __init__(self, X_train, y_train, X_test, y_test):
+        self.X_train = X_train
+        self.y_train = y_train
+        self.X_test = X_test
+        self.y_test = y_test
+
+
+def build_fold_matrices(X, y, folds):
+    """Materialize the scaled matrices of every fold once."""
+    matrices = []
+    for train, test in folds:
+        scaler = StandardScaler()
+        matrices.append(FoldMatrices(
+            scaler.fit_transform(X[train]), y[train], scaler.transform(X[test]), y[test],
+        ))
+    return matrices
+
+
+def _fit_predict(estimator, fold):
+    return estimator.fit(fold.X_train, fold.y_train).predict(fold.X_test)
+
+
+def _fit(estimator, X, y):
+    return estimator.fit(X, y)
+
+
+def cross_validate(candidates, fold_matrices, max_workers=1, final=None):
+    """Fit every candidate on every fold, plus optional final fits, in one pool.
+
+    Args:
+        candidates: dict of name -> unfitted estimator (cloned per fold)
+        fold_matrices: list of ``FoldMatrices``
+        max_workers: number of threads (1 = serial)
+        final: optional dict of name -> (estimator, X, y) to fit on full data
+            alongside the folds
+
+    Returns:
+        (dict of name -> list of out-of-fold predictions per fold,
+         dict of name -> fitted final estimator)
+    """
+    final = final or {}
+    # Clone before any fit starts; final fits may reuse the candidate objects
+    fold_estimators = {
+        name: [clone(estimator) for _ in fold_matrices] for name, estimator in candidates.items()
+    }
+    with ThreadPoolExecutor(max_workers=max(1, max_workers or 1)) as pool:
+        final_futures = {
+            name: pool.submit(_fit, estimator, X, y) for name, (estimator, X, y) in final.items()
+        }
+        fold_futures = {
+            name: [pool.submit(_fit_predict, est, fold) for est, fold in zip(ests, fold_matrices)]
+            for name, ests in fold_estimators.items()
+        }
+        predictions = {
+            name: [future.result() for future in futures] for name, futures in fold_futures.items()
+        }
+        fitted = {name: future.result() for name, future in final_futures.items()}
+    return predictions, fitted
+
+
+def fold_mae(fold_predictions, fold_matrices):
+    """Mean absolute error over all out-of-fold predictions."""
+    errors = np.concatenate([
+        np.abs(fold.y_test - pred) for pred, fold in zip(fold_predictions, fold_matrices)
+    ])
+    return float(np.mean(errors))
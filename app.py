@@ -302,38 +302,157 @@ def team_analytics(league_id, team_id):
     )
 
 
+def _box_lineup(lineup):
+    """ESPN box score players as dicts for ``analytics.league_sim.project_lineup``."""
+    return [
+        {
+            "name": p.name,
+            "position": p.position,
+            "slot": p.slot_position,
+            "pro_team": p.proTeam,
+            "espn_projection": p.projected_points,
+        }
+        for p in lineup
+    ]
+
+
+@app.route("/leagues/<league_id>/team/<int:team_id>/matchup")
+@login_required
+def matchup(league_id, team_id):
+    league_doc = _get_user_league(league_id)
+    espn_league = get_espn_league(league_doc)
+    season = league_doc["espn_year"]
+    week = request.args.get("week", type=int) or espn_league.current_week
+    box = next(
+        (
+            b for b in espn_league.box_scores(week)
+            if team_id in (getattr(b.home_team, "team_id", None), getattr(b.away_team, "team_id", None))
+        ),
+        None,
+    )
+    if box is None or not box.home_team or not box.away_team:
+        abort(404)
+
+    from analytics.league_sim import (
+        TEAMMATE_CORRELATION, project_lineup, simulate_matchup,
+    )
+    db = _get_db()
+    model = _get_projection_model()
+    home = project_lineup(db, _box_lineup(box.home_lineup), season, week, model=model)
+    away = project_lineup(db, _box_lineup(box.away_lineup), season, week, model=model)
+    stacked = request.args.get("stacks") == "1"
+    simulation = simulate_matchup(
+        home, away, correlation=TEAMMATE_CORRELATION if stacked else 0.0,
+    )
+    return render_template(
+        "matchup.html",
+        league_doc=league_doc, week=week, team_id=team_id, stacked=stacked,
+        home_team=box.home_team, away_team=box.away_team,
+        home=home, away=away, simulation=simulation, display_slot=display_slot,
+    )
+
+
+def _roster_lineup(roster):
+    """ESPN roster players as lineup dicts, using ESPN's per-game projection."""
+    return [
+        {
+            "name": p.name,
+            "position": p.position,
+            "slot": p.lineupSlot,
+            "pro_team": p.proTeam,
+            "espn_projection": getattr(p, "projected_avg_points", None) or p.avg_points,
+        }
+        for p in roster
+    ]
+
+
+def _remaining_games(espn_league):
+    """Undecided regular-season games as (team_id, team_id) pairs, each listed once."""
+    last_week = espn_league.settings.reg_season_count
+    games = []
+    for team in espn_league.teams:
+        for week, (opponent, outcome) in enumerate(zip(team.schedule, team.outcomes), start=1):
+            if week <= last_week and outcome == "U" and team.team_id < opponent.team_id:
+                games.append((team.team_id, opponent.team_id))
+    return games
+
+
+@app.route("/leagues/<league_id>/playoff-odds")
+@login_required
+def playoff_odds(league_id):
+    league_doc = _get_user_league(league_id)
+    espn_league = get_espn_league(league_doc)
+    season = league_doc["espn_year"]
+    week = espn_league.current_week
+    db = _get_db()
+
+    from analytics.league_sim import (
+        cache_playoff_odds, get_cached_playoff_odds, project_teams, simulate_season,
+    )
+    odds = get_cached_playoff_odds(db, league_doc["espn_league_id"], season, week)
+    if odds is None:
+        distributions = project_teams(
+            db, {t.team_id: _roster_lineup(t.roster) for t in espn_league.teams},
+            season, week, model=_get_projection_model(),
+        )
+        teams = [
+            {
+                "team_id": t.team_id,
+                "team_name": t.team_name,
+                "logo_url": t.logo_url,
+                "record": f"{t.wins}-{t.losses}" + (f"-{t.ties}" if t.ties else ""),
+                "wins": t.wins + t.ties / 2,
+                "points_for": t.points_for,
+                "mean": round(distributions[t.team_id][0], 1),
+                "std": round(distributions[t.team_id][1], 1),
+            }
+            for t in espn_league.teams
+        ]
+        odds = simulate_season(
+            teams, _remaining_games(espn_league), espn_league.settings.playoff_team_count,
+            max_workers=int(os.environ.get("PLAYOFF_SIM_WORKERS", "1")),
+        )
+        cache_playoff_odds(db, league_doc["espn_league_id"], season, week, odds)
+
+    return render_template("playoff_odds.html", league_doc=league_doc, week=week, odds=odds)
+
+
 # --- Projection helpers ---
 
 
+def _get_model_registry():
+    """Per-process model registry; picks up newly trained versions without a restart."""
+    if not hasattr(app, "_model_registry"):
+        from analytics.registry import ModelRegistry
+        app._model_registry = ModelRegistry(
+            _get_db(),
+            os.path.join(os.path.dirname(__file__), "models"),
+            check_interval=int(os.environ.get("MODEL_CHECK_INTERVAL", "60")),
+        )
+    return app._model_registry
+
+
 def _get_projection_model():
-    """Lazy-load the PointProjector model from disk."""
-    if not hasattr(app, "_projection_model"):
-        model_path = os.path.join(os.path.dirname(__file__), "models", "point_projector.pkl")
-        if os.path.exists(model_path):
-            from analytics.models import PointProjector
-            model = PointProjector()
-            model.load(model_path)
-            app._projection_model = model
-        else:
-            app._projection_model = None
-    return app._projection_model
+    """Current PointProjector from the model registry, or None."""
+    return _get_model_registry().get("point_projector")
 
 
 def _get_player_clusterer(position):
-    """Lazy-load the PlayerClusterer for a given position."""
-    attr = f"_clusterer_{position.lower()}"
-    if not hasattr(app, attr):
-        model_path = os.path.join(
-            os.path.dirname(__file__), "models", f"clusterer_{position.lower()}.pkl"
-        )
-        if os.path.exists(model_path):
-            from analytics.models import PlayerClusterer
-            clusterer = PlayerClusterer()
-            clusterer.load(model_path)
-            setattr(app, attr, clusterer)
-        else:
-            setattr(app, attr, None)
-    return getattr(app, attr)
+    """Current PlayerClusterer for a given position, or None.
+
+    Comes from the ``clusterers`` bundle, or from the per-position models
+    published before clusterers were bundled.
+    """
+    registry = _get_model_registry()
+    bundle = registry.get("clusterers")
+    if bundle is not None:
+        return bundle.get(position)
+    return registry.get(f"clusterer_{position.lower()}")
+
+
+def _get_similarity_index():
+    """Current cross-season SimilarityIndex, or None."""
+    return _get_model_registry().get("similarity_index")
 
 
 def _get_current_week(db, season):
@@ -387,7 +506,8 @@ def player_projection(league_id, player_id):
             db, player_id, season, current_week, model=model
         )
         simulation = run_monte_carlo_simulation(
-            db, player_id, season, current_week, model=model
+            db, player_id, season, current_week, model=model, remaining=remaining,
+            n_simulations=request.args.get("sims", type=int),
         )
 
         # Build chart data
@@ -475,6 +595,34 @@ def api_projection(player_id):
     return jsonify(result)
 
 
+@app.route("/api/similar/<player_id>")
+@login_required
+def api_similar_players(player_id):
+    season = request.args.get("season", type=int)
+    k = request.args.get("k", 10, type=int)
+    seasons = request.args.get("seasons")
+
+    if not season:
+        return jsonify({"error": "season parameter required"}), 400
+    if not 1 <= k <= 100:
+        return jsonify({"error": "k must be between 1 and 100"}), 400
+    if seasons:
+        try:
+            seasons = [int(s) for s in seasons.split(",")]
+        except ValueError:
+            return jsonify({"error": "seasons must be comma-separated years"}), 400
+
+    index = _get_similarity_index()
+    if not index:
+        return jsonify({"error": "No similarity index available"}), 404
+
+    similar = index.query(player_id, season, k=k, seasons=seasons or None)
+    if similar is None:
+        return jsonify({"error": "No profile for this player and season"}), 404
+
+    return jsonify({"player_id": player_id, "season": season, "similar": similar})
+
+
 if __name__ == "__main__":
     port = int(os.environ.get("FLASK_RUN_PORT", 8000))
     app.run(host="0.0.0.0", port=port, debug=True)
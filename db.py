@@ -2,12 +2,27 @@
 
 import os
 from datetime import datetime, timezone
+from urllib.parse import quote_plus
 
 from bson import ObjectId
 from pymongo import MongoClient
 from werkzeug.security import check_password_hash, generate_password_hash
 
 
+def build_uri():
+    """Build MongoDB URI from env vars, falling back to credentials if needed."""
+    uri = os.environ.get("MONGODB_URI")
+    if not uri:
+        username = os.environ.get("MONGO_USERNAME")
+        password = os.environ.get("MONGO_PASSWORD")
+        if username and password:
+            uri = (
+                f"mongodb://{quote_plus(username)}:{quote_plus(password)}"
+                f"@localhost:27017/fantasy_football?authSource=admin"
+            )
+    return uri
+
+
 def get_db(uri=None, **client_kwargs):
     """Get a MongoDB database connection with small timeouts for dev."""
     uri = uri or os.environ.get("MONGODB_URI", "mongodb://localhost:27017/fantasy_football")
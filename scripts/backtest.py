@@ -0,0 +1,90 @@
+"""CLI script to backtest the point projection model week by week."""
+
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+load_dotenv()
+
+from analytics.backtest import format_backtest, get_backtests, run_backtest, save_backtest
+from analytics.models import load_projector
+from analytics.registry import get_published_version
+from db import build_uri, get_db
+
+
+def _print_progress(week, completed, total):
+    print(f"  Scored week {week} ({completed}/{total})")
+
+
+def _print_comparison(db, season):
+    runs = get_backtests(db, season)
+    if not runs:
+        print(f"No stored backtests for season {season}")
+        return
+    print(f"{'version':<24} {'estimator':<9} {'MAE':>7} {'RMSE':>7} {'coverage':>9}  run at")
+    for run in runs:
+        overall = run["overall"]
+        print(f"{run.get('model_version') or '-':<24} {run.get('estimator') or '-':<9} "
+              f"{overall['mae']:7.3f} {overall['rmse']:7.3f} {overall['coverage']:9.1%}  "
+              f"{run['run_at']:%Y-%m-%d %H:%M}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the point projector")
+    parser.add_argument("--season", type=int, required=True, help="NFL season to replay")
+    parser.add_argument(
+        "--model",
+        default=None,
+        help="Artifact directory or pickle to test (default: latest published version)",
+    )
+    parser.add_argument("--models-dir", default="models", help="Models directory (default: models/)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes, one week each (default: CPU count)",
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="List stored backtest results for the season instead of running one",
+    )
+    args = parser.parse_args()
+
+    uri = build_uri()
+    db = get_db(uri=uri)
+    if args.compare:
+        _print_comparison(db, args.season)
+        return
+
+    version = None
+    model_path = args.model
+    if model_path is None:
+        published = get_published_version(db, "point_projector")
+        if published:
+            version, artifact_path = published
+            model_path = os.path.join(args.models_dir, artifact_path)
+        else:
+            model_path = os.path.join(args.models_dir, "point_projector.pkl")
+
+    model = load_projector(model_path)
+    print(f"Backtesting {model_path} on season {args.season}...")
+    summary = run_backtest(
+        db, model, args.season, max_workers=args.workers, uri=uri, model_path=model_path,
+        progress=_print_progress,
+    )
+    if summary is None:
+        print(f"  No data found for season {args.season}")
+        return
+    for line in format_backtest(summary):
+        print(line)
+    save_backtest(db, summary, model_version=version, estimator=model.estimator)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark PointProjector tree-model estimators on a hold-out season."""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+load_dotenv()
+
+from analytics.models import ESTIMATORS, PointProjector
+from analytics.validation import time_groups
+from db import get_db
+
+
+def _latency(fn, repeats):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def benchmark(db, seasons, evaluate_on, estimators=ESTIMATORS, repeats=20):
+    """Fit each estimator on ``seasons`` and score it on ``evaluate_on``.
+
+    Features are loaded once, so ``fit_s`` times model fitting (including
+    cross-validation) only.
+
+    Returns:
+        List of dicts with estimator, fit_s, predict_1_ms, predict_all_ms,
+        mae, rmse and coverage (share of actuals inside the interval)
+    """
+    X, y, metadata = PointProjector().build_training_data(db, seasons, use_store=True)
+    groups = time_groups(metadata)
+    X_eval, y_eval, _ = PointProjector().build_training_data(db, [evaluate_on], use_store=True)
+    if len(X_eval) == 0:
+        raise ValueError(f"No evaluation data found for season {evaluate_on}")
+
+    results = []
+    for estimator in estimators:
+        projector = PointProjector(estimator=estimator)
+        start = time.perf_counter()
+        projector.fit(X, y, groups=groups)
+        fit_s = time.perf_counter() - start
+
+        projected, low, high = projector._project_rows(X_eval)
+        errors = y_eval - projected
+        results.append({
+            "estimator": estimator,
+            "fit_s": fit_s,
+            "predict_1_ms": _latency(lambda: projector._project_rows(X_eval[:1]), repeats) * 1000,
+            "predict_all_ms": _latency(lambda: projector._project_rows(X_eval), repeats) * 1000,
+            "mae": float(np.mean(np.abs(errors))),
+            "rmse": float(np.sqrt(np.mean(errors ** 2))),
+            "coverage": float(np.mean((y_eval >= low) & (y_eval <= high))),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare PointProjector estimators")
+    parser.add_argument(
+        "--seasons",
+        type=int,
+        nargs="+",
+        required=True,
+        help="NFL seasons to train on (e.g., --seasons 2022 2023)",
+    )
+    parser.add_argument(
+        "--evaluate-on",
+        type=int,
+        required=True,
+        help="Hold-out season to score on (e.g., --evaluate-on 2024)",
+    )
+    parser.add_argument("--estimators", nargs="+", choices=ESTIMATORS, default=list(ESTIMATORS))
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    db = get_db()
+    results = benchmark(db, args.seasons, args.evaluate_on, args.estimators, args.repeats)
+    print(f"{'estimator':<10} {'fit (s)':>8} {'1 row (ms)':>11} {'all rows (ms)':>14} "
+          f"{'MAE':>7} {'RMSE':>7} {'coverage':>9}")
+    for r in results:
+        print(f"{r['estimator']:<10} {r['fit_s']:8.2f} {r['predict_1_ms']:11.3f} "
+              f"{r['predict_all_ms']:14.2f} {r['mae']:7.3f} {r['rmse']:7.3f} {r['coverage']:9.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark sklearn vs. the NumPy array engine for PointProjector inference."""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from analytics.features import FEATURE_NAMES
+from analytics.models import PointProjector, load_projector
+
+
+def _synthetic_projector(n_samples, seed):
+    """Fit a PointProjector-shaped ensemble on random data."""
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import RidgeCV
+    from sklearn.preprocessing import StandardScaler
+    from analytics.inference import EnsembleArrays
+
+    rng = np.random.default_rng(seed)
+    X = rng.normal(10, 5, size=(n_samples, len(FEATURE_NAMES)))
+    y = X @ rng.uniform(0, 1, len(FEATURE_NAMES)) + rng.normal(0, 4, n_samples)
+
+    projector = PointProjector()
+    projector._scaler = StandardScaler()
+    X_scaled = projector._scaler.fit_transform(X)
+    projector._ridge = RidgeCV(alphas=[0.1, 1.0, 10.0, 100.0]).fit(X_scaled, y)
+    projector._rf = RandomForestRegressor(
+        n_estimators=100, max_depth=10, min_samples_leaf=5, random_state=42, n_jobs=-1,
+    ).fit(X_scaled, y)
+    projector._arrays = EnsembleArrays.from_estimators(
+        projector._scaler, projector._ridge, projector._rf,
+    )
+    projector._trained = True
+    return projector, X
+
+
+def _sklearn_project(projector, X):
+    """The ensemble evaluated through sklearn estimators."""
+    X_scaled = projector._scaler.transform(X)
+    ridge_pred = projector._ridge.predict(X_scaled)
+    rf_pred = projector._rf.predict(X_scaled)
+    projected = projector._ridge_weight * ridge_pred + projector._rf_weight * rf_pred
+    tree_preds = np.column_stack([tree.predict(X_scaled) for tree in projector._rf.estimators_])
+    tree_std = np.std(tree_preds, axis=1)
+    return projected, np.maximum(0, projected - 1.5 * tree_std), projected + 1.5 * tree_std
+
+
+def _time(fn, repeats):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PointProjector inference paths")
+    parser.add_argument(
+        "--model",
+        default=None,
+        help="Pickled random-forest PointProjector to benchmark (default: fit one on "
+             "synthetic data)",
+    )
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 1000])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.model:
+        projector = load_projector(args.model)
+        # The comparison needs the sklearn estimators, which only rf pickles keep
+        if type(projector) is not PointProjector or projector.estimator != "rf" \
+                or projector._rf is None:
+            parser.error(
+                f"{args.model} is not a pickled random-forest PointProjector; "
+                "artifact directories, hgb and positional models cannot be compared with sklearn"
+            )
+        rng = np.random.default_rng(0)
+        X = projector._scaler.inverse_transform(
+            rng.normal(size=(max(args.batch_sizes), len(FEATURE_NAMES)))
+        )
+    else:
+        projector, X = _synthetic_projector(max(max(args.batch_sizes), 5000), seed=0)
+
+    # Bit-for-bit comparison needs sklearn to accumulate trees in order
+    projector._rf.n_jobs = 1
+    for batch_size in args.batch_sizes:
+        batch = X[:batch_size]
+        expected = _sklearn_project(projector, batch)
+        actual = projector._project_rows(batch)
+        identical = all(np.array_equal(a, e) for a, e in zip(actual, expected))
+
+        sklearn_s = _time(lambda: _sklearn_project(projector, batch), args.repeats)
+        engine_s = _time(lambda: projector._project_rows(batch), args.repeats)
+        print(
+            f"batch={batch_size:>5}  sklearn={sklearn_s * 1000:8.2f} ms  "
+            f"engine={engine_s * 1000:8.2f} ms  speedup={sklearn_s / engine_s:6.1f}x  "
+            f"identical={identical}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""CLI script to convert pickled models into memory-mappable artifacts."""
+
+import argparse
+import glob
+import os
+import sys
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from analytics.artifacts import convert_pickle
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert model .pkl files into memory-mappable artifact directories"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="Pickle files to convert (default: every .pkl in --models-dir)",
+    )
+    parser.add_argument(
+        "--models-dir",
+        default="models",
+        help="Directory to scan when no paths are given (default: models/)",
+    )
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob(os.path.join(args.models_dir, "*.pkl")))
+    if not paths:
+        print("No model pickles found.")
+        return
+
+    for path in paths:
+        out_path = convert_pickle(path)
+        print(f"Converted {path} -> {out_path}/")
+
+
+if __name__ == "__main__":
+    main()
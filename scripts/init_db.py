@@ -55,6 +55,11 @@ def init_db(uri=None):
     )
     print("Created index on seasonal_stats.(season, position, fantasy_points_ppr)")
 
+    db.career_stats.create_index(
+        [("player_id", 1), ("season", 1)], unique=True
+    )
+    print("Created unique index on career_stats.(player_id, season)")
+
     db.weekly_stats.create_index(
         [("player_id", 1), ("season", 1), ("week", 1)], unique=True
     )
@@ -89,12 +94,40 @@ def init_db(uri=None):
     )
     print("Created index on projections.(season, week, position)")
 
+    # Feature store indexes
+    db.features.create_index(
+        [("player_id", 1), ("season", 1), ("week", 1), ("feature_set_version", 1)], unique=True
+    )
+    print("Created unique index on features.(player_id, season, week, feature_set_version)")
+
+    db.features.create_index(
+        [("season", 1), ("feature_set_version", 1), ("week", 1)]
+    )
+    print("Created index on features.(season, feature_set_version, week)")
+
     # Model metadata indexes
     db.model_metadata.create_index(
         [("model_name", 1), ("season", 1)]
     )
     print("Created index on model_metadata.(model_name, season)")
 
+    db.model_metadata.create_index(
+        [("model_name", 1), ("published_at", -1)]
+    )
+    print("Created index on model_metadata.(model_name, published_at)")
+
+    # Backtest results
+    db.backtests.create_index(
+        [("model_name", 1), ("season", 1), ("run_at", -1)]
+    )
+    print("Created index on backtests.(model_name, season, run_at)")
+
+    # Playoff odds cache
+    db.playoff_odds.create_index(
+        [("espn_league_id", 1), ("season", 1), ("week", 1)], unique=True
+    )
+    print("Created unique index on playoff_odds.(espn_league_id, season, week)")
+
     print("Database initialization complete.")
     return db
 
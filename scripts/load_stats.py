@@ -3,7 +3,6 @@
 import argparse
 import os
 import sys
-from urllib.parse import quote_plus
 
 from dotenv import load_dotenv
 
@@ -16,21 +15,48 @@ from analytics.data_pipeline import (
     ingest_seasonal_stats, ingest_weekly_stats,
     ingest_schedules, ingest_snap_counts,
 )
-from db import get_db
-
-
-def _build_uri():
-    """Build MongoDB URI from env vars, falling back to credentials if needed."""
-    uri = os.environ.get("MONGODB_URI")
-    if not uri:
-        username = os.environ.get("MONGO_USERNAME")
-        password = os.environ.get("MONGO_PASSWORD")
-        if username and password:
-            uri = (
-                f"mongodb://{quote_plus(username)}:{quote_plus(password)}"
-                f"@localhost:27017/fantasy_football?authSource=admin"
-            )
-    return uri
+from analytics.feature_store import update_feature_store
+from analytics.models import ClustererBundle
+from analytics.registry import new_version, prune_versions, publish_model, version_path
+from db import build_uri, get_db
+
+
+def update_clusters(db, years, models_dir, keep_versions=3):
+    """Update the clusterer bundle in place and publish it as a new version.
+
+    Only the season the clusterers were trained on is folded in; if it is
+    not among ``years`` (e.g. a backfill of older seasons) nothing changes.
+    """
+    bundle_path = os.path.join(models_dir, "clusterers.pkl")
+    if not os.path.exists(bundle_path):
+        print(f"Skipping cluster update: no {bundle_path} (run train_models.py first)")
+        return
+    bundle = ClustererBundle()
+    bundle.load(bundle_path)
+    season = bundle.season
+    if season is None:
+        print(f"Skipping cluster update: {bundle_path} has no training season (rerun train_models.py)")
+        return
+    if season not in years:
+        print(f"Skipping cluster update: clusterers were trained on {season}, not loaded here")
+        return
+    print(f"Updating player clusters for {season}...")
+    cluster_info = bundle.update(db, season)
+    for position, info in cluster_info.items():
+        sizes = ", ".join(f"{c['label']}: {c['n_players']}" for c in info.values())
+        print(f"  {position}: {sizes}")
+
+    version = new_version()
+    bundle.save(bundle_path)
+    bundle.export(os.path.join(models_dir, version_path("clusterers", version)))
+    publish_model(
+        db, "clusterers", season, version, incremental=True,
+        cluster_info={
+            position: {str(k): v for k, v in info.items()}
+            for position, info in cluster_info.items()
+        },
+    )
+    prune_versions(models_dir, "clusterers", keep=keep_versions)
 
 
 def main():
@@ -52,14 +78,36 @@ def main():
         action="store_true",
         help="Also load player snap count data",
     )
+    parser.add_argument(
+        "--features",
+        action="store_true",
+        help="Also append new weeks to the projection feature store",
+    )
+    parser.add_argument(
+        "--update-clusters",
+        action="store_true",
+        help="Also fold the latest season's stats into the trained player clusterers",
+    )
+    parser.add_argument(
+        "--models-dir",
+        default="models",
+        help="Directory holding trained models, for --update-clusters (default: models/)",
+    )
+    parser.add_argument(
+        "--keep-versions",
+        type=int,
+        default=3,
+        help="Exported clusterer versions to keep; older ones are deleted (default: 3)",
+    )
     parser.add_argument(
         "--all",
         action="store_true",
-        help="Load all data types (seasonal, weekly, schedules, snap counts)",
+        help="Load all data types (seasonal, weekly, schedules, snap counts, features) "
+             "and update clusters",
     )
     args = parser.parse_args()
 
-    db = get_db(uri=_build_uri())
+    db = get_db(uri=build_uri())
     years = args.years
 
     print(f"Loading stats for seasons: {years}")
@@ -82,6 +130,14 @@ def main():
         snap_count = ingest_snap_counts(db, years)
         print(f"  Snap counts: {snap_count} records upserted")
 
+    if args.features or args.all:
+        print("Updating feature store...")
+        feature_count = sum(update_feature_store(db, year) for year in years)
+        print(f"  Features: {feature_count} rows written")
+
+    if args.update_clusters or args.all:
+        update_clusters(db, years, args.models_dir, args.keep_versions)
+
     print("Done.")
 
 
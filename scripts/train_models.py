@@ -3,7 +3,6 @@
 import argparse
 import os
 import sys
-from urllib.parse import quote_plus
 
 from dotenv import load_dotenv
 
@@ -12,22 +11,24 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 load_dotenv()
 
-from analytics.models import PointProjector, PlayerClusterer
-from db import get_db
+from analytics.backtest import format_backtest, run_backtest, save_backtest
+from analytics.models import (
+    CLUSTER_POSITIONS, ESTIMATORS, ClustererBundle, PointProjector, PositionalProjector,
+)
+from analytics.registry import new_version, prune_versions, publish_model, version_path
+from analytics.similarity import SimilarityIndex
+from analytics.tuning import tune
+from analytics.validation import time_groups
+from db import build_uri, get_db
 
 
-def _build_uri():
-    """Build MongoDB URI from env vars, falling back to credentials if needed."""
-    uri = os.environ.get("MONGODB_URI")
-    if not uri:
-        username = os.environ.get("MONGO_USERNAME")
-        password = os.environ.get("MONGO_PASSWORD")
-        if username and password:
-            uri = (
-                f"mongodb://{quote_plus(username)}:{quote_plus(password)}"
-                f"@localhost:27017/fantasy_football?authSource=admin"
-            )
-    return uri
+def _print_progress(season, completed, total):
+    print(f"  Built features for {season} ({completed}/{total})")
+
+
+def _print_trial(trial):
+    print(f"    rung {trial['rung']} ({trial['resource']} trees): CV MAE {trial['cv_mae']} "
+          f"ridge_weight={trial['ridge_weight']} {trial['params']}")
 
 
 def main():
@@ -45,98 +46,184 @@ def main():
         default=None,
         help="Optional hold-out season for evaluation (e.g., --evaluate-on 2024)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for building training data, one season each (default: CPU count)",
+    )
+    parser.add_argument(
+        "--rebuild-features",
+        action="store_true",
+        help="Discard stored feature rows for the requested seasons and rebuild them",
+    )
+    parser.add_argument(
+        "--estimator",
+        choices=ESTIMATORS,
+        default="rf",
+        help="Tree model for the projector: rf (random forest) or hgb "
+             "(histogram gradient boosting, faster on large training sets; default: rf)",
+    )
+    parser.add_argument(
+        "--by-position",
+        action="store_true",
+        help="Train one projector per position (QB, RB, WR, TE), in parallel worker processes",
+    )
+    parser.add_argument(
+        "--tune",
+        action="store_true",
+        help="Search tree-model hyperparameters and the ridge blend weight before training",
+    )
+    parser.add_argument(
+        "--tune-budget",
+        type=int,
+        default=600,
+        help="Wall-clock budget for --tune in seconds (default: 600)",
+    )
+    parser.add_argument(
+        "--tune-candidates",
+        type=int,
+        default=27,
+        help="Random configurations in the first successive-halving rung (default: 27)",
+    )
     parser.add_argument(
         "--output-dir",
         default="models",
         help="Directory to save trained models (default: models/)",
     )
+    parser.add_argument(
+        "--keep-versions",
+        type=int,
+        default=3,
+        help="Exported versions to keep per model; older ones are deleted (default: 3)",
+    )
     args = parser.parse_args()
 
-    db = get_db(uri=_build_uri())
+    uri = build_uri()
+    db = get_db(uri=uri)
     output_dir = args.output_dir
     os.makedirs(output_dir, exist_ok=True)
 
+    if args.rebuild_features:
+        seasons = args.seasons + ([args.evaluate_on] if args.evaluate_on else [])
+        deleted = db["features"].delete_many({"season": {"$in": seasons}}).deleted_count
+        print(f"Discarded {deleted} stored feature rows")
+
     # Train PointProjector
-    print(f"Training PointProjector on seasons: {args.seasons}")
-    projector = PointProjector()
-    metrics = projector.train(db, args.seasons)
+    projector_class = PositionalProjector if args.by_position else PointProjector
+    print(f"Training {projector_class.__name__} ({args.estimator}) on seasons: {args.seasons}")
+    projector = projector_class(estimator=args.estimator)
+    X, y, metadata = projector.build_training_data(
+        db, args.seasons, max_workers=args.workers, uri=uri, progress=_print_progress,
+        use_store=True,
+    )
+    groups = time_groups(metadata)
+
+    tuning = None
+    if args.tune:
+        print(f"  Tuning ({args.tune_candidates} candidates, {args.tune_budget}s budget)...")
+        tuning = tune(
+            X, y, groups, estimator=args.estimator, n_candidates=args.tune_candidates,
+            budget_s=args.tune_budget, max_workers=args.workers, progress=_print_trial,
+        )
+        best = tuning["best"]
+        status = "done" if tuning["completed"] else "budget exhausted"
+        print(f"  Tuning {status} after {tuning['elapsed_s']}s, {len(tuning['trials'])} trials")
+        print(f"    Best: {best['params']} ridge_weight={best['ridge_weight']} "
+              f"CV MAE={best['cv_mae']} (scored with {best['rung_resource']} trees)")
+        projector = projector_class(
+            estimator=args.estimator, params=best["params"], ridge_weight=best["ridge_weight"],
+        )
+
+    metrics = projector.fit(
+        X, y, groups=groups, max_workers=args.workers,
+        positions=[m["position"] for m in metadata],
+    )
     print(f"  Training metrics:")
     print(f"    MAE: {metrics['mae']}")
     print(f"    RMSE: {metrics['rmse']}")
     print(f"    R2: {metrics['r2']}")
     print(f"    Samples: {metrics['n_samples']}")
-    print(f"    Ridge CV MAE: {metrics['ridge_cv_mae']}")
-    print(f"    RF CV MAE: {metrics['rf_cv_mae']}")
+    print(f"  Time-series CV ({metrics['cv_folds']} folds):")
+    print(f"    Ridge MAE: {metrics['ridge_cv_mae']}")
+    print(f"    {args.estimator.upper()} MAE: {metrics[f'{args.estimator}_cv_mae']}")
+    print(f"    Ensemble MAE: {metrics['ensemble_cv_mae']}")
+    for position, position_metrics in metrics.get("positions", {}).items():
+        print(f"    {position}: MAE {position_metrics['mae']}  "
+              f"CV MAE {position_metrics['ensemble_cv_mae']}  (n={position_metrics['n_samples']})")
     print(f"  Feature importances:")
     for feat, imp in sorted(metrics["feature_importances"].items(), key=lambda x: -x[1]):
         print(f"    {feat}: {imp}")
 
+    version = new_version()
     projector_path = os.path.join(output_dir, "point_projector.pkl")
     projector.save(projector_path)
-    print(f"  Saved to {projector_path}")
+    artifact_path = os.path.join(output_dir, version_path("point_projector", version))
+    projector.export(artifact_path)
+    print(f"  Saved to {projector_path} and {artifact_path}/")
 
-    # Evaluate on hold-out season if specified
+    # Walk-forward backtest on the hold-out season if specified
     if args.evaluate_on:
-        print(f"\nEvaluating on season {args.evaluate_on}...")
-        eval_projector = PointProjector()
-        eval_projector.load(projector_path)
-        X_eval, y_eval, meta_eval = eval_projector.build_training_data(db, [args.evaluate_on])
-        if len(X_eval) > 0:
-            import numpy as np
-            X_scaled = eval_projector._scaler.transform(X_eval)
-            ridge_pred = eval_projector._ridge.predict(X_scaled)
-            rf_pred = eval_projector._rf.predict(X_scaled)
-            ensemble_pred = eval_projector._ridge_weight * ridge_pred + eval_projector._rf_weight * rf_pred
-            errors = y_eval - ensemble_pred
-            eval_mae = float(np.mean(np.abs(errors)))
-            eval_rmse = float(np.sqrt(np.mean(errors ** 2)))
-            ss_res = np.sum(errors ** 2)
-            ss_tot = np.sum((y_eval - np.mean(y_eval)) ** 2)
-            eval_r2 = float(1 - ss_res / ss_tot) if ss_tot > 0 else 0.0
-            print(f"  Evaluation metrics ({args.evaluate_on}):")
-            print(f"    MAE: {eval_mae:.3f}")
-            print(f"    RMSE: {eval_rmse:.3f}")
-            print(f"    R2: {eval_r2:.4f}")
-            print(f"    Samples: {len(X_eval)}")
+        print(f"\nBacktesting on season {args.evaluate_on}...")
+        summary = run_backtest(
+            db, projector, args.evaluate_on, max_workers=args.workers, uri=uri,
+            model_path=artifact_path,
+        )
+        if summary:
+            for line in format_backtest(summary):
+                print(line)
+            save_backtest(db, summary, model_version=version, estimator=args.estimator)
         else:
             print(f"  No evaluation data found for season {args.evaluate_on}")
 
-    # Store model metadata in MongoDB
-    db["model_metadata"].update_one(
-        {"model_name": "point_projector", "season": max(args.seasons)},
-        {"$set": {
-            "model_name": "point_projector",
-            "season": max(args.seasons),
-            "training_seasons": args.seasons,
-            "metrics": metrics,
-        }},
-        upsert=True,
+    # Publish the new version; running app workers swap to it on their next check
+    publish_model(
+        db, "point_projector", max(args.seasons), version,
+        training_seasons=args.seasons, metrics=metrics, tuning=tuning,
+        by_position=args.by_position,
     )
-
-    # Train PlayerClusterer for each position
-    print("\nTraining PlayerClusterer for each position...")
-    for position in ["QB", "RB", "WR", "TE"]:
-        print(f"  Training clusterer for {position}...")
-        clusterer = PlayerClusterer()
-        try:
-            cluster_info = clusterer.train(db, max(args.seasons), position)
-            clusterer_path = os.path.join(output_dir, f"clusterer_{position.lower()}.pkl")
-            clusterer.save(clusterer_path)
-            print(f"    Saved to {clusterer_path}")
-            for cid, info in cluster_info.items():
-                print(f"    Cluster {cid}: {info['label']} ({info['n_players']} players)")
-
-            db["model_metadata"].update_one(
-                {"model_name": f"clusterer_{position.lower()}", "season": max(args.seasons)},
-                {"$set": {
-                    "model_name": f"clusterer_{position.lower()}",
-                    "season": max(args.seasons),
-                    "cluster_info": {str(k): v for k, v in cluster_info.items()},
-                }},
-                upsert=True,
-            )
-        except ValueError as e:
-            print(f"    Skipped: {e}")
+    prune_versions(output_dir, "point_projector", keep=args.keep_versions)
+
+    # Train every position's PlayerClusterer from one pass over the season
+    print("\nTraining PlayerClusterers (QB, RB, WR, TE)...")
+    bundle = ClustererBundle()
+    cluster_info, skipped = bundle.train(db, max(args.seasons), max_workers=args.workers)
+    for position in CLUSTER_POSITIONS:
+        if position in skipped:
+            print(f"  {position}: skipped: {skipped[position]}")
+            continue
+        print(f"  {position}:")
+        for cid, info in cluster_info[position].items():
+            print(f"    Cluster {cid}: {info['label']} ({info['n_players']} players)")
+
+    if bundle.clusterers:
+        bundle_path = os.path.join(output_dir, "clusterers.pkl")
+        bundle.save(bundle_path)
+        bundle.export(os.path.join(output_dir, version_path("clusterers", version)))
+        print(f"  Saved to {bundle_path}")
+        publish_model(
+            db, "clusterers", max(args.seasons), version,
+            cluster_info={
+                position: {str(k): v for k, v in info.items()}
+                for position, info in cluster_info.items()
+            },
+        )
+        prune_versions(output_dir, "clusterers", keep=args.keep_versions)
+
+    # Cross-season similarity index over every ingested season
+    print("\nBuilding cross-season similarity index...")
+    index = SimilarityIndex()
+    n_profiles = index.build(db)
+    if n_profiles:
+        index.export(os.path.join(output_dir, version_path("similarity_index", version)))
+        publish_model(
+            db, "similarity_index", max(args.seasons), version,
+            n_profiles=n_profiles, positions=index.positions,
+        )
+        prune_versions(output_dir, "similarity_index", keep=args.keep_versions)
+        print(f"  Indexed {n_profiles} player-season profiles")
+    else:
+        print("  Skipped: no player-season profiles")
 
     print("\nDone.")
 
@@ -174,6 +174,54 @@ function createDistributionChart(canvasId, histogramData, percentiles) {
     });
 }
 
+/**
+ * Create a histogram of simulated matchup margins, colored by winner.
+ *
+ * @param {string} canvasId - Canvas element ID
+ * @param {Array} histogramData - [{bin_start, bin_end, count}] of home minus away points
+ * @param {string} homeName - home team name
+ * @param {string} awayName - away team name
+ */
+function createMarginChart(canvasId, histogramData, homeName, awayName) {
+    const canvas = document.getElementById(canvasId);
+    if (!canvas) return null;
+
+    const labels = histogramData.map(d =>
+        d.bin_start.toFixed(0) + '-' + d.bin_end.toFixed(0)
+    );
+    const counts = histogramData.map(d => d.count);
+    const homeWins = histogramData.map(d => (d.bin_start + d.bin_end) / 2 >= 0);
+
+    return new Chart(canvas, {
+        type: 'bar',
+        data: {
+            labels: labels,
+            datasets: [{
+                label: 'Simulations',
+                data: counts,
+                backgroundColor: homeWins.map(w => w ? COLORS.lightGreen : COLORS.lightRed),
+                borderColor: homeWins.map(w => w ? COLORS.green : COLORS.red),
+                borderWidth: 1,
+            }],
+        },
+        options: {
+            responsive: true,
+            plugins: {
+                legend: { display: false },
+                title: {
+                    display: true,
+                    text: 'Margin of Victory (' + homeName + ' minus ' + awayName + ')',
+                    font: { size: 14, weight: 'bold' },
+                },
+            },
+            scales: {
+                x: { title: { display: true, text: 'Point Margin' } },
+                y: { title: { display: true, text: 'Simulations' }, beginAtZero: true },
+            },
+        },
+    });
+}
+
 /**
  * Create a radar chart comparing player profile to cluster average.
  *
@@ -8,6 +8,7 @@ from analytics.data_pipeline import (
     fetch_seasonal_data, fetch_weekly_data, ingest_seasonal_stats, ingest_weekly_stats,
     ingest_schedules, ingest_snap_counts,
 )
+from analytics.career_stats import build_career_stats, ensure_career_stats, get_career_avgs
 from analytics.basic_stats import (
     get_top_scorers, get_player_weekly_trend, get_positional_rankings,
     get_player_summary, get_position_averages, analyze_roster,
@@ -96,6 +97,18 @@ class TestDataPipeline:
             ingest_seasonal_stats(db, [2024])  # second call should upsert
         assert db["seasonal_stats"].count_documents({}) == 1
 
+    def test_ingest_seasonal_stats_builds_career_stats(self, db):
+        mock_df = pd.DataFrame({
+            "player_id": ["p1", "p1"],
+            "season": [2023, 2024],
+            "fantasy_points_ppr": [300.0, 250.0],
+            "games": [15, 10],
+        })
+        with patch("analytics.data_pipeline.fetch_seasonal_data", return_value=mock_df):
+            ingest_seasonal_stats(db, [2023, 2024])
+        assert get_career_avgs(db, ["p1"], 2024) == {"p1": 20.0}
+        assert get_career_avgs(db, ["p1"], 2025) == {"p1": 22.0}
+
     def test_ingest_seasonal_stats_empty(self, db):
         with patch("analytics.data_pipeline.fetch_seasonal_data", return_value=pd.DataFrame()):
             count = ingest_seasonal_stats(db, [2024])
@@ -309,3 +322,57 @@ class TestSchedulePipeline:
         with patch("analytics.data_pipeline.fetch_snap_count_data", return_value=pd.DataFrame()):
             count = ingest_snap_counts(db, [2024])
         assert count == 0
+
+
+# --- Career stats tests ---
+
+
+class TestCareerStats:
+    def _seed(self, db):
+        db["seasonal_stats"].insert_many([
+            {"player_id": "p1", "season": 2021, "fantasy_points_ppr": 100.0, "games": 10},
+            {"player_id": "p1", "season": 2023, "fantasy_points_ppr": 200.0, "games": 10},
+            {"player_id": "p1", "season": 2024, "fantasy_points_ppr": 300.0, "games": 0},
+            {"player_id": "p2", "season": 2024, "fantasy_points_ppr": 150.0, "games": 10},
+        ])
+
+    def test_totals_cover_prior_seasons_only(self, db):
+        self._seed(db)
+        assert build_career_stats(db) == 5
+        docs = {
+            doc["season"]: doc
+            for doc in db["career_stats"].find({"player_id": "p1"}, {"_id": 0})
+        }
+        assert sorted(docs) == [2022, 2023, 2024, 2025]
+        assert docs[2022]["career_points"] == 100.0
+        assert docs[2023]["career_games"] == 10  # gap season carries totals forward
+        assert docs[2024]["career_points"] == 300.0
+        assert docs[2025]["career_seasons"] == 3
+
+    def test_lookup_is_point_in_time(self, db):
+        self._seed(db)
+        build_career_stats(db)
+        assert get_career_avgs(db, ["p1", "p2"], 2024) == {"p1": 15.0}
+        assert get_career_avgs(db, ["p1", "p2"], 2025) == {"p1": 30.0, "p2": 15.0}
+        assert get_career_avgs(db, ["p1"], 2021) == {}
+
+    def test_rebuild_for_selected_players(self, db):
+        self._seed(db)
+        build_career_stats(db, ["p2"])
+        assert db["career_stats"].distinct("player_id") == ["p2"]
+        db["seasonal_stats"].insert_one(
+            {"player_id": "p2", "season": 2025, "fantasy_points_ppr": 50.0, "games": 10},
+        )
+        build_career_stats(db, ["p2"])
+        assert get_career_avgs(db, ["p2"], 2026) == {"p2": 10.0}
+
+    def test_existing_database_is_backfilled_on_lookup(self, db):
+        # Seasonal stats ingested before career_stats existed
+        self._seed(db)
+        assert get_career_avgs(db, ["p1", "p2"], 2025) == {"p1": 30.0, "p2": 15.0}
+        assert db["career_stats"].count_documents({}) == 5
+        assert ensure_career_stats(db) == 0
+
+    def test_no_backfill_without_seasonal_stats(self, db):
+        assert ensure_career_stats(db) == 0
+        assert get_career_avgs(db, ["p1"], 2025) == {}
@@ -715,6 +715,98 @@ class TestTeamAnalyticsRoute:
         assert response.status_code == 404
 
 
+class TestMatchupRoute:
+    def _league(self, week=3):
+        def box_player(name, slot, proTeam, projected_points, position="WR"):
+            return SimpleNamespace(name=name, position=position, slot_position=slot,
+                                   proTeam=proTeam, projected_points=projected_points)
+        home = make_team(team_id=1, team_name="Home Team")
+        away = make_team(team_id=2, team_name="Away Team")
+        box = SimpleNamespace(
+            home_team=home, away_team=away,
+            home_lineup=[box_player("Patrick Mahomes", "QB", "KC", 22.0, "QB"),
+                         box_player("Bench Guy", "BE", "KC", 30.0)],
+            away_lineup=[box_player("Other Star", "WR", "BUF", 15.0)],
+        )
+        league = SimpleNamespace(teams=[home, away], current_week=week)
+        league.box_scores = MagicMock(return_value=[box])
+        return league
+
+    def test_matchup_page_renders(self, logged_in_with_league, mock_db):
+        client, league = logged_in_with_league
+        mock_db["seasonal_stats"].insert_one({
+            "player_id": "p1", "player_name": "Patrick Mahomes", "position": "QB",
+            "recent_team": "KC", "season": 2024, "fantasy_points_ppr": 350.0, "games": 17,
+        })
+        mock_db["projections"].insert_one({
+            "player_id": "p1", "season": 2024, "week": 3,
+            "projected_points": 22.5, "confidence_low": 15.0, "confidence_high": 30.0,
+        })
+        espn = self._league()
+        with patch("app.get_espn_league", return_value=espn), \
+             patch("app._get_projection_model", return_value=None):
+            response = client.get(f"/leagues/{league['_id']}/team/2/matchup?stacks=1")
+        assert response.status_code == 200
+        espn.box_scores.assert_called_once_with(3)
+        html = response.data.decode()
+        assert "Home Team vs Away Team" in html
+        assert "Patrick Mahomes" in html
+        assert "Bench Guy" not in html
+        # Model projection 22.5 (15-30) against a fixed ESPN 15.0
+        assert "100.0%" in html
+        assert "teammates correlated" in html
+
+    def test_matchup_unknown_team_404(self, logged_in_with_league):
+        client, league = logged_in_with_league
+        with patch("app.get_espn_league", return_value=self._league()):
+            response = client.get(f"/leagues/{league['_id']}/team/9/matchup?week=5")
+        assert response.status_code == 404
+
+
+class TestPlayoffOddsRoute:
+    def _league(self):
+        roster = [make_player(name="Patrick Mahomes", lineupSlot="QB", projected_avg_points=21.0),
+                  make_player(name="Bench Guy", lineupSlot="BE", projected_avg_points=30.0)]
+        teams = [
+            make_team(team_id=1, team_name="Leader", wins=9, losses=3, roster=roster),
+            make_team(team_id=2, team_name="Middle", wins=6, losses=6, roster=[]),
+            make_team(team_id=3, team_name="Trailer", wins=3, losses=9, roster=[]),
+            make_team(team_id=4, team_name="Fourth", wins=6, losses=6, roster=[]),
+        ]
+        # Week 1 played, weeks 2-3 left; week 4 is the playoffs
+        opponents = {1: [2, 3, 4, 2], 2: [1, 4, 3, 1], 3: [4, 1, 2, 4], 4: [3, 2, 1, 3]}
+        by_id = {t.team_id: t for t in teams}
+        for team in teams:
+            team.schedule = [by_id[o] for o in opponents[team.team_id]]
+            team.outcomes = ["W", "U", "U", "U"]
+        return SimpleNamespace(
+            teams=teams, current_week=2,
+            settings=SimpleNamespace(reg_season_count=3, playoff_team_count=2),
+        )
+
+    def test_playoff_odds_page_renders_and_caches(self, logged_in_with_league, mock_db):
+        client, league = logged_in_with_league
+        espn = self._league()
+        with patch("app.get_espn_league", return_value=espn), \
+             patch("app._get_projection_model", return_value=None):
+            response = client.get(f"/leagues/{league['_id']}/playoff-odds")
+            assert response.status_code == 200
+            html = response.data.decode()
+            assert "Playoff Odds" in html
+            assert "Leader" in html and "Trailer" in html
+            cached = mock_db["playoff_odds"].find_one({"espn_league_id": 12345, "season": 2024, "week": 2})
+            assert cached["playoff_teams"] == 2
+            teams = {t["team_id"]: t for t in cached["teams"]}
+            assert teams[1]["mean"] == 21.0
+            assert teams[1]["playoff_pct"] > teams[3]["playoff_pct"]
+
+            with patch("analytics.league_sim.simulate_season") as simulate:
+                again = client.get(f"/leagues/{league['_id']}/playoff-odds")
+            assert again.status_code == 200
+            simulate.assert_not_called()
+            assert again.data == response.data
+
+
 class TestPlayerProjectionRoute:
     def _seed_player_data(self, mock_db):
         """Seed the player data needed for projection routes."""
@@ -845,3 +937,46 @@ class TestPlayerProjectionRoute:
         response = client.get("/api/projection/p1?season=2024&week=7&risk=medium")
         assert response.status_code == 302
         assert "login" in response.headers["Location"]
+
+
+class TestSimilarPlayersAPI:
+    def _mock_index(self):
+        def query(player_id, season, k=10, seasons=None):
+            if player_id != "p1":
+                return None
+            rows = [
+                {"player_id": "p9", "player_name": "Old Star", "season": 2021,
+                 "avg_points": 21.0, "distance": 0.4},
+                {"player_id": "p1", "player_name": "Patrick Mahomes", "season": 2023,
+                 "avg_points": 22.5, "distance": 0.6},
+            ]
+            return [r for r in rows if seasons is None or r["season"] in seasons][:k]
+        return SimpleNamespace(query=query)
+
+    def test_returns_neighbours(self, logged_in_with_league):
+        client, league = logged_in_with_league
+        with patch("app._get_similarity_index", return_value=self._mock_index()):
+            response = client.get("/api/similar/p1?season=2024&k=5&seasons=2021,2022")
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["season"] == 2024
+        assert [p["player_id"] for p in data["similar"]] == ["p9"]
+
+    def test_unknown_player_404(self, logged_in_with_league):
+        client, league = logged_in_with_league
+        with patch("app._get_similarity_index", return_value=self._mock_index()):
+            response = client.get("/api/similar/nobody?season=2024")
+        assert response.status_code == 404
+
+    def test_no_index_404(self, logged_in_with_league):
+        client, league = logged_in_with_league
+        with patch("app._get_similarity_index", return_value=None):
+            response = client.get("/api/similar/p1?season=2024")
+        assert response.status_code == 404
+
+    def test_bad_parameters_400(self, logged_in_with_league):
+        client, league = logged_in_with_league
+        with patch("app._get_similarity_index", return_value=self._mock_index()):
+            assert client.get("/api/similar/p1").status_code == 400
+            assert client.get("/api/similar/p1?season=2024&k=0").status_code == 400
+            assert client.get("/api/similar/p1?season=2024&seasons=x").status_code == 400
@@ -2,15 +2,40 @@
 
 import os
 import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import mongomock
 import numpy as np
 import pytest
 
-from analytics.models import PointProjector, PlayerClusterer, FEATURE_NAMES
+from analytics import tuning
+from analytics.artifacts import convert_pickle, is_artifact, read_artifact
+from analytics.backtest import backtest_week, get_backtests, run_backtest, save_backtest
+from analytics.career_stats import build_career_stats
+from analytics.feature_store import (
+    get_stored_features, load_training_frame, purge_stale_features, update_feature_store,
+)
+from analytics.features import FEATURE_SET_VERSION, build_feature_frame, build_feature_frames
+from analytics.league_sim import (
+    bye_count, cache_playoff_odds, get_cached_playoff_odds, project_lineup, project_teams,
+    simulate_matchup, simulate_season, simulate_team_scores, team_score_distribution,
+)
+from analytics.models import (
+    CLUSTER_FEATURE_NAMES, FEATURE_NAMES, ClustererBundle, PlayerClusterer, PointProjector, PositionalProjector,
+    load_projector,
+)
 from analytics.projections import (
     get_player_projection, get_remaining_season_projection,
-    run_monte_carlo_simulation, batch_project_players,
+    run_monte_carlo_simulation, batch_project_players, MAX_SIMULATIONS,
+)
+from analytics.registry import (
+    ModelRegistry, new_version, prune_versions, publish_model, version_path,
+)
+from analytics.similarity import SimilarityIndex
+from analytics.tuning import BLEND_WEIGHTS, halving_schedule, sample_candidates, tune
+from analytics.validation import (
+    build_fold_matrices, cross_validate, time_groups, time_series_folds,
 )
 from analytics.matchup_stats import (
     compute_defensive_rankings, get_upcoming_opponent, get_matchup_difficulty,
@@ -94,6 +119,8 @@ def _seed_training_data(db, seasons=None, n_players=6, weeks_per_season=10):
                     upsert=True,
                 )
 
+    build_career_stats(db)
+
 
 @pytest.fixture
 def db_with_training_data(db):
@@ -108,6 +135,20 @@ def trained_projector(db_with_training_data):
     return projector
 
 
+@pytest.fixture
+def trained_hgb_projector(db_with_training_data):
+    projector = PointProjector(estimator="hgb")
+    projector.train(db_with_training_data, [2023, 2024])
+    return projector
+
+
+@pytest.fixture
+def trained_positional_projector(db_with_training_data):
+    projector = PositionalProjector(min_samples=10)
+    projector.train(db_with_training_data, [2023, 2024])
+    return projector
+
+
 @pytest.fixture
 def trained_clusterer(db_with_training_data):
     clusterer = PlayerClusterer(n_clusters=2)
@@ -169,6 +210,99 @@ class TestPointProjector:
         with pytest.raises(RuntimeError, match="not trained"):
             projector.predict(db_with_training_data, "p1", 2024, 5)
 
+    def test_predict_many_matches_predict(self, db_with_training_data, trained_projector):
+        player_ids = ["p3", "nonexistent", "p1", "p6", "p1"]
+        results = trained_projector.predict_many(db_with_training_data, player_ids, 2024, 8)
+        assert len(results) == len(player_ids)
+        assert results[1] is None
+        for player_id, result in zip(player_ids, results):
+            assert result == trained_projector.predict(db_with_training_data, player_id, 2024, 8)
+
+    def test_predict_many_upcoming_week(self, db_with_training_data, trained_projector):
+        results = trained_projector.predict_many(db_with_training_data, ["p1", "p2"], 2024, 11)
+        assert all(r is not None for r in results)
+        assert results[0] == trained_projector.predict(db_with_training_data, "p1", 2024, 11)
+
+    def test_tree_predictions_match_estimators(self, db_with_training_data, trained_projector):
+        X, _, _ = trained_projector.build_training_data(db_with_training_data, [2024])
+        X_scaled = trained_projector._scaler.transform(X)
+        expected = np.column_stack([tree.predict(X_scaled) for tree in trained_projector._rf.estimators_])
+        np.testing.assert_array_equal(trained_projector._tree_predictions(X_scaled), expected)
+
+    @pytest.mark.parametrize("batch_size", [1, 50])
+    def test_array_engine_matches_sklearn_bit_for_bit(
+        self, db_with_training_data, trained_projector, batch_size,
+    ):
+        X, _, _ = trained_projector.build_training_data(db_with_training_data, [2024])
+        X = X[:batch_size]
+        arrays = trained_projector._arrays
+        trained_projector._rf.n_jobs = 1
+
+        X_scaled = trained_projector._scaler.transform(X)
+        np.testing.assert_array_equal(arrays.transform(X), X_scaled)
+        np.testing.assert_array_equal(
+            arrays.ridge_predict(X_scaled), trained_projector._ridge.predict(X_scaled),
+        )
+        np.testing.assert_array_equal(
+            arrays.forest_mean(arrays.tree_predictions(X_scaled)),
+            trained_projector._rf.predict(X_scaled),
+        )
+
+    def test_hgb_estimator_trains_and_predicts(self, db_with_training_data, trained_hgb_projector):
+        assert trained_hgb_projector._rf is None
+        assert sum(trained_hgb_projector._feature_importances.values()) == pytest.approx(1.0)
+        result = trained_hgb_projector.predict(db_with_training_data, "p1", 2024, 8)
+        assert 0 <= result["confidence_low"] <= result["projected_points"] <= result["confidence_high"]
+
+    def test_hgb_array_engine_matches_sklearn_bit_for_bit(
+        self, db_with_training_data, trained_hgb_projector,
+    ):
+        X, _, _ = trained_hgb_projector.build_training_data(db_with_training_data, [2024])
+        X_scaled = trained_hgb_projector._scaler.transform(X)
+        arrays = trained_hgb_projector._arrays
+        np.testing.assert_array_equal(
+            arrays.forest.predict(X_scaled), trained_hgb_projector._gbm.predict(X_scaled),
+        )
+        np.testing.assert_array_equal(
+            arrays.lower.predict(X_scaled), trained_hgb_projector._gbm_lower.predict(X_scaled),
+        )
+        np.testing.assert_array_equal(
+            arrays.upper.predict(X_scaled), trained_hgb_projector._gbm_upper.predict(X_scaled),
+        )
+
+    def test_unknown_estimator_raises(self):
+        with pytest.raises(ValueError, match="Unknown estimator"):
+            PointProjector(estimator="svm")
+
+    def test_predict_weeks_matches_predict(self, db_with_training_data, trained_projector):
+        weeks = [2, 6, 9, 11, 12]
+        results = trained_projector.predict_weeks(db_with_training_data, "p4", 2024, weeks)
+        assert results[0] is None
+        for week, result in zip(weeks, results):
+            assert result == trained_projector.predict(db_with_training_data, "p4", 2024, week)
+
+    def test_predict_remaining_season_loads_history_once(
+        self, db_with_training_data, trained_projector, monkeypatch,
+    ):
+        import analytics.models
+        calls = []
+        original = analytics.models.build_feature_frame
+
+        def spy(db, season, targets=None):
+            calls.append(targets)
+            return original(db, season, targets=targets)
+
+        monkeypatch.setattr(analytics.models, "build_feature_frame", spy)
+        result = trained_projector.predict_remaining_season(
+            db_with_training_data, "p1", 2024, 5, total_weeks=10
+        )
+        assert len(calls) == 1
+        assert [w["week"] for w in result["weekly"]] == [6, 7, 8, 9, 10]
+
+    def test_predict_many_untrained_raises(self, db_with_training_data):
+        with pytest.raises(RuntimeError, match="not trained"):
+            PointProjector().predict_many(db_with_training_data, ["p1"], 2024, 5)
+
     def test_predict_remaining_season(self, db_with_training_data, trained_projector):
         result = trained_projector.predict_remaining_season(
             db_with_training_data, "p1", 2024, 5, total_weeks=10
@@ -200,6 +334,383 @@ class TestPointProjector:
             assert importances[name] >= 0
 
 
+class TestPositionalProjector:
+    def test_trains_one_sub_model_per_position(self, db_with_training_data):
+        metrics = PositionalProjector(min_samples=10).train(db_with_training_data, [2023, 2024])
+        assert set(metrics["positions"]) == {"QB", "RB", "WR", "TE"}
+        assert metrics["n_samples"] == sum(m["n_samples"] for m in metrics["positions"].values())
+        assert metrics["ensemble_cv_mae"] > 0
+
+    def test_rows_route_to_their_position_model(self, db_with_training_data,
+                                                trained_positional_projector):
+        X, _, meta = PointProjector().build_training_data(db_with_training_data, [2024])
+        positions = [m["position"] for m in meta]
+        projected, low, high = trained_positional_projector._project_rows(X, positions)
+        # Not assert_array_equal: the ridge matmul (BLAS) may round differently
+        # in the last bit for another buffer holding the same rows
+        for position, model in trained_positional_projector._models.items():
+            rows = [i for i, p in enumerate(positions) if p == position]
+            expected = model._project_rows(X[rows])
+            for got, want in zip((projected, low, high), expected):
+                np.testing.assert_allclose(got[rows], want, rtol=1e-12)
+
+    def test_unknown_position_uses_fallback(self, db_with_training_data,
+                                            trained_positional_projector):
+        X, _, _ = PointProjector().build_training_data(db_with_training_data, [2024])
+        fallback = trained_positional_projector._models[trained_positional_projector._fallback]
+        np.testing.assert_allclose(
+            trained_positional_projector._project_rows(X[:3], ["K", "K", None])[0],
+            fallback._project_rows(X[:3])[0], rtol=1e-12,
+        )
+
+    def test_predict_matches_predict_many(self, db_with_training_data,
+                                          trained_positional_projector):
+        many = trained_positional_projector.predict_many(
+            db_with_training_data, ["p1", "p2", "p4"], 2024, 8,
+        )
+        assert many[2] == trained_positional_projector.predict(db_with_training_data, "p4", 2024, 8)
+        assert many[0] != many[1]
+
+    def test_artifact_and_pickle_load_in_one_step(self, db_with_training_data,
+                                                  trained_positional_projector, tmp_path):
+        player_ids = ["p1", "p2", "p3", "p4", "p5", "p6"]
+        expected = trained_positional_projector.predict_many(db_with_training_data, player_ids, 2024, 8)
+        trained_positional_projector.save(str(tmp_path / "point_projector.pkl"))
+        trained_positional_projector.export(str(tmp_path / "point_projector"))
+        for path in (tmp_path / "point_projector.pkl", tmp_path / "point_projector",
+                     convert_pickle(str(tmp_path / "point_projector.pkl"))):
+            loaded = load_projector(str(path))
+            assert isinstance(loaded, PositionalProjector)
+            assert loaded.predict_many(db_with_training_data, player_ids, 2024, 8) == expected
+            assert loaded._feature_importances == pytest.approx(
+                trained_positional_projector._feature_importances
+            )
+
+    def test_parallel_training_matches_serial(self, db_with_training_data, monkeypatch):
+        import analytics.models as models_module
+        monkeypatch.setattr(models_module, "ProcessPoolExecutor", ThreadPoolExecutor)
+        X, y, meta = PointProjector().build_training_data(db_with_training_data, [2023, 2024])
+        positions = [m["position"] for m in meta]
+        serial = PositionalProjector(min_samples=10)
+        parallel = PositionalProjector(min_samples=10)
+        serial.fit(X, y, groups=time_groups(meta), positions=positions)
+        parallel.fit(X, y, groups=time_groups(meta), max_workers=4, positions=positions)
+        np.testing.assert_allclose(
+            serial._project_rows(X, positions)[0], parallel._project_rows(X, positions)[0],
+            rtol=1e-12,
+        )
+
+    def test_fit_requires_positions(self, db_with_training_data):
+        X, y, _ = PointProjector().build_training_data(db_with_training_data, [2024])
+        with pytest.raises(ValueError, match="position"):
+            PositionalProjector().fit(X, y)
+
+    def test_projection_requires_positions(self, db_with_training_data,
+                                           trained_positional_projector):
+        X, _, _ = PointProjector().build_training_data(db_with_training_data, [2024])
+        with pytest.raises(ValueError, match="position"):
+            trained_positional_projector._project_rows(X[:3])
+
+
+# --- Cross-validation and tuning tests ---
+
+
+class TestTimeSeriesCV:
+    def test_folds_never_train_on_future_weeks(self, db_with_training_data):
+        _, _, meta = PointProjector().build_training_data(db_with_training_data, [2023, 2024])
+        groups = time_groups(meta)
+        folds = time_series_folds(groups, n_splits=5)
+        assert len(folds) == 5
+        for train, test in folds:
+            assert groups[train].max() < groups[test].min()
+        # Test blocks are contiguous and together cover everything after the first block
+        tested = np.concatenate([test for _, test in folds])
+        assert len(np.unique(tested)) == len(tested)
+        assert groups[tested].min() > groups[folds[0][0]].max()
+
+    def test_too_few_weeks_gives_no_folds(self):
+        assert time_series_folds(np.array([202401, 202401, 202401])) == []
+        assert len(time_series_folds(np.array([202401, 202402]), n_splits=5)) == 1
+
+    def test_train_reports_time_series_cv(self, db_with_training_data):
+        metrics = PointProjector().train(db_with_training_data, [2023, 2024])
+        assert metrics["cv_folds"] == 5
+        for key in ("ridge_cv_mae", "rf_cv_mae", "ensemble_cv_mae"):
+            assert metrics[key] > 0
+
+    def test_fit_without_groups_skips_cv(self, db_with_training_data):
+        X, y, _ = PointProjector().build_training_data(db_with_training_data, [2024])
+        metrics = PointProjector().fit(X, y)
+        assert metrics["cv_folds"] == 0
+        assert metrics["ridge_cv_mae"] is None
+
+    def test_parallel_folds_match_serial(self, db_with_training_data):
+        X, y, meta = PointProjector().build_training_data(db_with_training_data, [2023, 2024])
+        matrices = build_fold_matrices(X, y, time_series_folds(time_groups(meta)))
+        candidates = {"ridge": PointProjector._make_ridge(), "rf": PointProjector()._make_model()}
+        serial, _ = cross_validate(candidates, matrices, max_workers=1)
+        parallel, _ = cross_validate(candidates, matrices, max_workers=4)
+        for name in candidates:
+            for a, b in zip(serial[name], parallel[name]):
+                np.testing.assert_allclose(a, b)
+
+
+class TestTuning:
+    def test_candidates_are_distinct_and_seeded(self):
+        candidates = sample_candidates("rf", 12, seed=7)
+        assert len({tuple(c.values()) for c in candidates}) == 12
+        assert candidates == sample_candidates("rf", 12, seed=7)
+
+    def test_halving_schedule_ends_at_full_resource(self):
+        assert halving_schedule(27, 100) == [(27, 10), (9, 11), (3, 33), (1, 100)]
+        assert halving_schedule(1, 200) == [(1, 200)]
+
+    def test_tune_races_candidates(self, db_with_training_data, monkeypatch):
+        monkeypatch.setattr("analytics.tuning.ProcessPoolExecutor", ThreadPoolExecutor)
+        X, y, meta = PointProjector().build_training_data(db_with_training_data, [2023, 2024])
+        result = tune(X, y, time_groups(meta), n_candidates=9, max_workers=2)
+        assert result["completed"]
+        assert [sum(t["rung"] == r for t in result["trials"]) for r in range(3)] == [9, 3, 1]
+        best = result["best"]
+        assert best["params"]["n_estimators"] == 100
+        assert best["ridge_weight"] in BLEND_WEIGHTS
+        assert best["cv_mae"] == min(t["cv_mae"] for t in result["trials"] if t["rung"] == 2)
+
+        projector = PointProjector(params=best["params"], ridge_weight=best["ridge_weight"])
+        metrics = projector.fit(X, y, groups=time_groups(meta))
+        assert projector._rf.get_params()["max_depth"] == best["params"]["max_depth"]
+        assert metrics["ensemble_cv_mae"] == pytest.approx(best["cv_mae"], abs=1e-3)
+
+    def test_tune_stops_at_budget(self, db_with_training_data, monkeypatch):
+        monkeypatch.setattr("analytics.tuning.ProcessPoolExecutor", ThreadPoolExecutor)
+        X, y, meta = PointProjector().build_training_data(db_with_training_data, [2023, 2024])
+        with pytest.raises(ValueError, match="budget"):
+            tune(X, y, time_groups(meta), n_candidates=9, budget_s=0)
+
+    def test_rung_cut_short_is_not_ranked(self, db_with_training_data, monkeypatch):
+        monkeypatch.setattr("analytics.tuning.ProcessPoolExecutor", ThreadPoolExecutor)
+        release = threading.Event()
+        later_trials = []
+
+        def trial(estimator, params):
+            folds = tuning._worker_folds
+            if params["n_estimators"] == 11:
+                return [np.full(len(f.y_test), float(params["min_samples_leaf"])) for f in folds]
+            # In the second rung one perfect trial finishes, the rest outlast the budget
+            later_trials.append(params)
+            if len(later_trials) > 1:
+                release.wait()
+            return [f.y_test for f in folds]
+
+        monkeypatch.setattr(tuning, "_trial_worker", trial)
+        X, y, meta = PointProjector().build_training_data(db_with_training_data, [2023, 2024])
+        try:
+            result = tune(X, y, time_groups(meta), n_candidates=9, budget_s=1, max_workers=3)
+        finally:
+            release.set()
+        assert not result["completed"]
+        assert min(t["cv_mae"] for t in result["trials"]) == 0.0
+        # The winner is fit with the full number of trees, whatever rung it won in
+        assert result["best"]["params"]["n_estimators"] == 100
+        assert result["best"]["rung_resource"] == 11
+        assert result["best"]["cv_mae"] == min(
+            t["cv_mae"] for t in result["trials"] if t["rung"] == 0
+        )
+
+
+# --- Feature frame tests ---
+
+
+def _per_row_features(db, season):
+    """Reference matrix built one player-week at a time via build_features."""
+    projector = PointProjector()
+    rows = []
+    for player_id in db["weekly_stats"].distinct("player_id", {"season": season}):
+        weeks = db["weekly_stats"].find({"player_id": player_id, "season": season}).sort("week", 1)
+        for doc in weeks:
+            features = projector.build_features(db, player_id, season, doc["week"])
+            if features is not None:
+                rows.append([features[name] for name in FEATURE_NAMES])
+    return np.array(rows, dtype=np.float64)
+
+
+def _seed_irregular_data(db):
+    """Data with real-team matchups, byes, missing snaps and away-only games."""
+    _seed_training_data(db, seasons=[2024])
+    for week in range(1, 11):
+        for team, opp in [("KC", "BAL"), ("MIA", "BUF"), ("BAL", "KC"), ("BUF", "MIA")]:
+            db["weekly_stats"].insert_one({
+                "player_id": f"def_{team}", "player_name": None, "position": "WR",
+                "recent_team": team, "season": 2024, "week": week,
+                "opponent_team": opp, "fantasy_points_ppr": 7.3 * (week % 3) + 0.1,
+            })
+    db["weekly_stats"].delete_many({"player_id": "p3", "week": {"$in": [4, 7]}})
+    db["snap_counts"].delete_many({"player": "Player 2", "week": {"$gte": 6}})
+    db["snap_counts"].update_one({"player": "Player 4", "week": 3}, {"$set": {"offense_pct": None}})
+    db["schedules"].delete_many({"season": 2024, "home_team": "CIN"})
+
+
+class TestFeatureFrame:
+    def test_matches_per_row_builder(self, db_with_training_data):
+        frame = build_feature_frame(db_with_training_data, 2024)
+        expected = _per_row_features(db_with_training_data, 2024)
+        np.testing.assert_array_equal(frame[FEATURE_NAMES].to_numpy(dtype=np.float64), expected)
+
+    def test_matches_per_row_builder_irregular_data(self, db):
+        _seed_irregular_data(db)
+        frame = build_feature_frame(db, 2024)
+        expected = _per_row_features(db, 2024)
+        assert (frame["matchup_rank"] != 16).any()
+        np.testing.assert_array_equal(frame[FEATURE_NAMES].to_numpy(dtype=np.float64), expected)
+
+    def test_training_data_matches_per_row_builder(self, db_with_training_data):
+        X, y, meta = PointProjector().build_training_data(db_with_training_data, [2023, 2024])
+        expected = np.vstack([
+            _per_row_features(db_with_training_data, 2023),
+            _per_row_features(db_with_training_data, 2024),
+        ])
+        np.testing.assert_array_equal(X, expected)
+        first_player = db_with_training_data["weekly_stats"].distinct("player_id", {"season": 2023})[0]
+        position = db_with_training_data["weekly_stats"].find_one({"player_id": first_player})["position"]
+        assert meta[0] == {"player_id": first_player, "position": position, "season": 2023, "week": 3}
+
+    def test_career_avg_uses_prior_seasons_only(self, db_with_training_data):
+        first = build_feature_frame(db_with_training_data, 2023)
+        np.testing.assert_array_equal(first["career_avg"], first["season_avg_points"])
+        second = build_feature_frame(db_with_training_data, 2024)
+        p2 = second[second["player_id"] == "p2"]
+        assert (p2["career_avg"] == 18.0).all()
+
+    def test_explicit_targets_include_unplayed_weeks(self, db_with_training_data):
+        frame = build_feature_frame(
+            db_with_training_data, 2024, targets=[("p2", 11), ("nonexistent", 5), ("p1", 2), ("p1", 6)],
+        )
+        assert list(zip(frame["player_id"], frame["week"])) == [("p2", 11), ("p1", 6)]
+        projector = PointProjector()
+        for _, row in frame.iterrows():
+            features = projector.build_features(db_with_training_data, row["player_id"], 2024, row["week"])
+            assert [row[name] for name in FEATURE_NAMES] == [features[name] for name in FEATURE_NAMES]
+        assert np.isnan(frame["fantasy_points_ppr"].iloc[0])
+
+    def test_parallel_build_matches_serial(self, db_with_training_data, monkeypatch):
+        # Threads stand in for processes so workers can share the mongomock db
+        monkeypatch.setattr("analytics.features.ProcessPoolExecutor", ThreadPoolExecutor)
+        monkeypatch.setattr("analytics.features.get_db", lambda uri=None: db_with_training_data)
+        calls = []
+        parallel = build_feature_frames(
+            [2024, 2023], uri="mongodb://unused", max_workers=2,
+            progress=lambda season, done, total: calls.append((done, total)),
+        )
+        serial = build_feature_frames([2024, 2023], db=db_with_training_data)
+        assert parallel.equals(serial)
+        assert list(parallel["season"].unique()) == [2024, 2023]
+        assert sorted(calls) == [(1, 2), (2, 2)]
+
+    def test_empty_season(self, db):
+        frame = build_feature_frame(db, 2030)
+        assert frame.empty
+        assert list(frame.columns[-len(FEATURE_NAMES):]) == FEATURE_NAMES
+
+
+# --- Feature store tests ---
+
+
+def _schedule_week(db, season, week):
+    """Add an unplayed game to the schedule so ``week`` counts as upcoming."""
+    db["schedules"].insert_one({
+        "game_id": f"{season}_{week}_0", "season": season, "week": week,
+        "home_team": "KC", "away_team": "BAL", "home_score": None,
+    })
+
+
+class TestFeatureStore:
+    def test_update_writes_played_and_upcoming_weeks(self, db_with_training_data):
+        _schedule_week(db_with_training_data, 2024, 11)
+        written = update_feature_store(db_with_training_data, 2024)
+        stored = db_with_training_data["features"]
+        assert written == stored.count_documents({})
+        # 6 players x weeks 3-10 played, plus week 11 upcoming
+        assert stored.count_documents({"fantasy_points_ppr": {"$ne": None}}) == 6 * 8
+        assert stored.count_documents({"week": 11, "fantasy_points_ppr": None}) == 6
+        doc = stored.find_one({"player_id": "p1", "week": 5})
+        assert doc["feature_set_version"] == FEATURE_SET_VERSION
+        assert isinstance(doc["games_played"], int)
+        expected = PointProjector().build_features(db_with_training_data, "p1", 2024, 5)
+        assert {name: doc[name] for name in FEATURE_NAMES} == expected
+
+    def test_update_appends_new_weeks_only(self, db_with_training_data):
+        db = db_with_training_data
+        db["weekly_stats"].delete_many({"season": 2024, "week": {"$gt": 8}})
+        update_feature_store(db, 2024)
+        db["features"].update_one({"player_id": "p1", "week": 5}, {"$set": {"last_3_avg": -1.0}})
+
+        _seed_training_data(db, seasons=[2024])
+        update_feature_store(db, 2024)
+        assert db["features"].find_one({"player_id": "p1", "week": 5})["last_3_avg"] == -1.0
+        assert db["features"].find_one({"player_id": "p1", "week": 9})["fantasy_points_ppr"] is not None
+        assert db["features"].count_documents({"player_id": "p1", "week": 9}) == 1
+
+    def test_upcoming_rows_are_replaced(self, db_with_training_data):
+        db = db_with_training_data
+        db["weekly_stats"].delete_many({"season": 2024, "week": {"$gt": 8}})
+        update_feature_store(db, 2024)
+        assert db["features"].count_documents({"week": 9, "fantasy_points_ppr": None}) == 6
+
+        # Week 9 is played by everyone but p1; week 10 becomes the upcoming week
+        _seed_training_data(db, seasons=[2024])
+        db["weekly_stats"].delete_many({"season": 2024, "week": 10})
+        db["weekly_stats"].delete_many({"player_id": "p1", "season": 2024, "week": 9})
+        update_feature_store(db, 2024)
+        assert db["features"].count_documents({"week": 9, "fantasy_points_ppr": None}) == 0
+        assert db["features"].count_documents({"season": 2024, "week": 9}) == 5
+        assert db["features"].count_documents({"week": 10, "fantasy_points_ppr": None}) == 6
+
+    def test_finished_season_has_no_upcoming_rows(self, db_with_training_data):
+        db = db_with_training_data
+        update_feature_store(db, 2023)
+        update_feature_store(db, 2024)
+        assert db["features"].count_documents({"fantasy_points_ppr": None}) == 0
+
+        db["schedules"].update_many({"season": 2024}, {"$set": {"home_score": 24}})
+        _schedule_week(db, 2024, 11)
+        db["schedules"].update_one({"season": 2024, "week": 11}, {"$set": {"home_score": 17}})
+        update_feature_store(db, 2024)
+        assert db["features"].count_documents({"fantasy_points_ppr": None}) == 0
+
+    def test_stale_versions_are_purged(self, db_with_training_data):
+        db = db_with_training_data
+        db["features"].insert_one({
+            "player_id": "p1", "season": 2024, "week": 5,
+            "feature_set_version": FEATURE_SET_VERSION - 1,
+        })
+        assert purge_stale_features(db) == 1
+        assert get_stored_features(db, ["p1"], 2024, 5) == {}
+
+    def test_training_frame_reads_from_store(self, db_with_training_data):
+        db = db_with_training_data
+        frame = load_training_frame(db, [2023, 2024])
+        assert db["features"].count_documents({}) == len(frame)
+        db["weekly_stats"].delete_many({})
+        again = load_training_frame(db, [2023, 2024])
+        assert again.equals(frame)
+
+    def test_training_data_from_store_matches_direct_build(self, db_with_training_data):
+        projector = PointProjector()
+        X_direct, y_direct, _ = projector.build_training_data(db_with_training_data, [2024])
+        X_store, y_store, _ = projector.build_training_data(db_with_training_data, [2024], use_store=True)
+        order_direct = np.lexsort(X_direct.T)
+        order_store = np.lexsort(X_store.T)
+        np.testing.assert_array_equal(X_direct[order_direct], X_store[order_store])
+        np.testing.assert_array_equal(y_direct[order_direct], y_store[order_store])
+
+    def test_predict_serves_stored_features(self, db_with_training_data, trained_projector):
+        db = db_with_training_data
+        _schedule_week(db, 2024, 11)
+        update_feature_store(db, 2024)
+        db["weekly_stats"].delete_many({"player_id": "p1"})
+        assert trained_projector.predict(db, "p1", 2024, 11) is not None
+
+
 # --- PlayerClusterer tests ---
 
 
@@ -213,6 +724,15 @@ class TestPlayerClusterer:
             assert "n_players" in cluster
             assert cluster["n_players"] > 0
 
+    def test_snap_counts_fetched_in_one_query(self, db_with_training_data, monkeypatch):
+        snap_counts = db_with_training_data["snap_counts"]
+        calls = []
+        find = snap_counts.find
+        monkeypatch.setattr(snap_counts, "find", lambda *a, **kw: calls.append(a) or find(*a, **kw))
+        players = PlayerClusterer()._build_player_features(db_with_training_data, 2024, "RB")
+        assert len(calls) == 1
+        assert {p["player_id"]: p["snap_pct_avg"] for p in players} == {"p2": 0.65, "p5": 0.8}
+
     def test_classify_player(self, db_with_training_data, trained_clusterer):
         result = trained_clusterer.classify_player(db_with_training_data, "p2", 2024)
         assert result is not None
@@ -224,6 +744,58 @@ class TestPlayerClusterer:
         result = trained_clusterer.classify_player(db_with_training_data, "nonexistent", 2024)
         assert result is None
 
+    def _add_rookie(self, db, weeks=3):
+        for week in range(1, weeks + 1):
+            db["weekly_stats"].update_one(
+                {"player_id": "rookie", "season": 2024, "week": week},
+                {"$set": {
+                    "player_id": "rookie", "player_name": "Rookie", "position": "RB",
+                    "recent_team": "KC", "season": 2024, "week": week,
+                    "fantasy_points_ppr": 10.0 + week,
+                }},
+                upsert=True,
+            )
+
+    def test_classify_unseen_player_on_the_fly(self, db_with_training_data, trained_clusterer):
+        self._add_rookie(db_with_training_data)
+        result = trained_clusterer.classify_player(db_with_training_data, "rookie", 2024)
+        assert result["provisional"] is True
+        assert result["characteristics"]["avg_points"] == 12.0
+        features = np.array([[result["characteristics"][k] for k in CLUSTER_FEATURE_NAMES]])
+        expected = trained_clusterer._kmeans.predict(trained_clusterer._scaler.transform(features))
+        assert result["cluster_id"] == int(expected[0])
+        assert trained_clusterer.classify_player(db_with_training_data, "p2", 2024)["provisional"] is False
+        assert trained_clusterer.get_similar_players(db_with_training_data, "rookie", 2024)
+
+    def test_provisional_results_cached_per_data_version(self, db_with_training_data,
+                                                         trained_clusterer, monkeypatch):
+        self._add_rookie(db_with_training_data)
+        weekly = db_with_training_data["weekly_stats"]
+        calls = []
+        aggregate = weekly.aggregate
+        monkeypatch.setattr(weekly, "aggregate", lambda *a, **kw: calls.append(a) or aggregate(*a, **kw))
+
+        first = trained_clusterer.classify_player(db_with_training_data, "rookie", 2024)
+        assert trained_clusterer.classify_player(db_with_training_data, "rookie", 2024) == first
+        assert len(calls) == 1
+
+        self._add_rookie(db_with_training_data, weeks=4)
+        updated = trained_clusterer.classify_player(db_with_training_data, "rookie", 2024)
+        assert len(calls) == 2
+        assert updated["characteristics"]["avg_points"] == 12.5
+
+    def test_classify_players_batches_unseen(self, db_with_training_data, trained_clusterer,
+                                             tmp_path):
+        self._add_rookie(db_with_training_data)
+        player_ids = ["rookie", "p2", "nonexistent"]
+        results = trained_clusterer.classify_players(db_with_training_data, player_ids, 2024)
+        assert [r and r["provisional"] for r in results] == [True, False, None]
+
+        trained_clusterer.export(str(tmp_path / "clusterer_rb"))
+        loaded = PlayerClusterer()
+        loaded.load(str(tmp_path / "clusterer_rb"))
+        assert loaded.classify_players(db_with_training_data, player_ids, 2024) == results
+
     def test_get_similar_players(self, db_with_training_data, trained_clusterer):
         result = trained_clusterer.get_similar_players(db_with_training_data, "p2", 2024)
         assert isinstance(result, list)
@@ -231,6 +803,29 @@ class TestPlayerClusterer:
         for p in result:
             assert p["player_id"] != "p2"
 
+    def test_similar_players_are_nearest_neighbours(self, db):
+        _seed_training_data(db, seasons=[2024], n_players=18)
+        clusterer = PlayerClusterer(n_clusters=2)
+        clusterer.train(db, 2024, "RB")
+        X = clusterer._scaler.transform(np.array([
+            [p[name] for name in CLUSTER_FEATURE_NAMES] for p in clusterer._player_data
+        ]))
+        i = clusterer._player_index["p2"]
+        distances = np.sqrt(((X - X[i]) ** 2).sum(axis=1))
+        expected = [clusterer._player_data[j]["player_id"] for j in np.argsort(distances)[1:4]]
+
+        result = clusterer.get_similar_players(db, "p2", 2024, limit=3)
+        assert [p["player_id"] for p in result] == expected
+        assert [p["distance"] for p in result] == sorted(p["distance"] for p in result)
+
+    def test_similar_players_after_artifact_load(self, db_with_training_data, trained_clusterer,
+                                                 tmp_path):
+        trained_clusterer.export(str(tmp_path / "clusterer_rb"))
+        loaded = PlayerClusterer()
+        loaded.load(str(tmp_path / "clusterer_rb"))
+        assert loaded.get_similar_players(db_with_training_data, "p2", 2024) == \
+            trained_clusterer.get_similar_players(db_with_training_data, "p2", 2024)
+
     def test_save_and_load_roundtrip(self, db_with_training_data, trained_clusterer, tmp_path):
         path = str(tmp_path / "clusterer.pkl")
         trained_clusterer.save(path)
@@ -244,6 +839,406 @@ class TestPlayerClusterer:
         assert orig["cluster_id"] == reloaded["cluster_id"]
 
 
+class TestIncrementalClusters:
+    def _add_week(self, db, week, points):
+        for i in range(12):
+            pid = f"p{i+1}"
+            doc = db["weekly_stats"].find_one({"player_id": pid, "season": 2024, "week": 1}, {"_id": 0})
+            db["weekly_stats"].insert_one({**doc, "week": week, "fantasy_points_ppr": points(i)})
+
+    def test_update_keeps_cluster_ids_and_labels(self, db, tmp_path):
+        _seed_training_data(db, seasons=[2024], n_players=12)
+        clusterer = PlayerClusterer(n_clusters=2)
+        clusterer.train(db, 2024, "RB")
+        before = {p["player_id"]: p["cluster_id"] for p in clusterer._player_data}
+        labels = dict(clusterer._cluster_labels)
+        centers = np.array(clusterer._cluster_centers_raw)
+
+        clusterer.update(db, 2024)
+        assert {p["player_id"]: p["cluster_id"] for p in clusterer._player_data} == before
+        np.testing.assert_allclose(clusterer._cluster_centers_raw, centers, atol=1e-6)
+
+        self._add_week(db, 11, lambda i: 40.0 if i == 1 else 5.0)
+        info = clusterer.update(db, 2024)
+        assert clusterer._cluster_labels == labels
+        assert {cid: c["label"] for cid, c in info.items()} == labels
+        assert clusterer.classify_player(db, "p2", 2024)["characteristics"]["ceiling"] == 40.0
+        assert not np.allclose(clusterer._cluster_centers_raw, centers)
+
+        # Updates continue from a saved clusterer
+        path = str(tmp_path / "clusterer.pkl")
+        clusterer.save(path)
+        loaded = PlayerClusterer()
+        loaded.load(path)
+        self._add_week(db, 12, lambda i: 10.0)
+        assert loaded.update(db, 2024).keys() == info.keys()
+
+    def test_update_feeds_only_changed_profiles(self, db):
+        _seed_training_data(db, seasons=[2024], n_players=12)
+        clusterer = PlayerClusterer(n_clusters=2)
+        clusterer.train(db, 2024, "RB")
+        self._add_week(db, 11, lambda i: 12.0)
+        clusterer.update(db, 2024)
+        counts = clusterer._kmeans._counts.sum()
+
+        # Nothing new: no rows are counted again
+        clusterer.update(db, 2024)
+        assert clusterer._kmeans._counts.sum() == counts
+
+        # One player with a new game adds one row
+        doc = db["weekly_stats"].find_one({"player_id": "p2", "season": 2024, "week": 1}, {"_id": 0})
+        db["weekly_stats"].insert_one({**doc, "week": 12, "fantasy_points_ppr": 30.0})
+        clusterer.update(db, 2024)
+        assert clusterer._kmeans._counts.sum() == counts + 1
+
+    def test_bundle_update_reads_season_once(self, db, monkeypatch):
+        _seed_training_data(db, seasons=[2024], n_players=12)
+        bundle = ClustererBundle(n_clusters=2)
+        trained, _ = bundle.train(db, 2024)
+        weekly = db["weekly_stats"]
+        calls = []
+        aggregate = weekly.aggregate
+        monkeypatch.setattr(weekly, "aggregate", lambda *a, **kw: calls.append(a) or aggregate(*a, **kw))
+        updated = bundle.update(db, 2024, max_workers=4)
+        assert len(calls) == 1
+        assert {pos: {c: i["label"] for c, i in info.items()} for pos, info in updated.items()} == \
+            {pos: {c: i["label"] for c, i in info.items()} for pos, info in trained.items()}
+
+    def test_update_refuses_other_season(self, db, tmp_path):
+        _seed_training_data(db, seasons=[2023, 2024], n_players=12)
+        bundle = ClustererBundle(n_clusters=2)
+        bundle.train(db, 2024)
+        assert bundle.season == 2024
+        with pytest.raises(ValueError, match="trained on season 2024"):
+            bundle.update(db, 2023)
+        with pytest.raises(ValueError, match="trained on season 2024"):
+            bundle.get("RB").update(db, 2023)
+
+        # The training season survives the pickle and the artifact
+        bundle.save(str(tmp_path / "clusterers.pkl"))
+        bundle.export(str(tmp_path / "clusterers"))
+        for path in ("clusterers.pkl", "clusterers"):
+            loaded = ClustererBundle()
+            loaded.load(str(tmp_path / path))
+            assert loaded.season == 2024
+
+    def test_update_refuses_unknown_season(self, db, tmp_path):
+        _seed_training_data(db, seasons=[2024], n_players=12)
+        clusterer = PlayerClusterer(n_clusters=2)
+        clusterer.train(db, 2024, "RB")
+        state = clusterer._state()
+        del state["season"]
+        loaded = PlayerClusterer()
+        loaded._set_state(state)
+        with pytest.raises(ValueError, match="retrain"):
+            loaded.update(db, 2024)
+
+    def test_artifact_clusterer_cannot_update(self, db_with_training_data, trained_clusterer,
+                                              tmp_path):
+        trained_clusterer.export(str(tmp_path / "clusterer_rb"))
+        loaded = PlayerClusterer()
+        loaded.load(str(tmp_path / "clusterer_rb"))
+        with pytest.raises(RuntimeError, match="pickle"):
+            loaded.update(db_with_training_data, 2024)
+
+
+class TestClustererBundle:
+    def test_matches_per_position_training(self, db):
+        _seed_training_data(db, seasons=[2024], n_players=12)
+        bundle = ClustererBundle(n_clusters=2)
+        cluster_info, skipped = bundle.train(db, 2024, max_workers=4)
+        assert set(cluster_info) == {"QB", "RB", "WR", "TE"} and skipped == {}
+        for position, clusterer in bundle.clusterers.items():
+            single = PlayerClusterer(n_clusters=2)
+            assert single.train(db, 2024, position) == cluster_info[position]
+            for p in single._player_data:
+                assert bundle.get(position).classify_player(db, p["player_id"], 2024) == \
+                    single.classify_player(db, p["player_id"], 2024)
+
+    def test_reads_season_once(self, db_with_training_data, monkeypatch):
+        weekly = db_with_training_data["weekly_stats"]
+        calls = []
+        aggregate = weekly.aggregate
+        monkeypatch.setattr(weekly, "aggregate", lambda *a, **kw: calls.append(a) or aggregate(*a, **kw))
+        ClustererBundle(n_clusters=2).train(db_with_training_data, 2024)
+        assert len(calls) == 1
+
+    def test_skips_positions_without_enough_players(self, db_with_training_data):
+        cluster_info, skipped = ClustererBundle(n_clusters=2).train(db_with_training_data, 2024)
+        assert set(cluster_info) == {"RB", "WR"}
+        assert set(skipped) == {"QB", "TE"}
+
+    def test_bundle_round_trips(self, db_with_training_data, tmp_path):
+        bundle = ClustererBundle(n_clusters=2)
+        bundle.train(db_with_training_data, 2024)
+        expected = bundle.get("rb").get_similar_players(db_with_training_data, "p2", 2024)
+        bundle.save(str(tmp_path / "clusterers.pkl"))
+        bundle.export(str(tmp_path / "clusterers"))
+        for path in (tmp_path / "clusterers.pkl", tmp_path / "clusterers",
+                     convert_pickle(str(tmp_path / "clusterers.pkl"))):
+            loaded = ClustererBundle()
+            loaded.load(str(path))
+            assert set(loaded.clusterers) == {"RB", "WR"}
+            assert loaded.get("RB").get_similar_players(db_with_training_data, "p2", 2024) == expected
+        registry = ModelRegistry(db_with_training_data, str(tmp_path), check_interval=0)
+        assert registry.get("clusterers").get("WR") is not None
+
+
+class TestSimilarityIndex:
+    @pytest.fixture
+    def index(self, db):
+        _seed_training_data(db, seasons=[2022, 2023, 2024], n_players=18)
+        index = SimilarityIndex()
+        index.build(db)
+        return index
+
+    def test_indexes_every_season(self, index):
+        assert index.matrix.dtype == np.float32
+        assert len(index.players) == 18 * 3
+        start, end = index.bounds["RB"]
+        assert {p["position"] for p in index.players[start:end]} == {"RB"}
+
+    def test_query_matches_brute_force(self, index):
+        start, end = index.bounds["RB"]
+        row = index._rows[("p2", 2024)]
+        X = index.matrix[start:end].astype(np.float64)
+        distances = np.sqrt(((X - X[row - start]) ** 2).sum(axis=1))
+        distances[row - start] = np.inf
+        expected = [
+            (index.players[start + i]["player_id"], index.players[start + i]["season"])
+            for i in np.argsort(distances, kind="stable")[:5]
+        ]
+        result = index.query("p2", 2024, k=5)
+        assert [(r["player_id"], r["season"]) for r in result] == expected
+        assert [r["distance"] for r in result] == sorted(r["distance"] for r in result)
+
+    def test_query_restricted_to_seasons(self, index):
+        result = index.query("p2", 2024, k=50, seasons=[2022])
+        assert result and {r["season"] for r in result} == {2022}
+        assert len(result) == 6
+        assert index.query("p2", 2019) is None
+
+    def test_export_and_load(self, index, tmp_path):
+        path = str(tmp_path / "similarity_index")
+        index.export(path)
+        loaded = SimilarityIndex()
+        loaded.load(path)
+        assert isinstance(loaded.matrix, np.memmap)
+        assert loaded.query("p4", 2023, k=3) == index.query("p4", 2023, k=3)
+        np.testing.assert_array_equal(loaded.seasons, index.seasons)
+        assert loaded.query("p4", 2023, k=3, seasons=[2022]) == \
+            index.query("p4", 2023, k=3, seasons=[2022])
+
+
+# --- Artifact tests ---
+
+
+class TestArtifacts:
+    def test_projector_artifact_matches_sklearn(self, db_with_training_data, trained_projector, tmp_path):
+        path = str(tmp_path / "point_projector")
+        trained_projector.export(path)
+        assert is_artifact(path)
+
+        loaded = PointProjector()
+        loaded.load(path)
+        assert loaded._rf is None
+        player_ids = ["p1", "p2", "p3", "p4", "p5", "p6"]
+        assert loaded.predict_many(db_with_training_data, player_ids, 2024, 8) == \
+            trained_projector.predict_many(db_with_training_data, player_ids, 2024, 8)
+
+    def test_artifact_arrays_are_memory_mapped(self, trained_projector, tmp_path):
+        path = str(tmp_path / "point_projector")
+        trained_projector.export(path)
+        _, arrays = read_artifact(path)
+        assert all(isinstance(a, np.memmap) and not a.flags.writeable for a in arrays.values())
+
+    def test_convert_existing_pickles(self, db_with_training_data, trained_projector,
+                                      trained_clusterer, tmp_path):
+        projector_pkl = str(tmp_path / "point_projector.pkl")
+        clusterer_pkl = str(tmp_path / "clusterer_rb.pkl")
+        trained_projector.save(projector_pkl)
+        trained_clusterer.save(clusterer_pkl)
+
+        projector = PointProjector()
+        projector.load(convert_pickle(projector_pkl))
+        assert projector.predict(db_with_training_data, "p1", 2024, 8) == \
+            trained_projector.predict(db_with_training_data, "p1", 2024, 8)
+
+        clusterer = PlayerClusterer()
+        clusterer.load(convert_pickle(clusterer_pkl))
+        assert clusterer.classify_player(db_with_training_data, "p2", 2024) == \
+            trained_clusterer.classify_player(db_with_training_data, "p2", 2024)
+        assert clusterer.get_similar_players(db_with_training_data, "p2", 2024) == \
+            trained_clusterer.get_similar_players(db_with_training_data, "p2", 2024)
+
+    def test_hgb_artifact_and_pickle_round_trip(self, db_with_training_data,
+                                               trained_hgb_projector, tmp_path):
+        expected = trained_hgb_projector.predict_many(db_with_training_data, ["p1", "p4"], 2024, 8)
+        trained_hgb_projector.save(str(tmp_path / "point_projector.pkl"))
+        trained_hgb_projector.export(str(tmp_path / "point_projector"))
+        for path in (tmp_path / "point_projector.pkl", tmp_path / "point_projector"):
+            loaded = PointProjector()
+            loaded.load(str(path))
+            assert loaded.estimator == "hgb"
+            assert loaded.predict_many(db_with_training_data, ["p1", "p4"], 2024, 8) == expected
+
+    def test_export_untrained_raises(self, tmp_path):
+        with pytest.raises(RuntimeError, match="not trained"):
+            PointProjector().export(str(tmp_path / "model"))
+
+
+class TestModelRegistry:
+    def _publish(self, db, projector, models_dir, season=2024):
+        version = new_version()
+        projector.export(os.path.join(models_dir, version_path("point_projector", version)))
+        publish_model(db, "point_projector", season, version)
+        return version
+
+    def test_loads_published_version(self, db_with_training_data, trained_projector, tmp_path):
+        version = self._publish(db_with_training_data, trained_projector, str(tmp_path))
+        registry = ModelRegistry(db_with_training_data, str(tmp_path), check_interval=0)
+        model = registry.get("point_projector")
+        assert registry.version("point_projector") == version
+        assert model.predict(db_with_training_data, "p1", 2024, 8) == \
+            trained_projector.predict(db_with_training_data, "p1", 2024, 8)
+        assert registry.get("point_projector") is model
+
+    def test_refresh_swaps_to_new_version(self, db_with_training_data, trained_projector, tmp_path):
+        self._publish(db_with_training_data, trained_projector, str(tmp_path))
+        registry = ModelRegistry(db_with_training_data, str(tmp_path), check_interval=0)
+        old = registry.get("point_projector")
+        assert registry.refresh() == []
+
+        new = self._publish(db_with_training_data, trained_projector, str(tmp_path))
+        assert registry.refresh() == ["point_projector"]
+        assert registry.version("point_projector") == new
+        assert registry.get("point_projector") is not old
+
+    def test_refresh_keeps_serving_when_artifact_missing(
+        self, db_with_training_data, trained_projector, tmp_path, capsys,
+    ):
+        version = self._publish(db_with_training_data, trained_projector, str(tmp_path))
+        registry = ModelRegistry(db_with_training_data, str(tmp_path), check_interval=0)
+        model = registry.get("point_projector")
+        missing = new_version()
+        publish_model(db_with_training_data, "point_projector", 2025, missing)
+        assert registry.refresh() == []
+        assert registry.get("point_projector") is model
+        assert registry.version("point_projector") == version
+        assert f"version {missing} could not be loaded" in capsys.readouterr().err
+        # Reported once, not on every check
+        registry.refresh()
+        assert capsys.readouterr().err == ""
+
+    def test_refresh_reports_corrupt_artifact(
+        self, db_with_training_data, trained_projector, tmp_path, capsys,
+    ):
+        self._publish(db_with_training_data, trained_projector, str(tmp_path))
+        registry = ModelRegistry(db_with_training_data, str(tmp_path), check_interval=0)
+        model = registry.get("point_projector")
+        version = self._publish(db_with_training_data, trained_projector, str(tmp_path))
+        path = tmp_path / version_path("point_projector", version)
+        os.remove(next(path.glob("*.npy")))
+        assert registry.refresh() == []
+        assert registry.get("point_projector") is model
+        assert "Traceback" in capsys.readouterr().err
+
+    def test_refresh_skips_version_failing_with_any_error(
+        self, db_with_training_data, trained_projector, tmp_path, monkeypatch, capsys,
+    ):
+        self._publish(db_with_training_data, trained_projector, str(tmp_path))
+        registry = ModelRegistry(db_with_training_data, str(tmp_path), check_interval=0)
+        model = registry.get("point_projector")
+        self._publish(db_with_training_data, trained_projector, str(tmp_path))
+
+        def load_model(name, path):
+            raise EOFError("truncated")
+        monkeypatch.setattr("analytics.registry.load_model", load_model)
+        assert registry.refresh() == []
+        assert registry.get("point_projector") is model
+        assert "EOFError: truncated" in capsys.readouterr().err
+
+    def test_poll_survives_unexpected_errors(self, db, tmp_path, monkeypatch, capsys):
+        registry = ModelRegistry(db, str(tmp_path), check_interval=1)
+        checks = []
+
+        def refresh():
+            checks.append(1)
+            raise TypeError("malformed model_metadata")
+
+        def sleep(seconds):
+            if len(checks) == 2:
+                raise KeyboardInterrupt
+        monkeypatch.setattr(registry, "refresh", refresh)
+        monkeypatch.setattr("analytics.registry.time.sleep", sleep)
+        with pytest.raises(KeyboardInterrupt):
+            registry._poll()
+        assert len(checks) == 2
+        assert "malformed model_metadata" in capsys.readouterr().err
+
+    def test_falls_back_to_unversioned_pickle(self, db, trained_projector, tmp_path):
+        trained_projector.save(str(tmp_path / "point_projector.pkl"))
+        registry = ModelRegistry(db, str(tmp_path), check_interval=0)
+        assert registry.get("point_projector") is not None
+        assert registry.version("point_projector") is None
+        assert registry.get("clusterer_qb") is None
+
+    def test_prune_versions_keeps_newest(self, trained_projector, tmp_path):
+        versions = []
+        for _ in range(4):
+            versions.append(new_version())
+            trained_projector.export(
+                str(tmp_path / version_path("point_projector", versions[-1]))
+            )
+        assert prune_versions(str(tmp_path), "point_projector", keep=2) == versions[:2]
+        assert sorted(os.listdir(tmp_path / "versions" / "point_projector")) == versions[2:]
+
+
+class TestBacktest:
+    def test_week_matches_serving_predictions(self, db_with_training_data, trained_projector):
+        results = backtest_week(db_with_training_data, trained_projector, 2024, 8)
+        assert len(results) == 6
+        served = trained_projector.predict_many(
+            db_with_training_data, list(results["player_id"]), 2024, 8,
+        )
+        for row, expected in zip(results.to_dict("records"), served):
+            assert round(row["projected"], 2) == expected["projected_points"]
+            assert row["actual"] == db_with_training_data["weekly_stats"].find_one(
+                {"player_id": row["player_id"], "season": 2024, "week": 8},
+            )["fantasy_points_ppr"]
+
+    def test_run_backtest_summarizes_weeks(self, db_with_training_data, trained_projector):
+        summary = run_backtest(db_with_training_data, trained_projector, 2024)
+        # Weeks 1-2 have too little history to project
+        assert summary["weeks"] == list(range(3, 11))
+        assert summary["overall"]["n"] == sum(w["n"] for w in summary["by_week"])
+        assert 0 <= summary["overall"]["coverage"] <= 1
+        assert set(summary["by_position"]) == {"QB", "RB", "WR", "TE"}
+        for metrics in summary["by_position"].values():
+            assert metrics["rank_corr"] is None or -1 <= metrics["rank_corr"] <= 1
+
+    def test_parallel_backtest_matches_serial(
+        self, db_with_training_data, trained_projector, tmp_path, monkeypatch,
+    ):
+        model_path = str(tmp_path / "point_projector")
+        trained_projector.export(model_path)
+        monkeypatch.setattr("analytics.backtest.ProcessPoolExecutor", ThreadPoolExecutor)
+        monkeypatch.setattr("analytics.backtest.get_db", lambda uri=None: db_with_training_data)
+        parallel = run_backtest(
+            db_with_training_data, None, 2024, max_workers=3, model_path=model_path,
+        )
+        assert parallel == run_backtest(db_with_training_data, trained_projector, 2024)
+
+    def test_saved_backtests_are_kept_per_version(self, db_with_training_data, trained_projector):
+        summary = run_backtest(db_with_training_data, trained_projector, 2024, weeks=[8, 9])
+        save_backtest(db_with_training_data, summary, model_version="v1")
+        save_backtest(db_with_training_data, summary, model_version="v1")
+        save_backtest(db_with_training_data, summary, model_version="v2")
+        runs = get_backtests(db_with_training_data, 2024)
+        assert sorted(r["model_version"] for r in runs) == ["v1", "v2"]
+        assert all(r["overall"] == summary["overall"] for r in runs)
+
+
 # --- Projections tests ---
 
 
@@ -318,6 +1313,70 @@ class TestProjections:
         assert 0 <= result["upside_pct"] <= 100
         assert 0 <= result["bust_pct"] <= 100
 
+    def test_monte_carlo_reuses_remaining_projection(self, db_with_training_data, trained_projector):
+        remaining = trained_projector.predict_remaining_season(
+            db_with_training_data, "p1", 2024, 5, total_weeks=10
+        )
+        reused = run_monte_carlo_simulation(
+            db_with_training_data, "p1", 2024, 5,
+            n_simulations=500, model=None, total_weeks=10, remaining=remaining,
+        )
+        computed = run_monte_carlo_simulation(
+            db_with_training_data, "p1", 2024, 5,
+            n_simulations=500, model=trained_projector, total_weeks=10,
+        )
+        assert reused == computed
+
+    def test_monte_carlo_caps_simulation_count(self, db_with_training_data, trained_projector):
+        result = run_monte_carlo_simulation(
+            db_with_training_data, "p1", 2024, 5,
+            n_simulations=10 ** 7, model=trained_projector, total_weeks=10,
+        )
+        assert result["n_simulations"] == MAX_SIMULATIONS
+        assert sum(b["count"] for b in result["histogram"]) == MAX_SIMULATIONS
+
+    def test_monte_carlo_zero_width_interval(self, db_with_training_data):
+        remaining = {"weekly": [
+            {"week": w, "projected_points": 10.0, "confidence_low": 10.0, "confidence_high": 10.0}
+            for w in range(6, 11)
+        ]}
+        result = run_monte_carlo_simulation(
+            db_with_training_data, "p1", 2024, 5, n_simulations=200, remaining=remaining,
+        )
+        p = result["percentiles"]
+        assert p["p10"] == p["p90"] == pytest.approx(result["actual_so_far"] + 50.0, abs=0.1)
+        assert len(result["histogram"]) == 20
+
+    @staticmethod
+    def _flat_remaining(low, mid, high):
+        return {"weekly": [
+            {"week": w, "projected_points": mid, "confidence_low": low, "confidence_high": high}
+            for w in range(6, 18)
+        ]}
+
+    def test_monte_carlo_adaptive_stops_early_for_stable_players(self, db_with_training_data):
+        stable = run_monte_carlo_simulation(
+            db_with_training_data, "p1", 2024, 5, remaining=self._flat_remaining(9.0, 10.0, 11.0),
+        )
+        volatile = run_monte_carlo_simulation(
+            db_with_training_data, "p1", 2024, 5, remaining=self._flat_remaining(0.0, 12.0, 40.0),
+        )
+        assert stable["converged"] and volatile["converged"]
+        assert 2000 <= stable["n_simulations"] < volatile["n_simulations"] <= MAX_SIMULATIONS
+        for result in (stable, volatile):
+            errors = result["standard_error"]
+            assert all(errors[key] <= 0.5 for key in ("p10", "p25", "p50", "p75", "p90"))
+            assert errors["upside_pct"] <= 1.0 and errors["bust_pct"] <= 1.0
+
+    def test_monte_carlo_adaptive_respects_max(self, db_with_training_data):
+        result = run_monte_carlo_simulation(
+            db_with_training_data, "p1", 2024, 5, remaining=self._flat_remaining(0.0, 12.0, 40.0),
+            max_simulations=3000, tolerance=0.01,
+        )
+        assert result["n_simulations"] == 3000
+        assert result["converged"] is False
+        assert result["standard_error"]["p50"] > 0.01
+
     def test_batch_project_players(self, db_with_training_data, trained_projector):
         result = batch_project_players(
             db_with_training_data, ["p1", "p2", "p3"], 2024, 8, model=trained_projector
@@ -327,11 +1386,183 @@ class TestProjections:
             assert "player_id" in r
             assert "projection" in r
 
+    def test_batch_project_players_single_model_call(self, db_with_training_data, trained_projector):
+        db = db_with_training_data
+        get_player_projection(db, "p2", 2024, 8, model=trained_projector)
+        calls = []
+        original = trained_projector.predict_many
+
+        def spy(db_, player_ids, season, week):
+            calls.append(list(player_ids))
+            return original(db_, player_ids, season, week)
+
+        trained_projector.predict_many = spy
+        result = batch_project_players(db, ["p1", "p2", "p3", "ghost"], 2024, 8, model=trained_projector)
+        assert calls == [["p1", "p3", "ghost"]]
+        assert result[3]["projection"] is None
+        expected = get_player_projection(db, "p3", 2024, 8, model=trained_projector)
+        assert result[2]["projection"] == expected
+        assert db["projections"].count_documents({"season": 2024, "week": 8}) == 3
+
     def test_projection_with_no_model_returns_none(self, db):
         result = get_player_projection(db, "p1", 2024, 5, model=None)
         assert result is None
 
 
+# --- League simulation tests ---
+
+
+def _starter(points, low, high, pro_team=None):
+    return {
+        "projected_points": points, "confidence_low": low, "confidence_high": high,
+        "pro_team": pro_team,
+    }
+
+
+class TestMatchupSimulation:
+    def test_project_lineup_uses_model_and_espn_fallback(self, db_with_training_data, trained_projector):
+        lineup = [
+            {"name": "Player 1", "position": "QB", "slot": "QB", "pro_team": "KC", "espn_projection": 18.0},
+            {"name": "Kicker", "position": "K", "slot": "K", "pro_team": "KC", "espn_projection": 8.0},
+            {"name": "Player 2", "position": "RB", "slot": "BE", "pro_team": "BAL", "espn_projection": 12.0},
+        ]
+        starters = project_lineup(db_with_training_data, lineup, 2024, 8, model=trained_projector)
+        assert [p["name"] for p in starters] == ["Player 1", "Kicker"]
+        qb, kicker = starters
+        expected = get_player_projection(db_with_training_data, "p1", 2024, 8, model=trained_projector)
+        assert qb["source"] == "model" and qb["player_id"] == "p1"
+        assert qb["projected_points"] == expected["projected_points"]
+        assert kicker["source"] == "espn" and kicker["player_id"] is None
+        assert kicker["confidence_low"] == kicker["confidence_high"] == 8.0
+
+    def test_probabilities_and_histogram(self):
+        home = [_starter(20.0, 10.0, 30.0) for _ in range(9)]
+        away = [_starter(15.0, 5.0, 25.0) for _ in range(9)]
+        result = simulate_matchup(home, away, n_simulations=20000)
+        assert result["home"]["win_pct"] > 90
+        assert result["home"]["win_pct"] + result["away"]["win_pct"] + result["tie_pct"] == pytest.approx(100, abs=0.2)
+        assert result["home"]["expected"] == pytest.approx(180, abs=1)
+        assert sum(b["count"] for b in result["margin_histogram"]) == 20000
+        # Continuous scores never tie; not -0.0 or float residue from 100 - wins
+        assert math.copysign(1.0, result["tie_pct"]) == 1.0 and result["tie_pct"] == 0.0
+        p = result["away"]["percentiles"]
+        assert p["p10"] <= p["p25"] <= p["p50"] <= p["p75"] <= p["p90"]
+
+    def test_even_matchup_is_a_coin_flip(self):
+        lineup = [_starter(15.0, 5.0, 30.0) for _ in range(9)]
+        result = simulate_matchup(lineup, lineup, n_simulations=50000)
+        assert result["home"]["win_pct"] == pytest.approx(50, abs=1.5)
+
+    def test_fixed_projections_are_deterministic(self):
+        result = simulate_matchup([_starter(10.0, 10.0, 10.0)], [_starter(8.0, 8.0, 8.0)], n_simulations=100)
+        assert result["home"]["win_pct"] == 100.0
+        assert result["home"]["percentiles"]["p10"] == result["home"]["percentiles"]["p90"] == 10.0
+
+    def test_teammate_correlation_keeps_marginals(self):
+        stack = [_starter(20.0, 5.0, 40.0, "KC"), _starter(14.0, 2.0, 35.0, "KC")]
+        independent = simulate_team_scores(np.random.default_rng(0), stack, 100000)
+        correlated = simulate_team_scores(np.random.default_rng(0), stack, 100000, correlation=0.5)
+        np.testing.assert_allclose(correlated.mean(axis=1), independent.mean(axis=1), rtol=0.01)
+        assert abs(np.corrcoef(independent)[0, 1]) < 0.02
+        assert np.corrcoef(correlated)[0, 1] > 0.4
+        assert correlated.sum(axis=0).std() > independent.sum(axis=0).std()
+
+
+def _league_teams():
+    strengths = [(130.0, 8), (120.0, 7), (115.0, 6), (110.0, 6), (100.0, 4), (95.0, 3)]
+    return [
+        {"team_id": i + 1, "team_name": f"Team {i + 1}", "wins": wins,
+         "points_for": 100.0 * (wins + 4), "mean": mean, "std": 20.0}
+        for i, (mean, wins) in enumerate(strengths)
+    ]
+
+
+def _remaining_schedule(weeks=3):
+    pairings = [[(1, 2), (3, 4), (5, 6)], [(1, 3), (2, 5), (4, 6)], [(1, 4), (2, 6), (3, 5)]]
+    return [game for week in pairings[:weeks] for game in week]
+
+
+class TestPlayoffOdds:
+    def test_team_score_distribution_matches_sampling(self):
+        starters = [_starter(20.0, 8.0, 35.0), _starter(12.0, 2.0, 25.0), _starter(9.0, 9.0, 9.0)]
+        mean, std = team_score_distribution(starters)
+        sampled = simulate_team_scores(np.random.default_rng(0), starters, 200000).sum(axis=0)
+        assert mean == pytest.approx(sampled.mean(), rel=0.01)
+        assert std == pytest.approx(sampled.std(), rel=0.02)
+
+    def test_project_teams_batches_every_lineup(self, db_with_training_data, trained_projector):
+        calls = []
+        original = trained_projector.predict_many
+
+        def spy(db_, player_ids, season, week):
+            calls.append(list(player_ids))
+            return original(db_, player_ids, season, week)
+
+        trained_projector.predict_many = spy
+        lineups = {
+            1: [{"name": "Player 1", "slot": "QB", "pro_team": "KC", "espn_projection": 0}],
+            2: [{"name": "Player 2", "slot": "RB", "pro_team": "BAL", "espn_projection": 0},
+                {"name": "Defense", "slot": "D/ST", "pro_team": "BAL", "espn_projection": 7.0}],
+        }
+        teams = project_teams(db_with_training_data, lineups, 2024, 8, model=trained_projector)
+        assert calls == [["p1", "p2"]]
+        assert set(teams) == {1, 2}
+        assert teams[1][1] > 0
+        single = team_score_distribution(
+            project_lineup(db_with_training_data, lineups[2], 2024, 8, model=trained_projector)
+        )
+        assert teams[2] == pytest.approx(single)
+
+    def test_bye_count(self):
+        assert [bye_count(n) for n in (0, 2, 4, 6, 7, 8)] == [0, 0, 0, 2, 1, 0]
+
+    def test_probabilities_are_consistent(self):
+        result = simulate_season(_league_teams(), _remaining_schedule(), 4, n_simulations=5000)
+        assert result["bye_teams"] == 0
+        teams = {t["team_id"]: t for t in result["teams"]}
+        assert sum(t["playoff_pct"] for t in result["teams"]) == pytest.approx(400, abs=0.5)
+        for team in result["teams"]:
+            assert sum(team["seed_pcts"]) == pytest.approx(team["playoff_pct"], abs=0.5)
+            assert team["wins"] <= team["projected_wins"] <= team["wins"] + 3
+        assert teams[1]["playoff_pct"] > teams[6]["playoff_pct"]
+        assert result["teams"][0]["team_id"] == 1
+
+    def test_finished_season_is_certain(self):
+        result = simulate_season(_league_teams(), [], 6, n_simulations=100)
+        teams = {t["team_id"]: t for t in result["teams"]}
+        assert result["bye_teams"] == 2
+        assert teams[1]["seed_pcts"][0] == 100.0
+        assert teams[2]["bye_pct"] == 100.0
+        assert teams[3]["bye_pct"] == 0.0
+        # Team 3 and 4 are tied on wins; points for breaks the tie
+        assert teams[3]["seed_pcts"][2] == 100.0 and teams[4]["seed_pcts"][3] == 100.0
+
+    def test_parallel_chunks_merge_deterministically(self, monkeypatch):
+        serial = simulate_season(
+            _league_teams(), _remaining_schedule(), 4, n_simulations=5000, chunk_size=1000,
+        )
+        monkeypatch.setattr("analytics.league_sim.ProcessPoolExecutor", ThreadPoolExecutor)
+        parallel = simulate_season(
+            _league_teams(), _remaining_schedule(), 4, n_simulations=5000, chunk_size=1000,
+            max_workers=3,
+        )
+        assert parallel == serial
+        reseeded = simulate_season(
+            _league_teams(), _remaining_schedule(), 4, n_simulations=5000, chunk_size=1000, seed=7,
+        )
+        assert reseeded != serial
+
+    def test_cache_roundtrip(self, db):
+        odds = simulate_season(_league_teams(), _remaining_schedule(1), 4, n_simulations=200)
+        assert get_cached_playoff_odds(db, 12345, 2024, 10) is None
+        cache_playoff_odds(db, 12345, 2024, 10, odds)
+        cache_playoff_odds(db, 12345, 2024, 10, odds)
+        cached = get_cached_playoff_odds(db, 12345, 2024, 10)
+        assert cached["teams"] == odds["teams"]
+        assert db["playoff_odds"].count_documents({}) == 1
+        assert get_cached_playoff_odds(db, 12345, 2024, 11) is None
+
+
 # --- Matchup Stats tests ---
 
 